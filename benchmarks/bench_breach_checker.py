@@ -0,0 +1,58 @@
+"""
+Benchmark del verificador de contraseñas filtradas.
+Genera un corpus sintético de hashes SHA-1, lo convierte con
+build_breach_file y mide consultas individuales (aciertos y fallos, con y
+sin filtro de Bloom) y consultas por lotes.
+
+Uso:
+    python benchmarks/bench_breach_checker.py [--hashes N] [--consultas N]
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from breach_checker import BreachChecker, build_breach_file
+
+def main() -> int:
+    """Función principal del benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hashes", type=int, default=1_000_000)
+    parser.add_argument("--consultas", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = os.path.join(tmp, "corpus.txt")
+        with open(corpus, "w", encoding="ascii") as f:
+            for i in range(args.hashes):
+                f.write(hashlib.sha1(f"filtrada{i}".encode()).hexdigest().upper() + ":1\n")
+
+        start = time.perf_counter()
+        dest = os.path.join(tmp, "filtradas.bin")
+        count = build_breach_file(corpus, dest)
+        print(f"conversión: {count:,} hashes en {time.perf_counter() - start:.1f} s")
+
+        hits = [f"filtrada{i}" for i in range(0, args.hashes, max(1, args.hashes // args.consultas))]
+        misses = [f"nueva{i}" for i in range(len(hits))]
+        for use_bloom in (True, False):
+            checker = BreachChecker(dest, use_bloom=use_bloom)
+            label = "con Bloom" if use_bloom else "sin Bloom"
+            for name, queries in (("aciertos", hits), ("fallos", misses)):
+                start = time.perf_counter()
+                found = sum(checker.is_breached(password) for password in queries)
+                elapsed = (time.perf_counter() - start) / len(queries) * 1e6
+                print(f"{label:<10} {name:<9} {elapsed:>7.2f} us/consulta ({found} encontradas)")
+            start = time.perf_counter()
+            checker.check_many(hits + misses)
+            elapsed = (time.perf_counter() - start) / (2 * len(hits)) * 1e6
+            print(f"{label:<10} {'lote':<9} {elapsed:>7.2f} us/consulta")
+            checker.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""
+Benchmark del arranque en frío de la línea de comandos.
+Ejecuta "python -m password_cli -n 1" varias veces, informa la mediana del
+tiempo de arranque y comprueba con -X importtime que no se cargan módulos
+de la interfaz gráfica.
+
+Uso:
+    python benchmarks/bench_cli_startup.py [--repeticiones N] [--limite-ms MS]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GUI_MODULES = ("tkinter", "pyperclip", "manager_theme")
+
+def main() -> int:
+    """Función principal del benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--limite-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    command = [sys.executable, "-m", "password_cli", "-n", "1"]
+    timings = []
+    for _ in range(args.repeticiones):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, check=True, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    baseline = []
+    for _ in range(args.repeticiones):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        baseline.append((time.perf_counter() - start) * 1000)
+
+    trace = subprocess.run([sys.executable, "-X", "importtime"] + command[1:], cwd=ROOT,
+                           check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                           text=True).stderr
+    imported = {line.rsplit("|", 1)[-1].strip().split(".")[0]
+                for line in trace.splitlines() if line.startswith("import time:")}
+    gui = sorted(imported.intersection(GUI_MODULES))
+
+    median = statistics.median(timings)
+    print(f"arranque password_cli: mediana {median:.1f} ms (intérprete vacío: "
+          f"{statistics.median(baseline):.1f} ms)")
+    print(f"módulos de GUI importados: {', '.join(gui) or 'ninguno'}")
+    return 0 if median < args.limite_ms and not gui else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+Benchmark de la derivación de contraseñas por sitio.
+Compara el coste de estirar el secreto maestro en cada sitio frente a
+estirarlo una vez y derivar con la clave en memoria, y el lote de sitios en
+un solo proceso frente al pool de procesos.
+
+Uso:
+    python benchmarks/bench_derivation.py [--sitios N] [--procesos N] [--objetivo S]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from site_derivation import MasterKey, calibrate, derive_many, derive_password
+
+def main() -> int:
+    """Función principal del benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sitios", type=int, default=500)
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--objetivo", type=float, default=0.1,
+                        help="latencia del estiramiento en segundos")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    params, stretch_s = calibrate(args.objetivo, "scrypt")
+    print(f"Estiramiento calibrado: scrypt n={params.n} ({stretch_s * 1000:.0f} ms)")
+    sites = [f"sitio{i}.example.com" for i in range(args.sitios)]
+
+    with MasterKey.stretch("secreto de prueba", params) as master_key:
+        start = time.perf_counter()
+        for site in sites:
+            derive_password(master_key, site)
+        cached_us = (time.perf_counter() - start) / len(sites) * 1e6
+
+        start = time.perf_counter()
+        serial = derive_many(master_key, sites, workers=1)
+        serial_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        pooled = derive_many(master_key, sites, workers=args.procesos)
+        pooled_ms = (time.perf_counter() - start) * 1000
+
+    assert serial == pooled
+    print(f"Sitio con estiramiento propio:   {stretch_s * 1e6:12,.0f} us")
+    print(f"Sitio con clave en memoria:      {cached_us:12,.1f} us")
+    print(f"{len(sites)} sitios, 1 proceso:       {serial_ms:12,.1f} ms")
+    print(f"{len(sites)} sitios, {args.procesos} procesos:      {pooled_ms:12,.1f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Benchmark del evaluador de fortaleza.
+Verifica que StrengthEvaluator produce los mismos niveles que la evaluación
+original (cuatro pasadas con any(c in ...)) sobre un corpus sintético y
+compara el rendimiento de ambos y de evaluate_many. También simula la
+escritura tecla a tecla para comparar IncrementalStrength con reevaluar el
+texto completo en cada pulsación.
+
+Uso:
+    python benchmarks/bench_evaluator.py [--corpus N]
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strength_evaluator import IncrementalStrength, PasswordStrength, StrengthEvaluator
+
+def legacy_evaluate(password: str) -> PasswordStrength:
+    """Réplica de la evaluación original de PasswordGenerator"""
+    length = len(password)
+    has_lower = any(c in string.ascii_lowercase for c in password)
+    has_upper = any(c in string.ascii_uppercase for c in password)
+    has_digit = any(c in string.digits for c in password)
+    has_special = any(c in string.punctuation for c in password)
+    char_types = sum([has_lower, has_upper, has_digit, has_special])
+
+    if length <= 8:
+        return PasswordStrength.WEAK if char_types < 2 else PasswordStrength.MEDIUM
+    elif length <= 12:
+        if char_types < 2:
+            return PasswordStrength.WEAK
+        elif char_types < 3:
+            return PasswordStrength.MEDIUM
+        return PasswordStrength.STRONG
+    else:
+        if char_types < 2:
+            return PasswordStrength.WEAK
+        elif char_types < 3:
+            return PasswordStrength.MEDIUM
+        elif char_types < 4:
+            return PasswordStrength.STRONG
+        return PasswordStrength.VERY_STRONG
+
+def synthetic_corpus(size: int, seed: int = 1234) -> List[str]:
+    """Genera contraseñas con mezclas variadas de clases; ~10% con espacios o Unicode"""
+    rng = random.Random(seed)
+    pools = [string.ascii_lowercase, string.ascii_uppercase, string.digits,
+             string.punctuation]
+    corpus = []
+    for _ in range(size):
+        chosen = "".join(rng.sample(pools, rng.randint(1, len(pools))))
+        if rng.random() < 0.1:
+            chosen += " \tñáé€"
+        corpus.append("".join(rng.choice(chosen) for _ in range(rng.randint(0, 40))))
+    return corpus
+
+def typing_session(evaluator: StrengthEvaluator, text: str) -> int:
+    """
+    Escribe el texto tecla a tecla y lo borra con retroceso, comparando en
+    cada paso el nivel incremental con la evaluación completa.
+
+    Returns:
+        int: Número de pasos en los que los niveles difieren
+    """
+    incremental = IncrementalStrength(evaluator)
+    mismatches = 0
+    for index, char in enumerate(text):
+        incremental.insert(index, char)
+        mismatches += incremental.strength() != evaluator.evaluate(text[:index + 1])
+    for index in range(len(text) - 1, -1, -1):
+        incremental.delete(index)
+        mismatches += incremental.strength() != evaluator.evaluate(text[:index])
+    return mismatches
+
+def time_typing(evaluator: StrengthEvaluator, text: str, rounds: int) -> None:
+    """Mide el coste por pulsación de reevaluar todo frente al modo incremental"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for index in range(1, len(text) + 1):
+            evaluator.evaluate(text[:index])
+    full_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        incremental = IncrementalStrength(evaluator)
+        for index, char in enumerate(text):
+            incremental.insert(index, char)
+            incremental.strength()
+    incremental_time = time.perf_counter() - start
+
+    keys = rounds * len(text)
+    print(f"escritura de {len(text)} caracteres: completa {full_time / keys * 1e6:.2f} µs/tecla, "
+          f"incremental {incremental_time / keys * 1e6:.2f} µs/tecla")
+
+def main() -> int:
+    """Función principal del benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", type=int, default=200_000)
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.corpus)
+    evaluator = StrengthEvaluator()
+
+    start = time.perf_counter()
+    expected = [legacy_evaluate(password) for password in corpus]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    single = [evaluator.evaluate(password) for password in corpus]
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    streamed = list(evaluator.evaluate_many(corpus))
+    many_time = time.perf_counter() - start
+
+    mismatches = sum(a != b for a, b in zip(expected, single)) + sum(a != b for a, b in zip(expected, streamed))
+    print(f"equivalencia: {'OK' if not mismatches else f'{mismatches} diferencias'}")
+    for name, elapsed in (("original", legacy_time), ("evaluate", single_time),
+                          ("evaluate_many", many_time)):
+        print(f"{name:<14} {len(corpus) / elapsed:>12,.0f} contraseñas/s  "
+              f"{legacy_time / elapsed:>6.2f}x")
+
+    text = "".join(random.Random(99).choice(string.printable[:94]) for _ in range(4096))
+    typing_mismatches = typing_session(evaluator, text[:129])
+    print(f"equivalencia incremental: "
+          f"{'OK' if not typing_mismatches else f'{typing_mismatches} diferencias'}")
+    time_typing(evaluator, text[:129], 200)
+    time_typing(evaluator, text, 2)
+    return 1 if mismatches or typing_mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
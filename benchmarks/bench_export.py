@@ -0,0 +1,62 @@
+"""
+Benchmark de los destinos de exportación.
+Escribe el mismo lote en cada formato y con cada compresión y nivel, y
+muestra registros por segundo, MB/s del formato sin comprimir, tamaño final
+y pico de memoria (que debe depender del bloque, no del número de registros).
+
+Uso:
+    python benchmarks/bench_export.py [--cantidad N] [--formatos F ...] [--fsync POLITICA]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from export_sinks import FSYNC_POLICIES, SINKS, open_sink
+from password_generator import PasswordGenerator
+
+COMPRESSION_CASES = ((None, None), ("gzip", 1), ("gzip", 6), ("gzip", 9), ("xz", 0), ("xz", 6))
+
+def main() -> int:
+    """Función principal del benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cantidad", type=int, default=100_000)
+    parser.add_argument("--longitud", type=int, default=16)
+    parser.add_argument("--formatos", nargs="+", choices=tuple(SINKS), default=tuple(SINKS))
+    parser.add_argument("--fsync", choices=FSYNC_POLICIES, default="close")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    # El lote se genera antes de medir: solo se mide el destino
+    records = list(PasswordGenerator().generate_batch(args.cantidad, args.longitud))
+    print(f"{'formato':<10} {'compresión':<10} {'registros/s':>12} {'MB/s':>8} "
+          f"{'tamaño (MB)':>12} {'pico (KiB)':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "salida")
+        for fmt in args.formatos:
+            for compression, level in COMPRESSION_CASES:
+                started = time.perf_counter()
+                with open_sink(path, fmt, compression, level, args.fsync) as sink:
+                    sink.write(records)
+                elapsed = time.perf_counter() - started
+
+                tracemalloc.start()  # segunda pasada solo para la memoria
+                with open_sink(path, fmt, compression, level, args.fsync) as sink:
+                    sink.write(records)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                label = f"{compression} {level}" if compression else "ninguna"
+                print(f"{fmt:<10} {label:<10} {len(records) / elapsed:>12,.0f} "
+                      f"{sink.bytes_in / elapsed / 1e6:>8.1f} {sink.bytes_out / 1e6:>12.2f} "
+                      f"{peak / 1024:>11,.0f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
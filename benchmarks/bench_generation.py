@@ -0,0 +1,75 @@
+"""
+Benchmark de generación de contraseñas.
+Compara el antiguo bucle de rechazo con la generación constructiva
+de PasswordGenerator.generate_password para longitudes de 8 a 129, y el
+rendimiento de generate_batch frente a llamar en un bucle al método original
+(la referencia de la mejora de generate_batch) y al generate_password actual.
+
+Uso:
+    python benchmarks/bench_generation.py [--repeticiones N]
+"""
+
+import argparse
+import logging
+import os
+import secrets
+import sys
+import time
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from password_generator import PasswordGenerator, PasswordStrength
+
+LENGTHS = (8, 12, 16, 24, 32, 64, 96, 129)
+
+def legacy_generate(generator: PasswordGenerator, length: int, iterations: int) -> tuple[str, PasswordStrength]:
+    """Réplica del bucle de rechazo original (todas las clases seleccionadas)"""
+    chars = generator.lowercase + generator.uppercase + generator.digits + generator.special
+    for _ in range(iterations):
+        password = ''.join(secrets.choice(chars) for _ in range(length))
+        if (any(c in generator.lowercase for c in password)
+                and any(c in generator.uppercase for c in password)
+                and any(c in generator.digits for c in password)
+                and any(c in generator.special for c in password)):
+            strength = generator._evaluate_password_strength(password)
+            if strength != PasswordStrength.WEAK:
+                return password, strength
+    return "", PasswordStrength.WEAK
+
+def measure(func: Callable[[], object], repetitions: int) -> float:
+    """Devuelve el tiempo medio por llamada en microsegundos"""
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        func()
+    return (time.perf_counter() - start) / repetitions * 1e6
+
+def main() -> int:
+    """Función principal del benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=2000)
+    args = parser.parse_args()
+    
+    logging.disable(logging.CRITICAL)
+    generator = PasswordGenerator()
+    
+    print(f"{'longitud':>8} {'rechazo (us)':>14} {'constructiva (us)':>18} {'mejora':>8}")
+    for length in LENGTHS:
+        legacy = measure(lambda: legacy_generate(generator, length, 1000), args.repeticiones)
+        current = measure(lambda: generator.generate_password(length, 1000), args.repeticiones)
+        print(f"{length:>8} {legacy:>14.2f} {current:>18.2f} {legacy / current:>7.2f}x")
+    
+    batch_size = args.repeticiones * 10
+    print()
+    print(f"{'longitud':>8} {'original (us)':>14} {'actual (us)':>12} {'lote (us)':>10} "
+          f"{'vs original':>12} {'vs actual':>10}")
+    for length in LENGTHS:
+        legacy = measure(lambda: legacy_generate(generator, length, 1000), args.repeticiones)
+        single = measure(lambda: generator.generate_password(length, 1000), args.repeticiones)
+        batch = measure(lambda: list(generator.generate_batch(batch_size, length)), 1) / batch_size
+        print(f"{length:>8} {legacy:>14.2f} {single:>12.2f} {batch:>10.2f} "
+              f"{legacy / batch:>11.2f}x {single / batch:>9.2f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Benchmark del historial de emisión en SQLite.
+Llena un historial por tandas de reserve() y muestra el rendimiento de
+inserción y de consulta a medida que crece, para comprobar que el coste por
+contraseña se mantiene a escala.
+
+Uso:
+    python benchmarks/bench_history.py [--filas N] [--tanda N] [--archivo RUTA]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from issuance_history import BATCH_SIZE, IssuanceHistory
+
+def main() -> int:
+    """Función principal del benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filas", type=int, default=2_000_000)
+    parser.add_argument("--tanda", type=int, default=BATCH_SIZE)
+    parser.add_argument("--puntos", type=int, default=10, help="mediciones a lo largo del llenado")
+    parser.add_argument("--archivo", help="base de datos a usar (por defecto: temporal)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.archivo or os.path.join(tmp, "historial.db")
+        history = IssuanceHistory(path)
+        start_rows = history.stats()["count"]
+        step = max(args.tanda, args.filas // args.puntos)
+        counter = 0
+
+        print(f"{'filas':>12} {'inserción/s':>13} {'us/inserción':>13} "
+              f"{'consulta/s':>12} {'us/consulta':>12}")
+        while counter < args.filas:
+            inserted = 0
+            started = time.perf_counter()
+            while inserted < step and counter < args.filas:
+                batch = [f"contraseña-{start_rows + counter + i}"
+                         for i in range(min(args.tanda, args.filas - counter))]
+                history.reserve(batch)
+                counter += len(batch)
+                inserted += len(batch)
+            insert_s = time.perf_counter() - started
+
+            # Consulta: una tanda de contraseñas ya emitidas repartidas por todo el historial
+            sample = [f"contraseña-{start_rows + i * counter // args.tanda}"
+                      for i in range(args.tanda)]
+            started = time.perf_counter()
+            accepted = history.reserve(sample)
+            lookup_s = time.perf_counter() - started
+            assert not any(accepted)
+
+            total = start_rows + counter
+            print(f"{total:>12,} {inserted / insert_s:>13,.0f} {insert_s / inserted * 1e6:>13.2f} "
+                  f"{len(sample) / lookup_s:>12,.0f} {lookup_s / len(sample) * 1e6:>12.2f}")
+
+        stats = history.stats()
+        history.close()
+        print(f"\nTamaño en disco: {stats['file_bytes']:,} bytes "
+              f"({stats['file_bytes'] / stats['count']:.1f} por contraseña)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Benchmark del coste del logging por llamada a generate_password.
+Mide el tiempo por llamada sin logging, con manejadores síncronos (formato y
+escritura en el hilo que genera), con la cola de queued_logging y con la cola
+más muestreo o límite de frecuencia del mensaje de éxito. Los registros van a
+un archivo temporal; la salida de error se descarta mientras se mide.
+
+Uso:
+    python benchmarks/bench_logging.py [--llamadas N] [--repeticiones N]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import queued_logging
+from password_generator import PasswordGenerator, setup_logging
+
+def reset_logging() -> None:
+    """Detiene la cola y quita los manejadores de la configuración anterior"""
+    queued_logging.shutdown()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+def main() -> int:
+    """Función principal del benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--llamadas", type=int, default=20_000)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    generator = PasswordGenerator()
+    for _ in range(args.llamadas):
+        generator.generate_password(16, 1000)  # calentamiento
+    scenarios = (
+        ("sin logging (WARNING)", dict(level=logging.WARNING)),
+        ("síncrono", dict(queued=False)),
+        ("en cola", dict(queued=True)),
+        ("en cola, 1 de cada 100", dict(queued=True, sample_every=100)),
+        ("en cola, 10 por segundo", dict(queued=True, max_per_second=10)),
+    )
+
+    stderr = sys.stderr
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, options in scenarios:
+            log_file = os.path.join(tmp, "bench.log")
+            sys.stderr = open(os.devnull, "w")
+            try:
+                elapsed = drained = float("inf")
+                for _ in range(args.repeticiones):
+                    if os.path.exists(log_file):
+                        os.remove(log_file)
+                    setup_logging(log_file=log_file, **options)
+                    start = time.perf_counter()
+                    for _ in range(args.llamadas):
+                        generator.generate_password(16, 1000)
+                    end = time.perf_counter()
+                    reset_logging()  # vacía la cola antes de seguir
+                    elapsed = min(elapsed, end - start)
+                    drained = min(drained, time.perf_counter() - start)
+            finally:
+                sys.stderr.close()
+                sys.stderr = stderr
+            with open(log_file, encoding="utf-8") as f:
+                lines = sum(1 for _ in f)
+            os.remove(log_file)
+            results.append((name, elapsed, drained, lines))
+
+    base = results[0][1]
+    print(f"{'escenario':<26} {'us/llamada':>11} {'con vaciado':>12} {'sobrecoste':>11} {'líneas':>8}")
+    for name, elapsed, drained, lines in results:
+        per_call = elapsed / args.llamadas * 1e6
+        print(f"{name:<26} {per_call:>11.2f} {drained / args.llamadas * 1e6:>12.2f} "
+              f"{(elapsed / base - 1) * 100:>+10.1f}% {lines:>8}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Benchmark del coste de las métricas del generador.
+Compara generate_password con métricas desactivadas (metrics=None) y
+activadas frente al núcleo sin envoltura (_compile_policy + _run_attempts),
+y muestra el volcado de Prometheus resultante.
+
+Uso:
+    python benchmarks/bench_metrics.py [--llamadas N] [--longitud L]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics import GeneratorMetrics, prometheus_text
+from password_generator import PasswordGenerator
+
+def best_of(func: Callable[[], object], calls: int, repeats: int = 5) -> float:
+    """Mejor tiempo medio por llamada, en microsegundos"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / calls * 1e6
+
+def main() -> int:
+    """Función principal del benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--llamadas", type=int, default=20_000)
+    parser.add_argument("--longitud", type=int, default=16)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    generator = PasswordGenerator()
+    length = args.longitud
+
+    def core():
+        compiled = generator._compile_policy(None, True, True, True, True, length)
+        return generator._run_attempts(compiled, length, 1000, None, None, None)
+
+    def public():
+        return generator.generate_password(length, 1000)
+
+    core_us = best_of(core, args.llamadas)
+    disabled_us = best_of(public, args.llamadas)
+    generator.metrics = GeneratorMetrics()
+    enabled_us = best_of(public, args.llamadas)
+
+    print(f"{'variante':<22} {'us/llamada':>11} {'sobrecoste':>11}")
+    for name, value in (("núcleo", core_us), ("métricas desactivadas", disabled_us),
+                        ("métricas activadas", enabled_us)):
+        print(f"{name:<22} {value:>11.2f} {(value / core_us - 1) * 100:>+10.1f}%")
+
+    print()
+    print(prometheus_text(generator.metrics), end="")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""
+Benchmark de escalado de la generación paralela.
+Mide contraseñas por segundo de generate_parallel con 1..N procesos y
+las compara con generate_batch en un único proceso.
+
+Uso:
+    python benchmarks/bench_parallel.py [--cantidad N] [--longitud L] [--max-procesos P]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parallel_generator import generate_parallel
+from password_generator import PasswordGenerator
+
+def main() -> int:
+    """Función principal del benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cantidad", type=int, default=2_000_000)
+    parser.add_argument("--longitud", type=int, default=16)
+    parser.add_argument("--max-procesos", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--bloque", type=int, default=20000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    start = time.perf_counter()
+    for _ in PasswordGenerator().generate_batch(args.cantidad, args.longitud):
+        pass
+    baseline = args.cantidad / (time.perf_counter() - start)
+    print(f"un proceso (generate_batch): {baseline:,.0f} contraseñas/s")
+
+    print(f"{'procesos':>8} {'contraseñas/s':>15} {'escalado':>9} {'eficiencia':>11}")
+    for workers in range(1, args.max_procesos + 1):
+        start = time.perf_counter()
+        for _ in generate_parallel(args.cantidad, args.longitud, workers=workers,
+                                   chunk_size=args.bloque, ordered=False):
+            pass
+        rate = args.cantidad / (time.perf_counter() - start)
+        print(f"{workers:>8} {rate:>15,.0f} {rate / baseline:>8.2f}x {rate / baseline / workers:>10.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Benchmark de la lista de palabras de passphrase.
+Compara el arranque leyendo y analizando una lista de texto frente a abrir
+el índice con mmap, mide el acceso a una palabra y la generación de frases,
+y muestra lo que ocupa la lista al enviarse a un proceso de trabajo.
+
+Uso:
+    python benchmarks/bench_passphrase.py [--palabras N] [--frases N]
+"""
+
+import argparse
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from passphrase import Wordlist, build_wordlist, generate_passphrase
+
+def synthetic_wordlist(path: str, size: int) -> None:
+    """Escribe una lista en formato Diceware con palabras pseudoaleatorias"""
+    rng = random.Random(7)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(size):
+            word = "".join(rng.choice(letters) for _ in range(rng.randint(3, 9)))
+            f.write(f"{i:06d}\t{word}{i}\n")
+
+def main() -> int:
+    """Función principal del benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--palabras", type=int, default=200_000)
+    parser.add_argument("--frases", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        text_path = os.path.join(tmp, "lista.txt")
+        index_path = os.path.join(tmp, "lista.pwl")
+        synthetic_wordlist(text_path, args.palabras)
+        build_wordlist(text_path, index_path)
+
+        start = time.perf_counter()
+        with open(text_path, encoding="utf-8") as f:
+            parsed = [line.split()[-1] for line in f]
+        parse_ms = (time.perf_counter() - start) * 1e3
+
+        start = time.perf_counter()
+        wordlist = Wordlist.open(index_path)
+        open_ms = (time.perf_counter() - start) * 1e3
+
+        indices = [random.randrange(len(wordlist)) for _ in range(100_000)]
+        start = time.perf_counter()
+        for i in indices:
+            wordlist[i]
+        lookup_ns = (time.perf_counter() - start) / len(indices) * 1e9
+
+        start = time.perf_counter()
+        for _ in range(args.frases):
+            generate_passphrase(wordlist)
+        phrase_us = (time.perf_counter() - start) / args.frases * 1e6
+
+        print(f"Palabras:                    {len(wordlist):,} (texto: {len(parsed):,})")
+        print(f"Arranque analizando texto:   {parse_ms:10.2f} ms")
+        print(f"Arranque abriendo índice:    {open_ms:10.2f} ms")
+        print(f"Acceso a una palabra:        {lookup_ns:10.1f} ns")
+        print(f"Frase de 6 palabras:         {phrase_us:10.2f} us")
+        print(f"Lista enviada a un proceso:  {len(pickle.dumps(wordlist)):10,} bytes "
+              f"(índice en disco: {os.path.getsize(index_path):,} bytes)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
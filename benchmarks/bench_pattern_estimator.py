@@ -0,0 +1,61 @@
+"""
+Benchmark del estimador por patrones.
+Construye un índice de palabras sintético, lo abre con mmap y mide el tiempo
+medio por contraseña de PatternEstimator.estimate.
+
+Uso:
+    python benchmarks/bench_pattern_estimator.py [--palabras N] [--corpus N]
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pattern_estimator import COMMON_WORDS, PatternEstimator, WordIndex, build_word_index
+from password_generator import PasswordGenerator
+
+def main() -> int:
+    """Función principal del benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--palabras", type=int, default=500_000)
+    parser.add_argument("--corpus", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        wordlist = os.path.join(tmp, "palabras.txt")
+        index_path = os.path.join(tmp, "palabras.idx")
+        with open(wordlist, "w", encoding="utf-8") as f:
+            f.writelines(word + "\n" for word in COMMON_WORDS)
+            for _ in range(args.palabras):
+                f.write("".join(rng.choice(string.ascii_lowercase)
+                                for _ in range(rng.randint(3, 12))) + "\n")
+
+        start = time.perf_counter()
+        count = build_word_index(wordlist, index_path)
+        print(f"índice: {count:,} palabras, {os.path.getsize(index_path) / 1e6:.1f} MB, "
+              f"construido en {time.perf_counter() - start:.2f} s")
+
+        start = time.perf_counter()
+        estimator = PatternEstimator(WordIndex.open(index_path))
+        print(f"apertura con mmap: {(time.perf_counter() - start) * 1e6:.0f} us")
+
+        human = [rng.choice(COMMON_WORDS).capitalize() + str(rng.randint(0, 9999)) + rng.choice("!.#")
+                 for _ in range(args.corpus)]
+        generated = [password for password, _ in PasswordGenerator().generate_batch(args.corpus, 16)]
+        for name, corpus in (("estilo humano", human), ("generadas (16)", generated)):
+            start = time.perf_counter()
+            for password in corpus:
+                estimator.estimate(password)
+            elapsed = (time.perf_counter() - start) / len(corpus) * 1e6
+            print(f"{name:<16} {elapsed:>8.1f} us por contraseña")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,315 @@
+"""
+Suite de benchmarks con líneas base en JSON.
+Mide los caminos críticos del proyecto y guarda los resultados en un archivo
+JSON que sirve de línea base; el subcomando "comparar" falla si algún caso
+empeora más de un porcentaje configurable respecto a la línea base.
+
+Casos:
+- generacion/: generate_password con longitudes 8/16/64/129, las 15
+  combinaciones de clases y varios valores de iteraciones
+- lote/: generate_batch por longitud
+- plantilla/: generate_from_template con plantillas representativas
+- evaluacion/: StrengthEvaluator.evaluate, evaluate_many, el medidor
+  incremental y PatternEstimator sobre corpus sintéticos
+- gui/: PasswordGeneratorGUI.generate_password con la ventana oculta si hay
+  pantalla, o con widgets simulados si no la hay, con y sin reserva
+
+Uso:
+    python benchmarks/bench_suite.py ejecutar [--salida base.json] [--filtro TEXTO]
+    python benchmarks/bench_suite.py comparar base.json nuevo.json [--umbral PCT]
+"""
+
+import argparse
+import datetime
+import itertools
+import json
+import logging
+import os
+import platform
+import queue
+import random
+import string
+import sys
+import time
+from typing import Callable, Dict, Iterator, NamedTuple, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from password_generator import PasswordGenerator
+from password_pool import PasswordPool
+from pattern_estimator import PatternEstimator
+from strength_evaluator import IncrementalStrength, StrengthEvaluator
+
+LENGTHS = (8, 16, 64, 129)
+ITERATIONS = (1000, 10000, 50000)
+CLASS_NAMES = ("min", "may", "num", "esp")
+TEMPLATES = ("Cvcc-9999-Ss", "SSSSSSSSSSSSSSSS")
+FLAG_COMBINATIONS = [flags for flags in itertools.product((True, False), repeat=4) if any(flags)]
+
+class Case(NamedTuple):
+    """Caso de benchmark: func realiza 'ops' operaciones por llamada"""
+    name: str
+    func: Callable[[], object]
+    ops: int = 1
+    loops: Optional[int] = None
+    before_repeat: Optional[Callable[[], None]] = None
+
+def synthetic_corpus(size: int, seed: int = 1234) -> list:
+    """Contraseñas con mezclas variadas de clases y longitudes de 0 a 40"""
+    rng = random.Random(seed)
+    pools = [string.ascii_lowercase, string.ascii_uppercase, string.digits,
+             string.punctuation]
+    corpus = []
+    for _ in range(size):
+        chosen = "".join(rng.sample(pools, rng.randint(1, len(pools))))
+        corpus.append("".join(rng.choice(chosen) for _ in range(rng.randint(0, 40))))
+    return corpus
+
+class _Value:
+    """Sustituto de StringVar, BooleanVar y Entry para la GUI simulada"""
+
+    def __init__(self, value=None):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+class _Widget:
+    """Sustituto de los widgets que la GUI solo configura"""
+
+    def configure(self, **options):
+        pass
+
+    def start(self, *args):
+        pass
+
+    def stop(self):
+        pass
+
+class _Window:
+    """Sustituto de tk.Tk: las llamadas programadas se ejecutan a mano"""
+
+    def after(self, delay, callback=None):
+        return None
+
+    def after_cancel(self, job):
+        pass
+
+def headless_gui():
+    """
+    Crea la GUI para medirla sin interacción.
+
+    Con pantalla se usa la ventana real oculta con withdraw(); sin ella, una
+    instancia con widgets simulados que conserva la lógica de los manejadores.
+    """
+    import password_gui
+
+    try:
+        app = password_gui.PasswordGeneratorGUI()
+        app.window.withdraw()
+        return app
+    except Exception:  # tkinter.TclError sin pantalla
+        pass
+
+    app = password_gui.PasswordGeneratorGUI.__new__(password_gui.PasswordGeneratorGUI)
+    app.generator = PasswordGenerator()
+    app.window = _Window()
+    app.use_lower = _Value(True)
+    app.use_upper = _Value(True)
+    app.use_digits = _Value(True)
+    app.use_special = _Value(True)
+    app.iterations = _Value("1000")
+    app.length = _Value("16")
+    app.password_var = _Value("")
+    app.strength_var = _Value("")
+    app.strength_label = app.progress_bar = app.cancel_btn = _Widget()
+    app._results = queue.Queue()
+    app._worker = None
+    app._cancel_event = None
+    app._pending_request = None
+    app._attempt = 0
+    app.password_pool = PasswordPool(app.generator)
+    return app
+
+def wait_for_pool(pool: PasswordPool, timeout: float = 30.0) -> None:
+    """Espera a que la reserva esté llena"""
+    deadline = time.perf_counter() + timeout
+    while pool.stats()["available"] < pool.capacity and time.perf_counter() < deadline:
+        time.sleep(0.001)
+
+def generation_cases() -> Iterator[Case]:
+    """Casos de generate_password y generate_batch"""
+    generator = PasswordGenerator()
+    for length, iterations, flags in itertools.product(LENGTHS, ITERATIONS, FLAG_COMBINATIONS):
+        classes = "+".join(name for name, use in zip(CLASS_NAMES, flags) if use)
+        yield Case(f"generacion/l{length}/i{iterations}/{classes}",
+                   lambda a=(length, iterations) + flags: generator.generate_password(*a))
+    for length in LENGTHS:
+        yield Case(f"lote/l{length}",
+                   lambda length=length: list(generator.generate_batch(1000, length)), ops=1000)
+    for template in TEMPLATES:
+        yield Case(f"plantilla/{template}",
+                   lambda template=template: generator.generate_from_template(template))
+
+def evaluation_cases() -> Iterator[Case]:
+    """Casos de evaluación de fortaleza sobre corpus sintéticos"""
+    corpus = synthetic_corpus(10_000)
+    evaluator = StrengthEvaluator()
+    evaluate = evaluator.evaluate
+    yield Case("evaluacion/evaluate", lambda: [evaluate(p) for p in corpus], ops=len(corpus))
+    yield Case("evaluacion/evaluate_many", lambda: list(evaluator.evaluate_many(corpus)),
+               ops=len(corpus))
+
+    text = "".join(random.Random(99).choice(string.printable[:94]) for _ in range(129))
+
+    def typing():
+        incremental = IncrementalStrength(evaluator)
+        for index, char in enumerate(text):
+            incremental.insert(index, char)
+            incremental.strength()
+    yield Case("evaluacion/incremental_l129", typing, ops=len(text))
+
+    estimator = PatternEstimator()
+    sample = corpus[:500]
+    yield Case("evaluacion/patrones", lambda: [estimator.estimate(p) for p in sample],
+               ops=len(sample))
+
+def gui_cases() -> Iterator[Case]:
+    """Casos del manejador del botón GENERAR CONTRASEÑA"""
+    app = headless_gui()
+    pool = app.password_pool
+    pool.close()
+
+    # Con reserva: se llena antes de cada repetición y se mide una tanda fija
+    # de clics que la reserva atiende por completo.
+    hits = 512
+    filled = PasswordPool(app.generator, capacity=hits)
+    flags = app.selected_flags()
+    length = int(app.length.get())
+    filled.configure(length, flags)
+
+    def click_hit():
+        app.password_pool = filled
+        app.generate_password()
+
+    yield Case("gui/clic_reserva", click_hit, loops=hits,
+               before_repeat=lambda: wait_for_pool(filled))
+
+    # Sin reserva: cada clic lanza el hilo de trabajo; se mide hasta mostrar
+    # el resultado.
+    def click_miss():
+        app.password_pool = pool
+        app.generate_password()
+        app._worker.join()
+        app._poll_generation()
+
+    yield Case("gui/clic_sin_reserva", click_miss)
+
+def measure(case: Case, repeats: int, min_time: float) -> float:
+    """
+    Mide un caso y devuelve el mejor tiempo por operación en nanosegundos.
+
+    Sin número de vueltas fijo, se duplican las vueltas hasta que una
+    repetición dure al menos min_time.
+    """
+    loops = case.loops
+    if loops is None:
+        loops = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(loops):
+                case.func()
+            if time.perf_counter() - start >= min_time:
+                break
+            loops *= 2
+
+    best = float("inf")
+    for _ in range(repeats):
+        if case.before_repeat is not None:
+            case.before_repeat()
+        start = time.perf_counter()
+        for _ in range(loops):
+            case.func()
+        best = min(best, time.perf_counter() - start)
+    return best / (loops * case.ops) * 1e9
+
+def run(args: argparse.Namespace) -> int:
+    """Subcomando ejecutar"""
+    logging.disable(logging.CRITICAL)
+    results: Dict[str, Dict[str, float]] = {}
+    for group in (generation_cases, evaluation_cases, gui_cases):
+        for case in group():
+            if args.filtro and args.filtro not in case.name:
+                continue
+            ns = measure(case, args.repeticiones, args.tiempo_minimo)
+            results[case.name] = {"ns_por_op": round(ns, 1)}
+            print(f"{case.name:<48} {ns:>14,.1f} ns/op")
+
+    report = {
+        "metadatos": {
+            "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "procesador": platform.processor() or platform.machine(),
+        },
+        "resultados": results,
+    }
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    print(f"\n{len(results)} casos guardados en {args.salida}")
+    return 0
+
+def compare(args: argparse.Namespace) -> int:
+    """Subcomando comparar"""
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)["resultados"]
+    with open(args.nuevo, encoding="utf-8") as f:
+        new = json.load(f)["resultados"]
+
+    regressions = 0
+    print(f"{'caso':<48} {'base ns/op':>14} {'nuevo ns/op':>14} {'cambio':>9}")
+    for name in sorted(base.keys() & new.keys()):
+        before, after = base[name]["ns_por_op"], new[name]["ns_por_op"]
+        change = (after / before - 1) * 100 if before else 0.0
+        regressed = change > args.umbral
+        regressions += regressed
+        mark = "  REGRESIÓN" if regressed else ""
+        print(f"{name:<48} {before:>14,.1f} {after:>14,.1f} {change:>+8.1f}%{mark}")
+
+    for name in sorted(base.keys() - new.keys()):
+        print(f"{name:<48} ausente en {args.nuevo}")
+    for name in sorted(new.keys() - base.keys()):
+        print(f"{name:<48} nuevo (sin línea base)")
+
+    print(f"\n{regressions} casos empeoran más de {args.umbral:g}%")
+    return 1 if regressions else 0
+
+def main() -> int:
+    """Función principal de la suite"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="comando", required=True)
+
+    run_parser = commands.add_parser("ejecutar", help="Mide todos los casos y guarda el JSON")
+    run_parser.add_argument("--salida", default="bench_resultados.json")
+    run_parser.add_argument("--filtro", default="", help="Solo casos cuyo nombre contenga el texto")
+    run_parser.add_argument("--repeticiones", type=int, default=5)
+    run_parser.add_argument("--tiempo-minimo", type=float, default=0.02,
+                            help="Duración mínima de cada repetición en segundos")
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser("comparar", help="Compara dos archivos de resultados")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("nuevo")
+    compare_parser.add_argument("--umbral", type=float, default=10.0,
+                                help="Porcentaje de empeoramiento tolerado por caso")
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
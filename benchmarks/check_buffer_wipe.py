@@ -0,0 +1,147 @@
+"""
+Comprobación de la ruta de generación sobre búferes mutables.
+Verifica que SecretBuffer, la reserva de secure_buffer y la región consumida
+del búfer de EntropyPool quedan a cero, que write_batch escribe contraseñas
+que cumplen la política, y compara el pico de memoria de escribir un lote
+con generate_batch (un str por contraseña) y con write_batch.
+
+Uso:
+    python benchmarks/check_buffer_wipe.py [--cantidad N] [--longitud L]
+"""
+
+import argparse
+import io
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entropy_pool import EntropyPool
+from password_generator import PasswordGenerator
+from password_policy import PasswordPolicy, compile_policy
+from secure_buffer import BufferPool, SecretBuffer, default_buffer_pool, write_all
+
+def check_wiping(length: int) -> List[Tuple[str, bool]]:
+    """Comprobaciones de borrado; cada resultado es (descripción, correcto)"""
+    results = []
+    pool = EntropyPool()
+    generator = PasswordGenerator(entropy_pool=pool)
+
+    with SecretBuffer(length) as secret:
+        generator.generate_into(secret.view, length)
+        filled = any(secret.data)
+    results.append(("generate_into escribe en el búfer", filled))
+    results.append(("SecretBuffer a cero al salir del contexto", secret.is_wiped()))
+
+    target = bytearray(64)
+    pool.readinto(target)
+    state = pool._buffer()
+    consumed = bytes(state.data[:state.pos])
+    results.append(("EntropyPool.readinto borra los bytes consumidos", not any(consumed)))
+
+    buffers = BufferPool()
+    block = buffers.acquire(256)
+    block[:] = os.urandom(256)
+    buffers.release(block)
+    results.append(("BufferPool.release borra el búfer", not any(buffers.acquire(256))))
+
+    sink = io.BytesIO()
+    generator.write_batch(sink, 100, length)
+    results.append(("write_batch devuelve a la reserva búferes a cero",
+                    all(not any(b) for free in default_buffer_pool()._free.values()
+                        for b in free)))
+
+    policy = PasswordPolicy(min_digits=2, min_special=2, max_repeat=2)
+    compiled = compile_policy(policy)
+    sink = io.BytesIO()
+    generator.write_batch(sink, 1000, length, policy=policy)
+    lines = sink.getvalue().splitlines()
+    results.append(("write_batch cumple la política",
+                    len(lines) == 1000 and all(len(line) == length and
+                                               compiled.satisfies(line.decode("ascii"))
+                                               for line in lines)))
+
+    sink = ShortWriter()
+    generator.write_batch(sink, 1000, length)
+    lines = bytes(sink.data).split(b"\n")
+    results.append(("write_batch completa las escrituras parciales",
+                    len(lines) == 1001 and not lines[-1] and
+                    all(len(line) == length for line in lines[:-1])))
+
+    try:
+        write_all(ShortWriter(limit=0), b"x" * length)
+        stopped = False
+    except OSError:
+        stopped = True
+    results.append(("write_all falla si write() no acepta ningún byte", stopped))
+    return results
+
+class ShortWriter:
+    """Archivo sin búfer que acepta como mucho limit bytes por write()"""
+
+    def __init__(self, limit: int = 7):
+        self.data = bytearray()
+        self.limit = limit
+
+    def write(self, data) -> int:
+        accepted = bytes(data[:self.limit])
+        self.data += accepted
+        return len(accepted)
+
+class NullSink:
+    """Destino que solo cuenta bytes, para no medir el crecimiento de la salida"""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data) -> int:
+        self.size += len(data)
+        return len(data)
+
+def measure(write: Callable[[NullSink], None]) -> Tuple[float, int]:
+    """Tiempo en segundos y pico de memoria en bytes, en pasadas separadas"""
+    start = time.perf_counter()
+    write(NullSink())
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    write(NullSink())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+def main() -> int:
+    """Función principal de la comprobación"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cantidad", type=int, default=200_000)
+    parser.add_argument("--longitud", type=int, default=16)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    failed = 0
+    for description, ok in check_wiping(args.longitud):
+        print(f"{'OK   ' if ok else 'FALLO'} {description}")
+        failed += not ok
+
+    generator = PasswordGenerator()
+    n, length = args.cantidad, args.longitud
+
+    def with_strings(output: NullSink) -> None:
+        for password, _ in generator.generate_batch(n, length):
+            output.write(password.encode("ascii") + b"\n")
+
+    def with_buffers(output: NullSink) -> None:
+        generator.write_batch(output, n, length)
+
+    print(f"\n{'ruta':<28} {'contraseñas/s':>14} {'pico (KiB)':>11}")
+    for name, write in (("generate_batch + str", with_strings),
+                        ("write_batch (bytearray)", with_buffers)):
+        elapsed, peak = measure(write)
+        print(f"{name:<28} {n / elapsed:>14,.0f} {peak / 1024:>11,.1f}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Control de regresión del tiempo de importación.
+Importa cada módulo del core en un intérprete nuevo con "python -X importtime",
+suma el tiempo acumulado de los módulos del proyecto y falla si supera el
+presupuesto, si se cargan dependencias gráficas o si la importación
+configura logging.
+
+Uso:
+    python benchmarks/check_import_time.py [--presupuesto-ms MS] [--repeticiones N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, Set, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ("password_generator", "entropy_pool", "password_cli", "password_gui")
+GUI_MODULES = {"tkinter", "_tkinter", "pyperclip", "manager_theme"}
+PROBE = "import logging, {0}; print(len(logging.getLogger().handlers))"
+
+def import_profile(module: str) -> Tuple[float, Set[str], int]:
+    """
+    Importa un módulo en un intérprete nuevo.
+
+    Returns:
+        Tuple[float, Set[str], int]: Tiempo acumulado del módulo en ms, módulos
+        de primer nivel importados y handlers del logger raíz tras importar
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", PROBE.format(module)],
+                            cwd=ROOT, check=True, capture_output=True, text=True)
+    cumulative: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        cumulative[name.strip()] = int(cumulative_us) / 1000
+    imported = {name.split(".")[0] for name in cumulative}
+    return cumulative.get(module, 0.0), imported, int(result.stdout.strip())
+
+def main() -> int:
+    """Función principal del control"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--presupuesto-ms", type=float, default=40.0)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    for module in MODULES:
+        samples = [import_profile(module) for _ in range(args.repeticiones)]
+        elapsed = statistics.median(sample[0] for sample in samples)
+        gui = sorted(samples[0][1] & GUI_MODULES)
+        handlers = samples[0][2]
+        problems = []
+        if elapsed > args.presupuesto_ms:
+            problems.append(f"supera {args.presupuesto_ms:.0f} ms")
+        if gui:
+            problems.append("importa " + ", ".join(gui))
+        if handlers:
+            problems.append("configura logging")
+        failed = failed or bool(problems)
+        print(f"{module:<20} {elapsed:>7.1f} ms  {'; '.join(problems) or 'OK'}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
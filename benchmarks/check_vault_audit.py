@@ -0,0 +1,68 @@
+"""
+Comprobación de regresión de la auditoría de bóvedas.
+Audita exportaciones pequeñas con contraseñas que contienen U+2028, U+2029,
+\\x85, saltos de línea entre comillas y comillas, por bloques pequeños y con
+y sin procesos, y comprueba que el resultado coincide con la lectura en un
+solo flujo (audit sobre read_export).
+
+Uso:
+    python benchmarks/check_vault_audit.py
+"""
+
+import csv
+import json
+import os
+import sys
+import tempfile
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vault_audit import AuditReport, audit, audit_export, read_export
+
+PASSWORDS = ("Sep\u2028arador-Línea9!", "Sep\u2029arador-Párrafo9!", "Siguiente\x85Línea9!",
+             'con "comillas", y\nsalto', "abc", "", "abc")
+
+def summary(report: AuditReport) -> Tuple:
+    """Campos del informe que no dependen del tiempo"""
+    return (report.total, report.without_password, report.by_strength, report.weak,
+            report.reused_passwords, report.reused_entries, report.reuse_groups)
+
+def write_exports(folder: str) -> List[str]:
+    """Escribe la misma bóveda en CSV, JSONL y JSON de Bitwarden"""
+    entries = [(f"entrada {i}", PASSWORDS[i % len(PASSWORDS)]) for i in range(200)]
+    paths = [os.path.join(folder, "vault." + ext) for ext in ("csv", "jsonl", "json")]
+    with open(paths[0], "w", encoding="utf-8", newline="") as output:
+        writer = csv.writer(output)
+        writer.writerow(["Title", "Password"])
+        writer.writerows(entries)
+    with open(paths[1], "w", encoding="utf-8", newline="") as output:
+        for name, password in entries:
+            # ensure_ascii=False deja U+2028 y U+2029 sin escapar dentro de la cadena
+            output.write(json.dumps({"name": name, "password": password},
+                                    ensure_ascii=False) + "\n")
+    with open(paths[2], "w", encoding="utf-8") as output:
+        json.dump({"items": [{"name": name, "login": {"password": password}}
+                             for name, password in entries]}, output, ensure_ascii=False)
+    return paths
+
+def main() -> int:
+    """Función principal de la comprobación"""
+    failed = 0
+    with tempfile.TemporaryDirectory() as folder:
+        for path in write_exports(folder):
+            expected = summary(audit(read_export(path), workers=0, max_listed=1000))
+            for workers in (0, 2):
+                try:
+                    result = summary(audit_export(path, workers, block_chars=512,
+                                                  max_listed=1000))
+                    ok = result == expected
+                except ValueError as e:
+                    print(f"  {type(e).__name__}: {e}")
+                    ok = False
+                print(f"{'OK   ' if ok else 'FALLO'} {os.path.basename(path)} con {workers} procesos")
+                failed += not ok
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Prueba de carga del servicio HTTP local.
+Inicia PasswordService en el mismo proceso (o usa uno ya en marcha con
+--puerto), abre varias conexiones keep-alive concurrentes y envía
+peticiones a /generar. Informa peticiones por segundo y latencias p50/p99
+medidas en el cliente, junto con los microlotes formados por el servidor.
+
+Uso:
+    python benchmarks/load_test_service.py [--conexiones C] [--peticiones N] [--puerto P]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from password_service import PasswordService
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                  method: str, path: str, payload: dict = None) -> Tuple[int, dict]:
+    """Envía una petición por una conexión keep-alive y lee la respuesta"""
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line == b"\r\n":
+            break
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":")[1])
+    return status, json.loads(await reader.readexactly(length))
+
+async def client(port: int, count: int, latencies: List[float]) -> None:
+    """Una conexión que envía count peticiones secuenciales"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for _ in range(count):
+        start = time.perf_counter()
+        status, _ = await request(reader, writer, "POST", "/generar", {"longitud": 16})
+        latencies.append(time.perf_counter() - start)
+        if status != 200:
+            raise RuntimeError(f"Respuesta inesperada: {status}")
+    writer.close()
+
+async def run(args: argparse.Namespace) -> None:
+    """Ejecuta la prueba de carga"""
+    service = None
+    port = args.puerto
+    if not port:
+        service = PasswordService(port=0, batch_window=args.ventana_ms / 1000)
+        await service.start()
+        port = service.port
+
+    latencies: List[float] = []
+    per_client = args.peticiones // args.conexiones
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, per_client, latencies) for _ in range(args.conexiones)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"peticiones: {len(latencies)}  conexiones: {args.conexiones}")
+    print(f"rendimiento: {len(latencies) / elapsed:,.0f} peticiones/s")
+    print(f"latencia: p50 {p50:.2f} ms  p99 {p99:.2f} ms  media {statistics.mean(latencies) * 1000:.2f} ms")
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    _, metrics = await request(reader, writer, "GET", "/metricas")
+    writer.close()
+    batches = metrics["microlotes"]
+    print(f"microlotes: {batches['lotes']} para {batches['peticiones']} peticiones "
+          f"({batches['peticiones'] / max(batches['lotes'], 1):.1f} por lote)")
+    server_side = metrics["endpoints"].get("/generar", {})
+    print(f"servidor /generar: p50 <= {server_side.get('p50', 0) * 1000:.2f} ms  "
+          f"p99 <= {server_side.get('p99', 0) * 1000:.2f} ms")
+
+    if service is not None:
+        await service.stop()
+
+def main() -> int:
+    """Función principal de la prueba de carga"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--conexiones", type=int, default=50)
+    parser.add_argument("--peticiones", type=int, default=20000)
+    parser.add_argument("--puerto", type=int, default=0, help="usar un servicio ya iniciado")
+    parser.add_argument("--ventana-ms", type=float, default=2.0)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    asyncio.run(run(args))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Medición de bloqueos del bucle de eventos de la GUI.
+Crea la ventana, programa un temporizador de alta frecuencia con window.after
+y pulsa "GENERAR CONTRASEÑA" repetidamente mientras una generación costosa
+corre en el hilo de trabajo. Informa el mayor intervalo entre ticks y
+cuántos superan un cuadro (16.7 ms).
+
+La generación costosa se simula con un corpus de filtraciones que tarda en
+cada consulta y rechaza una fracción de las contraseñas, como lo haría una
+política difícil de satisfacer. La reserva de contraseñas se desactiva para
+que todas las pulsaciones pasen por el hilo de trabajo.
+
+Requiere una pantalla (DISPLAY o Xvfb).
+
+Uso:
+    python benchmarks/measure_gui_stalls.py [--clics N] [--costo-us US] [--limite-ms MS]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import password_gui
+
+FRAME_MS = 1000 / 60
+TICK_MS = 2
+
+class SlowCorpus:
+    """Corpus simulado: cada consulta consume CPU y rechaza 'ratio' de las contraseñas"""
+
+    def __init__(self, cost_us: float, ratio: float):
+        self.cost = cost_us / 1e6
+        self.ratio = ratio
+        self.calls = 0
+
+    def is_breached(self, password: str) -> bool:
+        end = time.perf_counter() + self.cost
+        while time.perf_counter() < end:
+            pass
+        self.calls += 1
+        return (self.calls % 1000) < self.ratio * 1000
+
+def main() -> int:
+    """Función principal de la medición"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clics", type=int, default=20)
+    parser.add_argument("--intervalo-ms", type=int, default=50)
+    parser.add_argument("--costo-us", type=float, default=200.0)
+    parser.add_argument("--rechazo", type=float, default=0.999)
+    parser.add_argument("--limite-ms", type=float, default=FRAME_MS)
+    args = parser.parse_args()
+
+    try:
+        app = password_gui.PasswordGeneratorGUI()
+    except Exception as e:  # tkinter.TclError sin pantalla
+        print(f"omitido: no se pudo crear la ventana ({e})")
+        return 0
+
+    app.password_pool.close()
+    app.password_pool.capacity = 0
+    app.generator.breach_checker = SlowCorpus(args.costo_us, args.rechazo)
+    app.iterations.delete(0, "end")
+    app.iterations.insert(0, "50000")
+
+    gaps = []
+    state = {"last": time.perf_counter(), "clicks": 0}
+
+    def tick():
+        now = time.perf_counter()
+        gaps.append((now - state["last"]) * 1000)
+        state["last"] = now
+        app.window.after(TICK_MS, tick)
+
+    def click():
+        if state["clicks"] < args.clics:
+            state["clicks"] += 1
+            app.generate_btn.invoke()
+            app.window.after(args.intervalo_ms, click)
+        else:
+            app.cancel_generation()
+            app.window.after(200, app.window.quit)
+
+    app.window.after(TICK_MS, tick)
+    app.window.after(100, click)
+    app.window.mainloop()
+    app.window.destroy()
+
+    # El intervalo programado es de TICK_MS; el exceso es tiempo bloqueado
+    stalls = sorted(gap - TICK_MS for gap in gaps)
+    worst = stalls[-1]
+    p99 = stalls[int(len(stalls) * 0.99) - 1]
+    over = sum(1 for stall in stalls if stall > FRAME_MS)
+    print(f"ticks: {len(gaps)}  mediana: {statistics.median(stalls):.2f} ms  "
+          f"p99: {p99:.2f} ms  máximo: {worst:.2f} ms")
+    print(f"bloqueos de más de un cuadro: {over}  consultas al corpus: "
+          f"{app.generator.breach_checker.calls}")
+    return 0 if worst <= args.limite_ms else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
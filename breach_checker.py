@@ -0,0 +1,318 @@
+"""
+Módulo de verificación de contraseñas filtradas sin conexión.
+Convierte una copia local de un corpus de hashes SHA-1 (formato
+"HASH[:conteo]" por línea) en un archivo binario ordenado de registros de
+20 bytes y lo consulta con búsqueda binaria sobre mmap, opcionalmente con un
+filtro de Bloom delante para resolver la mayoría de los fallos sin tocar el
+archivo grande. No realiza ninguna conexión de red.
+
+Uso:
+    python -m breach_checker convertir pwned-passwords-sha1.txt filtradas.bin
+    python -m breach_checker auditar filtradas.bin contraseñas.txt
+
+Autor: Nelson Espinosa
+Versión: 1.2.0
+"""
+
+import hashlib
+import heapq
+import mmap
+import os
+import sys
+import tempfile
+from array import array
+from typing import BinaryIO, Iterable, Iterator, List, Optional
+
+HASH_MAGIC = b"NEIRSHA1"
+BLOOM_MAGIC = b"NEIRBLM1"
+RECORD_SIZE = 20
+PREFIX_ENTRIES = 1 << 16
+_HEADER_SIZE = len(HASH_MAGIC) + 8 + (PREFIX_ENTRIES + 1) * 8
+_BLOOM_HEADER_SIZE = len(BLOOM_MAGIC) + 8 + 1
+
+def _read_records(f: BinaryIO) -> Iterator[bytes]:
+    """Lee registros de RECORD_SIZE bytes de un archivo temporal ordenado"""
+    while True:
+        block = f.read(RECORD_SIZE * 4096)
+        if not block:
+            return
+        for offset in range(0, len(block), RECORD_SIZE):
+            yield block[offset:offset + RECORD_SIZE]
+
+def _parse_hashes(lines: Iterable[bytes]) -> Iterator[bytes]:
+    """Extrae el hash binario de cada línea "HASH[:conteo]", ignorando las inválidas"""
+    for line in lines:
+        hex_digest = line[:40]
+        if len(hex_digest) == 40:
+            try:
+                yield bytes.fromhex(hex_digest.decode("ascii"))
+            except ValueError:
+                continue
+
+def build_breach_file(source_path: str, dest_path: str, bloom: bool = True,
+                      chunk_records: int = 5_000_000, bloom_bits_per_entry: int = 10) -> int:
+    """
+    Convierte un corpus de hashes en texto en el archivo binario ordenado.
+
+    El corpus se ordena por bloques de chunk_records hashes en memoria, que se
+    vuelcan a archivos temporales y se mezclan con heapq.merge, por lo que la
+    memoria no depende del tamaño del corpus. Los duplicados se eliminan.
+
+    Args:
+        source_path (str): Archivo de texto con un hash SHA-1 hexadecimal por línea
+        dest_path (str): Archivo binario de salida
+        bloom (bool): Generar también el filtro de Bloom (dest_path + ".bloom")
+        chunk_records (int): Hashes ordenados en memoria por bloque
+        bloom_bits_per_entry (int): Bits del filtro por hash (10 ~ 1% de falsos positivos)
+
+    Returns:
+        int: Número de hashes distintos escritos
+    """
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(dest_path))) as tmp:
+        chunk_paths: List[str] = []
+        with open(source_path, "rb") as source:
+            hashes = _parse_hashes(source)
+            while True:
+                chunk = [digest for _, digest in zip(range(chunk_records), hashes)]
+                if not chunk:
+                    break
+                chunk.sort()
+                path = os.path.join(tmp, f"bloque_{len(chunk_paths)}.bin")
+                with open(path, "wb") as f:
+                    f.write(b"".join(chunk))
+                chunk_paths.append(path)
+
+        prefix_table = [0] * (PREFIX_ENTRIES + 1)
+        count = 0
+        tmp_dest = dest_path + ".tmp"
+        files = [open(path, "rb") for path in chunk_paths]
+        try:
+            with open(tmp_dest, "wb") as out:
+                out.write(bytes(_HEADER_SIZE))
+                previous = None
+                pending: List[bytes] = []
+                for digest in heapq.merge(*(_read_records(f) for f in files)):
+                    if digest == previous:
+                        continue
+                    previous = digest
+                    prefix_table[int.from_bytes(digest[:2], "big") + 1] += 1
+                    pending.append(digest)
+                    count += 1
+                    if len(pending) >= 65536:
+                        out.write(b"".join(pending))
+                        pending.clear()
+                out.write(b"".join(pending))
+
+                for i in range(1, PREFIX_ENTRIES + 1):
+                    prefix_table[i] += prefix_table[i - 1]
+                out.seek(0)
+                out.write(HASH_MAGIC + count.to_bytes(8, "little")
+                          + b"".join(value.to_bytes(8, "little") for value in prefix_table))
+        finally:
+            for f in files:
+                f.close()
+        os.replace(tmp_dest, dest_path)
+
+    if bloom:
+        _build_bloom(dest_path, count, bloom_bits_per_entry)
+    return count
+
+def _bloom_positions(digest: bytes, bits: int, hashes: int) -> Iterator[int]:
+    """
+    Posiciones del filtro por doble hashing sobre el propio SHA-1.
+    BreachChecker._maybe_present repite este cálculo en línea.
+    """
+    pos = int.from_bytes(digest[:8], "little") % bits
+    step = (int.from_bytes(digest[8:16], "little") | 1) % bits
+    for _ in range(hashes):
+        yield pos
+        pos = (pos + step) % bits
+
+def _build_bloom(dest_path: str, count: int, bits_per_entry: int) -> None:
+    """Genera el filtro de Bloom a partir del archivo binario ya ordenado"""
+    bits = max(count * bits_per_entry, 64)
+    hashes = max(1, round(bits_per_entry * 0.693))
+    bitmap = bytearray((bits + 7) // 8)
+    with open(dest_path, "rb") as f:
+        f.seek(_HEADER_SIZE)
+        for digest in _read_records(f):
+            for pos in _bloom_positions(digest, bits, hashes):
+                bitmap[pos >> 3] |= 1 << (pos & 7)
+    tmp_path = dest_path + ".bloom.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(BLOOM_MAGIC + bits.to_bytes(8, "little") + bytes([hashes]))
+        f.write(bitmap)
+    os.replace(tmp_path, dest_path + ".bloom")
+
+class BreachChecker:
+    """
+    Verificador de contraseñas filtradas sobre el archivo binario ordenado.
+
+    Implementa:
+    - Búsqueda binaria sobre mmap acotada por una tabla de prefijos de 16 bits
+    - Filtro de Bloom opcional (archivo ".bloom") para descartar fallos
+    - Consultas por lotes ordenadas para leer el archivo secuencialmente
+
+    Atributos:
+        count (int): Número de hashes del corpus
+        path (str): Ruta del archivo binario
+    """
+
+    def __init__(self, path: str, use_bloom: bool = True):
+        """
+        Abre el archivo generado con build_breach_file.
+
+        Args:
+            path (str): Ruta del archivo binario
+            use_bloom (bool): Usar path + ".bloom" si existe
+
+        Raises:
+            ValueError: Si el archivo no tiene el formato esperado
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(HASH_MAGIC)] != HASH_MAGIC:
+            self._map.close()
+            raise ValueError("El archivo no es un corpus de hashes válido")
+        self.count = int.from_bytes(self._map[len(HASH_MAGIC):len(HASH_MAGIC) + 8], "little")
+        self._prefixes = array("Q", self._map[len(HASH_MAGIC) + 8:_HEADER_SIZE])
+        if sys.byteorder == "big":
+            self._prefixes.byteswap()
+
+        self._bloom: Optional[mmap.mmap] = None
+        bloom_path = path + ".bloom"
+        if use_bloom and os.path.exists(bloom_path):
+            with open(bloom_path, "rb") as f:
+                bloom = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if bloom[:len(BLOOM_MAGIC)] == BLOOM_MAGIC:
+                self._bloom = bloom
+                self._bloom_bits = int.from_bytes(bloom[len(BLOOM_MAGIC):len(BLOOM_MAGIC) + 8], "little")
+                self._bloom_hashes = bloom[len(BLOOM_MAGIC) + 8]
+            else:
+                bloom.close()
+
+    def _maybe_present(self, digest: bytes) -> bool:
+        """Consulta el filtro de Bloom; False garantiza que el hash no está"""
+        bloom = self._bloom
+        if bloom is None:
+            return True
+        bits = self._bloom_bits
+        pos = int.from_bytes(digest[:8], "little") % bits
+        step = (int.from_bytes(digest[8:16], "little") | 1) % bits
+        for _ in range(self._bloom_hashes):
+            if not bloom[_BLOOM_HEADER_SIZE + (pos >> 3)] & (1 << (pos & 7)):
+                return False
+            pos = (pos + step) % bits
+        return True
+
+    def _lower_bound(self, digest: bytes, low: int, high: int) -> int:
+        """Primer índice en [low, high) cuyo registro es >= digest"""
+        data = self._map
+        while low < high:
+            mid = (low + high) // 2
+            offset = _HEADER_SIZE + mid * RECORD_SIZE
+            if data[offset:offset + RECORD_SIZE] < digest:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def _record(self, index: int) -> bytes:
+        """Registro en la posición index"""
+        offset = _HEADER_SIZE + index * RECORD_SIZE
+        return self._map[offset:offset + RECORD_SIZE]
+
+    def contains_hash(self, digest: bytes) -> bool:
+        """
+        Indica si un hash SHA-1 binario está en el corpus.
+
+        Args:
+            digest (bytes): Hash SHA-1 de 20 bytes
+
+        Returns:
+            bool: True si la contraseña está filtrada
+        """
+        if not self._maybe_present(digest):
+            return False
+        prefix = int.from_bytes(digest[:2], "big")
+        low, high = self._prefixes[prefix], self._prefixes[prefix + 1]
+        index = self._lower_bound(digest, low, high)
+        return index < high and self._record(index) == digest
+
+    def is_breached(self, password: str) -> bool:
+        """
+        Indica si una contraseña está en el corpus de filtraciones.
+
+        Args:
+            password (str): Contraseña en texto plano (se codifica en UTF-8)
+
+        Returns:
+            bool: True si la contraseña está filtrada
+        """
+        return self.contains_hash(hashlib.sha1(password.encode("utf-8")).digest())
+
+    def check_many(self, passwords: Iterable[str]) -> List[bool]:
+        """
+        Verifica un lote de contraseñas.
+
+        Las consultas se ordenan por hash y cada búsqueda parte de la posición
+        de la anterior, de modo que el archivo se recorre en orden creciente.
+
+        Args:
+            passwords (Iterable[str]): Contraseñas a verificar
+
+        Returns:
+            List[bool]: Resultado de cada contraseña, en el orden de entrada
+        """
+        digests = [hashlib.sha1(password.encode("utf-8")).digest() for password in passwords]
+        results = [False] * len(digests)
+        position = 0
+        for i in sorted(range(len(digests)), key=digests.__getitem__):
+            digest = digests[i]
+            if not self._maybe_present(digest):
+                continue
+            prefix = int.from_bytes(digest[:2], "big")
+            low = max(position, self._prefixes[prefix])
+            high = self._prefixes[prefix + 1]
+            position = self._lower_bound(digest, low, high)
+            results[i] = position < high and self._record(position) == digest
+        return results
+
+    def close(self) -> None:
+        """Libera los mapas de memoria"""
+        self._map.close()
+        if self._bloom is not None:
+            self._bloom.close()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Función principal de la línea de comandos"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m breach_checker",
+                                     description="Verificación de contraseñas filtradas sin conexión")
+    commands = parser.add_subparsers(dest="comando", required=True)
+    convert = commands.add_parser("convertir", help="convertir un corpus de hashes SHA-1 en texto")
+    convert.add_argument("corpus")
+    convert.add_argument("destino")
+    convert.add_argument("--sin-bloom", action="store_true", help="no generar el filtro de Bloom")
+    audit = commands.add_parser("auditar", help="verificar contraseñas (una por línea)")
+    audit.add_argument("archivo")
+    audit.add_argument("contraseñas")
+    args = parser.parse_args(argv)
+
+    if args.comando == "convertir":
+        count = build_breach_file(args.corpus, args.destino, bloom=not args.sin_bloom)
+        print(f"Corpus convertido: {count} hashes en {args.destino}")
+        return 0
+
+    checker = BreachChecker(args.archivo)
+    with open(args.contraseñas, "r", encoding="utf-8") as f:
+        passwords = [line.rstrip("\n") for line in f]
+    breached = sum(checker.check_many(passwords))
+    checker.close()
+    print(f"Contraseñas filtradas: {breached} de {len(passwords)}")
+    return 1 if breached else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
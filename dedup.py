@@ -0,0 +1,233 @@
+"""
+Módulo de unicidad para la generación por lotes.
+Garantiza que no se repita ninguna contraseña dentro de una ejecución sin
+guardar las contraseñas: cada una se reduce a una huella de 64 bits con
+BLAKE2b y una clave aleatoria por ejecución, y las huellas se guardan en una
+tabla de direccionamiento abierto sobre array("Q") (unos 11-21 bytes por
+contraseña) o en un filtro de Bloom (unos 1.2 bytes con 10 bits por entrada).
+
+Ninguna de las dos estructuras tiene falsos negativos: una contraseña
+repetida siempre se detecta. Una coincidencia de huellas o un falso
+positivo del filtro solo provoca que se regenere una contraseña que quizá
+era nueva, así que la unicidad es exacta y el coste es alguna generación de
+más. Las huellas son con clave para que nadie pueda provocar coincidencias
+a propósito ni reconocer contraseñas a partir de un volcado de memoria.
+
+Autor: Nelson Espinosa
+Versión: 1.2.0
+"""
+
+import hashlib
+import logging
+import math
+import os
+from array import array
+from typing import Callable, Dict, Iterable, Iterator, Tuple, TypeVar
+
+Record = TypeVar("Record", bound=Tuple)
+
+# Tandas de reposición seguidas sin ninguna contraseña aceptada antes de dar
+# el espacio por agotado. Un falso positivo del filtro de Bloom puede
+# rechazar una tanda pequeña entera, pero no muchas seguidas.
+MAX_STALLED_ROUNDS = 32
+
+logger = logging.getLogger(__name__)
+
+class Deduplicator:
+    """
+    Base de los filtros de unicidad.
+
+    Atributos:
+        seen (int): Contraseñas consultadas
+        collisions (int): Contraseñas rechazadas por repetidas (o posibles repetidas)
+    """
+
+    def __init__(self):
+        self._hasher = hashlib.blake2b(digest_size=8, key=os.urandom(16))
+        self.seen = 0
+        self.collisions = 0
+
+    def fingerprint(self, password: str) -> int:
+        """Huella con clave de 64 bits, distinta de 0 (0 marca huecos libres)"""
+        hasher = self._hasher.copy()  # la clave ya está procesada en _hasher
+        hasher.update(password.encode("utf-8"))
+        return int.from_bytes(hasher.digest(), "little") or 1
+
+    def add(self, password: str) -> bool:
+        """
+        Registra una contraseña.
+
+        Returns:
+            bool: True si es nueva; False si ya se vio (o pudo verse) y debe
+            regenerarse
+        """
+        raise NotImplementedError
+
+    @property
+    def memory_bytes(self) -> int:
+        """Memoria ocupada por la estructura de huellas"""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Obtiene los contadores del filtro.
+
+        Returns:
+            Dict[str, float]: seen, unique, collisions, collision_rate,
+            memory_bytes y bytes_per_entry
+        """
+        unique = self.seen - self.collisions
+        return {
+            "seen": self.seen,
+            "unique": unique,
+            "collisions": self.collisions,
+            "collision_rate": self.collisions / self.seen if self.seen else 0.0,
+            "memory_bytes": self.memory_bytes,
+            "bytes_per_entry": self.memory_bytes / unique if unique else 0.0,
+        }
+
+class FingerprintTable(Deduplicator):
+    """
+    Conjunto de huellas de 64 bits con direccionamiento abierto y sondeo
+    lineal sobre un array("Q"). Crece al doble al superar MAX_LOAD, así que
+    admite flujos de tamaño desconocido.
+    """
+
+    MAX_LOAD = 0.75
+
+    def __init__(self, expected: int = 1 << 16):
+        """
+        Args:
+            expected (int): Número de contraseñas previsto; evita crecer
+                durante la ejecución si se acierta
+        """
+        super().__init__()
+        size = 1 << max(4, math.ceil(math.log2(max(expected, 1) / self.MAX_LOAD)))
+        self._slots = array("Q", [0]) * size
+        self._mask = size - 1
+        self._limit = int(size * self.MAX_LOAD)
+        self.count = 0
+
+    def add(self, password: str) -> bool:
+        self.seen += 1
+        fingerprint = self.fingerprint(password)
+        slots = self._slots
+        mask = self._mask
+        i = fingerprint & mask
+        while True:
+            value = slots[i]
+            if not value:
+                break
+            if value == fingerprint:
+                self.collisions += 1
+                return False
+            i = (i + 1) & mask
+        slots[i] = fingerprint
+        self.count += 1
+        if self.count > self._limit:
+            self._grow()
+        return True
+
+    def _grow(self) -> None:
+        """Duplica la tabla y reinserta las huellas"""
+        old = self._slots
+        size = len(old) * 2
+        slots = array("Q", [0]) * size
+        mask = size - 1
+        for fingerprint in old:
+            if fingerprint:
+                i = fingerprint & mask
+                while slots[i]:
+                    i = (i + 1) & mask
+                slots[i] = fingerprint
+        self._slots = slots
+        self._mask = mask
+        self._limit = int(size * self.MAX_LOAD)
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._slots) * self._slots.itemsize
+
+class BloomDeduplicator(Deduplicator):
+    """
+    Filtro de Bloom sobre las huellas, dimensionado para 'expected'
+    contraseñas. Un positivo se trata como repetida: nunca deja pasar un
+    duplicado, y con 10 bits por entrada regenera en torno al 1 % de más.
+    Superar 'expected' solo aumenta esa proporción.
+    """
+
+    def __init__(self, expected: int, bits_per_entry: int = 10):
+        """
+        Args:
+            expected (int): Número de contraseñas previsto
+            bits_per_entry (int): Bits del filtro por contraseña
+        """
+        super().__init__()
+        self._bits = max(64, expected * bits_per_entry)
+        self._hashes = max(1, round(bits_per_entry * 0.693))
+        self._bitmap = bytearray((self._bits + 7) // 8)
+
+    def add(self, password: str) -> bool:
+        self.seen += 1
+        fingerprint = self.fingerprint(password)
+        bits = self._bits
+        bitmap = self._bitmap
+        # Doble hashing sobre las dos mitades de la huella
+        pos = (fingerprint & 0xFFFFFFFF) % bits
+        step = ((fingerprint >> 32) | 1) % bits
+        present = True
+        for _ in range(self._hashes):
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not bitmap[byte] & mask:
+                present = False
+                bitmap[byte] |= mask
+            pos = (pos + step) % bits
+        if present:
+            self.collisions += 1
+            return False
+        return True
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._bitmap)
+
+def unique_records(records: Iterable[Record], deduplicator: Deduplicator,
+                   refill: Callable[[int], Iterable[Record]]) -> Iterator[Record]:
+    """
+    Filtra un flujo de registros (contraseña, ...) para que no se repita
+    ninguna contraseña, reponiendo las descartadas.
+
+    Entrega los registros en cuanto llegan; al agotarse el flujo pide a
+    refill tantos registros como se descartaron, y repite hasta completar.
+    Solo tras MAX_STALLED_ROUNDS tandas seguidas sin ninguna contraseña
+    nueva se da el espacio por agotado: se registra un error y el flujo
+    termina con menos registros de los pedidos.
+
+    Args:
+        records (Iterable[Record]): Flujo original; la contraseña es el primer campo
+        deduplicator (Deduplicator): Filtro de unicidad de la ejecución
+        refill (Callable[[int], Iterable[Record]]): Genera k registros nuevos
+
+    Returns:
+        Iterator[Record]: Registros con contraseñas únicas
+    """
+    add = deduplicator.add
+    source: Iterable[Record] = records
+    stalled = 0
+    while True:
+        missing = 0
+        progressed = False
+        for record in source:
+            if add(record[0]):
+                progressed = True
+                yield record
+            else:
+                missing += 1
+        if not missing:
+            return
+        stalled = 0 if progressed else stalled + 1
+        if stalled >= MAX_STALLED_ROUNDS:
+            logger.error("Sin contraseñas nuevas en %d tandas seguidas: faltan %d",
+                         stalled, missing)
+            return
+        source = refill(missing)
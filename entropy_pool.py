@@ -0,0 +1,238 @@
+"""
+Módulo de reserva de entropía para la generación de contraseñas.
+Implementa un búfer por hilo que se llena desde os.urandom en bloques
+grandes, se borra a medida que se consume y se descarta tras un fork.
+
+Autor: Nelson Espinosa
+Versión: 1.2.0
+"""
+
+import os
+import threading
+import weakref
+from typing import Dict, Optional, Set, Union
+
+_pools: "weakref.WeakSet[EntropyPool]" = weakref.WeakSet()
+
+class _ThreadBuffer:
+    """Estado de la reserva para un único hilo"""
+
+    def __init__(self, size: int):
+        self.data = bytearray(size)
+        self.pos = size  # vacío: se llena en la primera lectura
+        self.bytes_drawn = 0
+        self.syscalls = 0
+
+    def wipe(self) -> None:
+        """Borra todo el búfer y lo marca como vacío"""
+        self.data[:] = bytes(len(self.data))
+        self.pos = len(self.data)
+
+class _ThreadToken:
+    """Objeto guardado en el threading.local; se libera cuando termina el hilo"""
+
+def _retire_buffer(pool_ref: "weakref.ref[EntropyPool]", buffer: _ThreadBuffer) -> None:
+    """Borra el búfer de un hilo terminado y lo saca de su reserva"""
+    buffer.wipe()
+    pool = pool_ref()
+    if pool is not None:
+        pool._retire(buffer)
+
+class EntropyPool:
+    """
+    Reserva de bytes aleatorios criptográficamente seguros.
+
+    Implementa:
+    - Un búfer independiente por hilo, sin bloqueos en la ruta de lectura
+    - Recarga desde os.urandom en bloques de tamaño configurable
+    - Borrado de los bytes entregados dentro del búfer
+    - Descarte automático de los búferes heredados tras os.fork
+    - Contadores de bytes entregados y llamadas al sistema
+
+    Atributos:
+        buffer_size (int): Bytes leídos de os.urandom en cada recarga
+    """
+
+    def __init__(self, buffer_size: int = 64 * 1024):
+        """
+        Inicializa la reserva.
+
+        Args:
+            buffer_size (int): Tamaño del búfer de cada hilo en bytes
+
+        Raises:
+            ValueError: Si buffer_size no es positivo
+        """
+        if buffer_size <= 0:
+            raise ValueError("buffer_size debe ser mayor que 0")
+        self.buffer_size = buffer_size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._buffers: Set[_ThreadBuffer] = set()
+        # Contadores de los hilos ya terminados
+        self._retired_bytes = 0
+        self._retired_syscalls = 0
+        _pools.add(self)
+
+    def _buffer(self) -> _ThreadBuffer:
+        """Obtiene (o crea) el búfer del hilo actual"""
+        try:
+            return self._local.buffer
+        except AttributeError:
+            buffer = _ThreadBuffer(self.buffer_size)
+            with self._lock:
+                self._buffers.add(buffer)
+            # Cuando el hilo termina, threading.local libera el testigo y el
+            # búfer se borra y se retira: los hilos de corta vida no acumulan
+            # búferes ni dejan bytes aleatorios en memoria
+            token = _ThreadToken()
+            weakref.finalize(token, _retire_buffer, weakref.ref(self), buffer)
+            self._local.token = token
+            self._local.buffer = buffer
+            return buffer
+
+    def _retire(self, buffer: _ThreadBuffer) -> None:
+        """Acumula los contadores de un búfer retirado y lo olvida"""
+        with self._lock:
+            if buffer in self._buffers:
+                self._buffers.discard(buffer)
+                self._retired_bytes += buffer.bytes_drawn
+                self._retired_syscalls += buffer.syscalls
+
+    def read(self, count: int) -> bytes:
+        """
+        Devuelve count bytes aleatorios.
+
+        Las lecturas mayores que el búfer van directamente a os.urandom.
+
+        Args:
+            count (int): Número de bytes solicitados
+
+        Returns:
+            bytes: Bytes aleatorios
+        """
+        buffer = self._buffer()
+        buffer.bytes_drawn += count
+        if count >= self.buffer_size:
+            buffer.syscalls += 1
+            return os.urandom(count)
+
+        data = buffer.data
+        end = buffer.pos + count
+        if end > self.buffer_size:
+            data[:] = os.urandom(self.buffer_size)
+            buffer.syscalls += 1
+            buffer.pos = 0
+            end = count
+        chunk = bytes(data[buffer.pos:end])
+        data[buffer.pos:end] = bytes(count)
+        buffer.pos = end
+        return chunk
+
+    def readinto(self, target: Union[bytearray, memoryview]) -> int:
+        """
+        Llena un búfer escribible con bytes aleatorios.
+
+        Copia directamente desde el búfer del hilo, sin crear objetos bytes
+        intermedios, y borra los bytes entregados igual que read.
+
+        Args:
+            target (Union[bytearray, memoryview]): Destino a llenar por completo
+
+        Returns:
+            int: Número de bytes escritos
+        """
+        view = memoryview(target).cast("B")
+        count = len(view)
+        buffer = self._buffer()
+        buffer.bytes_drawn += count
+        data = buffer.data
+        source = memoryview(data)
+        done = 0
+        while done < count:
+            if buffer.pos >= self.buffer_size:
+                data[:] = os.urandom(self.buffer_size)
+                buffer.syscalls += 1
+                buffer.pos = 0
+            take = min(count - done, self.buffer_size - buffer.pos)
+            end = buffer.pos + take
+            view[done:done + take] = source[buffer.pos:end]
+            source[buffer.pos:end] = bytes(take)
+            buffer.pos = end
+            done += take
+        return count
+
+    def randbelow(self, n: int) -> int:
+        """
+        Devuelve un entero uniforme en [0, n), sin sesgo.
+
+        Args:
+            n (int): Límite superior exclusivo (mayor que 0)
+
+        Returns:
+            int: Entero aleatorio
+
+        Raises:
+            ValueError: Si n no es positivo
+        """
+        if n <= 0:
+            raise ValueError("n debe ser mayor que 0")
+        bits = n.bit_length()
+        nbytes = (bits + 7) // 8
+        shift = nbytes * 8 - bits
+        while True:
+            value = int.from_bytes(self.read(nbytes), "big") >> shift
+            if value < n:
+                return value
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Obtiene los contadores acumulados de todos los hilos.
+
+        Returns:
+            Dict[str, int]: bytes_drawn y syscalls
+        """
+        with self._lock:
+            buffers = list(self._buffers)
+            retired_bytes, retired_syscalls = self._retired_bytes, self._retired_syscalls
+        return {
+            "bytes_drawn": retired_bytes + sum(b.bytes_drawn for b in buffers),
+            "syscalls": retired_syscalls + sum(b.syscalls for b in buffers),
+        }
+
+    def wipe(self) -> None:
+        """Borra los búferes de todos los hilos; la próxima lectura recarga"""
+        with self._lock:
+            for buffer in self._buffers:
+                buffer.wipe()
+
+    def _after_fork(self) -> None:
+        """Descarta los bytes heredados del proceso padre"""
+        self._lock = threading.Lock()
+        for buffer in self._buffers:
+            buffer.wipe()
+
+def _reseed_after_fork() -> None:
+    """Invalida todas las reservas en el proceso hijo tras un fork"""
+    for pool in list(_pools):
+        pool._after_fork()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_after_fork)
+
+_default_pool: Optional[EntropyPool] = None
+_default_lock = threading.Lock()
+
+def default_pool() -> EntropyPool:
+    """
+    Obtiene la reserva compartida del proceso, creándola si no existe.
+
+    Returns:
+        EntropyPool: Reserva por defecto
+    """
+    global _default_pool
+    if _default_pool is None:
+        with _default_lock:
+            if _default_pool is None:
+                _default_pool = EntropyPool()
+    return _default_pool
@@ -0,0 +1,319 @@
+"""
+Módulo de exportación en flujo a formatos de gestores de contraseñas.
+Cada destino consume el flujo (contraseña, PasswordStrength) de
+PasswordGenerator y lo escribe en bloques grandes, opcionalmente comprimidos
+al vuelo con gzip o xz, sin guardar el lote: la memoria depende del tamaño
+del bloque, no del número de contraseñas.
+
+Formatos:
+    plain      una contraseña por línea
+    csv        password,strength
+    jsonl      {"password": ..., "strength": ...} por línea
+    keepass    CSV de importación de KeePass/KeePassXC
+    bitwarden  JSON de importación de Bitwarden (sin cifrar)
+
+Política de fsync:
+    never   no se fuerza; el sistema escribe cuando quiere
+    close   un fsync al cerrar (por defecto): el archivo completo es durable
+    block   un fsync tras cada bloque escrito; los datos pendientes en el
+            compresor solo son durables al cerrar
+
+Autor: Nelson Espinosa
+Versión: 1.2.0
+"""
+
+import os
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple, Type, Union
+
+from secure_buffer import write_all
+from strength_evaluator import PasswordStrength
+
+BLOCK_SIZE = 1 << 20
+FSYNC_POLICIES = ("never", "close", "block")
+COMPRESSIONS = ("gzip", "xz")
+
+class _Compressor:
+    """Compresor incremental con la interfaz de zlib.compressobj"""
+
+    def __init__(self, compression: str, level: Optional[int]):
+        if compression == "gzip":
+            import zlib
+            # wbits=31: cabecera y cola gzip, legible con gzip.open y gunzip
+            self._obj = zlib.compressobj(6 if level is None else level, zlib.DEFLATED, 31)
+        elif compression == "xz":
+            import lzma
+            self._obj = lzma.LZMACompressor(preset=6 if level is None else level)
+        else:
+            raise ValueError(f"Compresión desconocida: {compression}")
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+class ExportSink:
+    """
+    Destino de exportación en flujo.
+
+    Las subclases definen header(), encode() y footer(); la base agrupa los
+    registros codificados en bloques de block_size bytes, los comprime y los
+    escribe con una sola llamada por bloque.
+
+    Atributos:
+        count (int): Registros escritos
+        bytes_in (int): Bytes del formato antes de comprimir
+        bytes_out (int): Bytes escritos en el destino
+    """
+
+    def __init__(self, target: Union[str, BinaryIO], compression: Optional[str] = None,
+                 level: Optional[int] = None, fsync: str = "close",
+                 block_size: int = BLOCK_SIZE):
+        """
+        Args:
+            target (Union[str, BinaryIO]): Ruta del archivo o archivo binario abierto
+                (p. ej. sys.stdout.buffer); un archivo abierto no se cierra
+            compression (Optional[str]): None, "gzip" o "xz"
+            level (Optional[int]): Nivel de compresión (gzip 0-9, xz 0-9)
+            fsync (str): Política de fsync, una de FSYNC_POLICIES
+            block_size (int): Bytes acumulados antes de cada escritura
+
+        Raises:
+            ValueError: Si la compresión o la política de fsync no existen
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Política de fsync desconocida: {fsync}")
+        self._compressor = _Compressor(compression, level) if compression else None
+        if isinstance(target, str):
+            # Sin búfer de Python: los bloques ya son grandes
+            self._file = open(target, "wb", buffering=0)
+            self._owned = True
+        else:
+            self._file = target
+            self._owned = False
+        self.fsync = fsync
+        self.block_size = block_size
+        self.count = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._parts: List[str] = []
+        self._pending = 0
+        self._closed = False
+        self._append(self.header())
+
+    def header(self) -> str:
+        """Texto inicial del archivo"""
+        return ""
+
+    def encode(self, password: str, strength: PasswordStrength) -> str:
+        """Texto de un registro"""
+        raise NotImplementedError
+
+    def footer(self) -> str:
+        """Texto final del archivo"""
+        return ""
+
+    def _append(self, text: str) -> None:
+        if text:
+            self._parts.append(text)
+            self._pending += len(text)
+
+    def write(self, records: Iterable[Tuple[str, PasswordStrength]]) -> int:
+        """
+        Escribe un flujo de registros.
+
+        Puede llamarse varias veces; el archivo se completa con close().
+
+        Args:
+            records (Iterable[Tuple[str, PasswordStrength]]): Contraseñas y fortaleza
+
+        Returns:
+            int: Registros escritos en esta llamada
+        """
+        encode = self.encode
+        append = self._parts.append
+        block_size = self.block_size
+        pending = self._pending
+        start = self.count
+        for password, strength in records:
+            text = encode(password, strength)
+            append(text)
+            pending += len(text)
+            self.count += 1
+            if pending >= block_size:
+                self._flush_block()
+                pending = 0
+        self._pending = pending
+        return self.count - start
+
+    def _flush_block(self) -> None:
+        """Codifica, comprime y escribe los registros acumulados"""
+        data = "".join(self._parts).encode("utf-8")
+        self._parts.clear()
+        self._pending = 0
+        self.bytes_in += len(data)
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        self._write_raw(data)
+        if self.fsync == "block":
+            self._sync()
+
+    def _write_raw(self, data: bytes) -> None:
+        if data:
+            # El archivo propio no tiene búfer y write() puede ser parcial
+            write_all(self._file, data)
+            self.bytes_out += len(data)
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Escribe el pie, vacía el compresor y aplica la política de fsync"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._append(self.footer())
+            self._flush_block()
+            if self._compressor is not None:
+                self._write_raw(self._compressor.flush())
+            if self.fsync != "never":
+                self._sync()
+            else:
+                self._file.flush()
+        finally:
+            if self._owned:
+                self._file.close()
+
+    def __enter__(self) -> "ExportSink":
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # Tras un error no se completa el archivo: solo se libera
+            self._closed = True
+            if self._owned:
+                self._file.close()
+
+class PlainSink(ExportSink):
+    """Una contraseña por línea"""
+
+    def encode(self, password: str, strength: PasswordStrength) -> str:
+        return password + "\n"
+
+class CsvSink(ExportSink):
+    """CSV password,strength con comillas dobles en la contraseña"""
+
+    def header(self) -> str:
+        return "password,strength\n"
+
+    def encode(self, password: str, strength: PasswordStrength) -> str:
+        return '"' + password.replace('"', '""') + '",' + strength.name + "\n"
+
+class JsonlSink(ExportSink):
+    """Un objeto JSON por línea"""
+
+    def __init__(self, *args, **kwargs):
+        from json.encoder import encode_basestring
+        self._quote = encode_basestring
+        super().__init__(*args, **kwargs)
+
+    def encode(self, password: str, strength: PasswordStrength) -> str:
+        return '{"password": %s, "strength": "%s"}\n' % (self._quote(password), strength.name)
+
+class KeePassCsvSink(ExportSink):
+    """
+    CSV con las columnas que reconocen KeePassXC y el importador genérico de
+    KeePass 2: cada contraseña es una entrada del grupo indicado, con la
+    fortaleza en las notas.
+    """
+
+    def __init__(self, *args, group: str = "NEIR", title: str = "Contraseña {n}", **kwargs):
+        """
+        Args:
+            group (str): Grupo de las entradas
+            title (str): Título de cada entrada; {n} es su número desde 1
+        """
+        self.group = '"' + group.replace('"', '""') + '"'
+        self.title = title
+        self._index = 0
+        super().__init__(*args, **kwargs)
+
+    def header(self) -> str:
+        return '"Group","Title","Username","Password","URL","Notes"\n'
+
+    def encode(self, password: str, strength: PasswordStrength) -> str:
+        self._index += 1
+        title = self.title.format(n=self._index).replace('"', '""')
+        return '%s,"%s","","%s","","%s"\n' % (self.group, title,
+                                            password.replace('"', '""'), strength.name)
+
+class BitwardenJsonSink(ExportSink):
+    """
+    JSON de importación de Bitwarden ("Bitwarden (json)", sin cifrar). El
+    documento se escribe en flujo: cabecera, elementos separados por comas
+    y cierre al llamar a close().
+    """
+
+    def __init__(self, *args, name: str = "Contraseña {n}", **kwargs):
+        """
+        Args:
+            name (str): Nombre de cada elemento; {n} es su número desde 1
+        """
+        from json.encoder import encode_basestring
+        self._quote = encode_basestring
+        self.name = name
+        self._index = 0
+        super().__init__(*args, **kwargs)
+
+    def header(self) -> str:
+        return '{"encrypted": false, "folders": [], "items": [\n'
+
+    def encode(self, password: str, strength: PasswordStrength) -> str:
+        self._index += 1
+        return ('%s{"type": 1, "name": %s, "notes": "%s", "favorite": false, '
+                '"login": {"username": null, "password": %s, "uris": []}}' % (
+                    ",\n" if self._index > 1 else "",
+                    self._quote(self.name.format(n=self._index)),
+                    strength.name, self._quote(password)))
+
+    def footer(self) -> str:
+        return "\n]}\n"
+
+SINKS: Dict[str, Type[ExportSink]] = {
+    "plain": PlainSink,
+    "csv": CsvSink,
+    "jsonl": JsonlSink,
+    "keepass": KeePassCsvSink,
+    "bitwarden": BitwardenJsonSink,
+}
+
+def open_sink(target: Union[str, BinaryIO], fmt: str, compression: Optional[str] = None,
+              level: Optional[int] = None, fsync: str = "close",
+              block_size: int = BLOCK_SIZE) -> ExportSink:
+    """
+    Crea el destino de exportación de un formato.
+
+    Args:
+        target (Union[str, BinaryIO]): Ruta o archivo binario abierto
+        fmt (str): Uno de SINKS
+        compression (Optional[str]): None, "gzip" o "xz"
+        level (Optional[int]): Nivel de compresión
+        fsync (str): Política de fsync, una de FSYNC_POLICIES
+        block_size (int): Bytes acumulados antes de cada escritura
+
+    Returns:
+        ExportSink: Destino abierto; hay que cerrarlo (o usarlo con with)
+
+    Raises:
+        ValueError: Si el formato, la compresión o la política no existen
+    """
+    try:
+        sink = SINKS[fmt]
+    except KeyError:
+        raise ValueError(f"Formato desconocido: {fmt}") from None
+    return sink(target, compression=compression, level=level, fsync=fsync,
+                block_size=block_size)
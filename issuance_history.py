@@ -0,0 +1,366 @@
+"""
+Módulo de historial persistente de contraseñas emitidas.
+Guarda en SQLite (modo WAL) una huella HMAC-SHA256 de 64 bits de cada
+contraseña emitida, nunca la contraseña, para garantizar que ninguna se
+emita dos veces entre ejecuciones ni entre máquinas que comparten el
+archivo. Cada lote se comprueba e inserta en una sola transacción con
+executemany.
+
+La huella es la clave primaria entera de la tabla (el propio B-tree de
+SQLite), así que no hay índice aparte que mantener y cada consulta o
+inserción cuesta O(log n) accesos a páginas, casi constante con la caché.
+Como las huellas son aleatorias, una tanda toca hasta una hoja del B-tree
+por contraseña; tandas más grandes reparten cada hoja escrita entre más
+inserciones.
+
+La clave HMAC debe guardarse fuera de la base de datos (archivo de clave o
+variable de entorno NEIR_HISTORY_KEY). Si no se indica ninguna, la clave se
+crea y se guarda en la propia base de datos: el historial sigue evitando
+reemisiones, pero quien tenga el archivo puede comprobar contraseñas
+candidatas contra las huellas, así que las huellas no protegen nada.
+
+Uso:
+    python -m issuance_history clave historial.key
+    python -m issuance_history estadisticas historial.db
+    python -m issuance_history podar historial.db --dias 365
+    python -m issuance_history compactar historial.db
+
+Autor: Nelson Espinosa
+Versión: 1.2.0
+"""
+
+import hashlib
+import hmac
+import logging
+import os
+import sqlite3
+import sys
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from dedup import MAX_STALLED_ROUNDS, Record
+
+SCHEMA_VERSION = 1
+KEY_SIZE = 32
+KEY_ENV = "NEIR_HISTORY_KEY"
+BATCH_SIZE = 10_000
+_QUERY_CHUNK = 500  # parámetros por consulta IN (...), por debajo del límite de SQLite
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS issued (
+    fingerprint INTEGER PRIMARY KEY,
+    issued_at INTEGER NOT NULL
+);
+"""
+
+logger = logging.getLogger(__name__)
+
+def load_key(key_file: Optional[str] = None) -> Optional[bytes]:
+    """
+    Obtiene la clave HMAC externa del historial.
+
+    Args:
+        key_file (Optional[str]): Archivo con la clave en hexadecimal; sin él
+            se usa la variable de entorno NEIR_HISTORY_KEY
+
+    Returns:
+        Optional[bytes]: Clave, o None si no se indicó ninguna
+
+    Raises:
+        ValueError: Si la clave no es hexadecimal o tiene menos de 16 bytes
+    """
+    if key_file is not None:
+        with open(key_file, encoding="ascii") as f:
+            text = f.read()
+    else:
+        text = os.environ.get(KEY_ENV)
+        if not text:
+            return None
+    try:
+        key = bytes.fromhex(text.strip())
+    except ValueError:
+        raise ValueError("La clave del historial debe estar en hexadecimal") from None
+    if len(key) < 16:
+        raise ValueError("La clave del historial debe tener al menos 16 bytes")
+    return key
+
+def _key_check(key: bytes) -> bytes:
+    """Valor de comprobación de la clave, guardado en lugar de la clave"""
+    return hmac.new(key, b"neir-issuance-history", hashlib.sha256).digest()[:8]
+
+class IssuanceHistory:
+    """
+    Historial de emisión sobre una base de datos SQLite.
+
+    La clave HMAC debe indicarse desde fuera (key, key_file o
+    NEIR_HISTORY_KEY) y ser la misma en todas las máquinas que comparten el
+    archivo; la base de datos solo guarda un valor de comprobación que
+    detecta una clave equivocada. Sin clave externa se crea una al azar y se
+    guarda en la base de datos, lo que no protege las huellas frente a quien
+    tenga el archivo.
+    Las conexiones de sqlite3 no se comparten entre hilos: cada hilo o
+    proceso debe abrir su propio IssuanceHistory.
+
+    Atributos:
+        path (str): Ruta de la base de datos
+    """
+
+    def __init__(self, path: str, key: Optional[bytes] = None, timeout: float = 30.0,
+                 key_file: Optional[str] = None, maintenance: bool = False):
+        """
+        Abre o crea el historial.
+
+        Args:
+            path (str): Ruta de la base de datos
+            key (Optional[bytes]): Clave HMAC; None la toma de key_file o de
+                NEIR_HISTORY_KEY y, si tampoco hay, de la base de datos (una
+                base nueva sin clave externa crea y guarda la suya)
+            timeout (float): Segundos de espera si otro proceso tiene el bloqueo
+            key_file (Optional[str]): Archivo con la clave en hexadecimal
+            maintenance (bool): Abrir sin clave, solo para stats, prune y
+                compact
+
+        Raises:
+            ValueError: Si la base de datos es de una versión desconocida, la
+                clave no corresponde a la del historial o falta la clave
+        """
+        if key is None:
+            key = load_key(key_file)
+        self.path = path
+        self._db = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA cache_size=-65536")  # 64 MiB de páginas en caché
+        self._db.executescript(_SCHEMA)
+
+        with self._transaction():
+            rows = dict(self._db.execute("SELECT name, value FROM meta"))
+            if not rows:
+                rows = {"version": str(SCHEMA_VERSION).encode()}
+                if key is None:
+                    rows["key"] = os.urandom(KEY_SIZE)
+                rows["key_check"] = _key_check(key or rows["key"])
+                self._db.executemany("INSERT INTO meta VALUES (?, ?)", rows.items())
+        if int(rows["version"]) != SCHEMA_VERSION:
+            self._db.close()
+            raise ValueError(f"Versión de historial no soportada: {rows['version']!r}")
+        key = key or rows.get("key")
+        self._mac = None
+        if key is None and not maintenance:
+            self._db.close()
+            raise ValueError(f"El historial no guarda su clave: indica key_file o {KEY_ENV}")
+        if key is not None:
+            # Las bases anteriores guardan la clave pero no el valor de comprobación
+            check = rows.get("key_check") or _key_check(rows.get("key", key))
+            if not hmac.compare_digest(check, _key_check(key)):
+                self._db.close()
+                raise ValueError("La clave no corresponde a este historial")
+            self._mac = hmac.new(key, digestmod=hashlib.sha256)
+
+    def _transaction(self) -> "_Transaction":
+        return _Transaction(self._db)
+
+    def fingerprint(self, password: str) -> int:
+        """Huella HMAC-SHA256 truncada a un entero con signo de 64 bits"""
+        if self._mac is None:
+            raise ValueError("Historial abierto solo para mantenimiento")
+        mac = self._mac.copy()
+        mac.update(password.encode("utf-8"))
+        return int.from_bytes(mac.digest()[:8], "little", signed=True)
+
+    def reserve(self, passwords: Sequence[str]) -> List[bool]:
+        """
+        Registra un lote de contraseñas como emitidas.
+
+        La comprobación y la inserción ocurren en una sola transacción con
+        bloqueo de escritura, así que dos procesos nunca reservan la misma
+        contraseña.
+
+        Args:
+            passwords (Sequence[str]): Contraseñas candidatas
+
+        Returns:
+            List[bool]: True para cada contraseña nueva, ahora registrada;
+            False si ya se había emitido (o se repite dentro del lote)
+        """
+        fingerprints = [self.fingerprint(password) for password in passwords]
+        # En orden de clave, las consultas y las inserciones recorren el B-tree
+        # de izquierda a derecha y cada página se visita una sola vez por tanda
+        ordered = sorted(set(fingerprints))
+        now = int(time.time())
+        with self._transaction():
+            existing = set()
+            for start in range(0, len(ordered), _QUERY_CHUNK):
+                chunk = ordered[start:start + _QUERY_CHUNK]
+                query = ("SELECT fingerprint FROM issued WHERE fingerprint IN (%s)"
+                         % ",".join("?" * len(chunk)))
+                existing.update(row[0] for row in self._db.execute(query, chunk))
+            accepted = []
+            new_rows = []
+            for fingerprint in fingerprints:
+                if fingerprint in existing:
+                    accepted.append(False)
+                else:
+                    existing.add(fingerprint)
+                    accepted.append(True)
+                    new_rows.append((fingerprint, now))
+            new_rows.sort()
+            self._db.executemany("INSERT INTO issued VALUES (?, ?)", new_rows)
+        return accepted
+
+    def contains(self, password: str) -> bool:
+        """Indica si la contraseña ya se emitió"""
+        row = self._db.execute("SELECT 1 FROM issued WHERE fingerprint = ?",
+                               (self.fingerprint(password),)).fetchone()
+        return row is not None
+
+    def filter_records(self, records: Iterable[Record],
+                       refill: Callable[[int], Iterable[Record]],
+                       batch_size: int = BATCH_SIZE) -> Iterator[Record]:
+        """
+        Deja pasar solo registros (contraseña, ...) nunca emitidos, reservándolos
+        por tandas de batch_size y reponiendo los rechazados con refill.
+
+        Igual que dedup.unique_records, repone hasta completar y solo tras
+        MAX_STALLED_ROUNDS reposiciones seguidas sin ninguna contraseña nueva
+        registra un error y termina con menos registros de los pedidos.
+
+        Args:
+            records (Iterable[Record]): Flujo original; la contraseña es el primer campo
+            refill (Callable[[int], Iterable[Record]]): Genera k registros nuevos
+            batch_size (int): Registros por transacción
+
+        Returns:
+            Iterator[Record]: Registros con contraseñas registradas en el historial
+        """
+        source = iter(records)
+        stalled = 0
+        while True:
+            missing = 0
+            progressed = False
+            while True:
+                batch = [record for _, record in zip(range(batch_size), source)]
+                if not batch:
+                    break
+                for record, accepted in zip(batch, self.reserve([r[0] for r in batch])):
+                    if accepted:
+                        progressed = True
+                        yield record
+                    else:
+                        missing += 1
+            if not missing:
+                return
+            stalled = 0 if progressed else stalled + 1
+            if stalled >= MAX_STALLED_ROUNDS:
+                logger.error("Sin contraseñas nuevas en %d tandas seguidas: faltan %d",
+                             stalled, missing)
+                return
+            source = iter(refill(missing))
+
+    def prune(self, older_than: float) -> int:
+        """
+        Elimina las huellas emitidas hace más de older_than segundos.
+
+        issued_at no tiene índice para no encarecer cada inserción, así que
+        podar recorre la tabla entera; es una tarea de mantenimiento ocasional.
+        Las contraseñas podadas dejan de estar protegidas contra la reemisión.
+
+        Returns:
+            int: Huellas eliminadas
+        """
+        cutoff = int(time.time() - older_than)
+        with self._transaction():
+            cursor = self._db.execute("DELETE FROM issued WHERE issued_at < ?", (cutoff,))
+        return cursor.rowcount
+
+    def compact(self) -> None:
+        """Recupera el espacio libre y traslada el WAL a la base de datos"""
+        self._db.execute("VACUUM")
+        self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def stats(self) -> Dict[str, Optional[int]]:
+        """
+        Obtiene el tamaño del historial.
+
+        Returns:
+            Dict[str, Optional[int]]: count, oldest y newest (segundos desde
+            epoch) y file_bytes (base de datos más WAL)
+        """
+        count, oldest, newest = self._db.execute(
+            "SELECT COUNT(*), MIN(issued_at), MAX(issued_at) FROM issued").fetchone()
+        size = sum(os.path.getsize(p) for p in (self.path, self.path + "-wal")
+                   if os.path.exists(p))
+        return {"count": count, "oldest": oldest, "newest": newest, "file_bytes": size}
+
+    def close(self) -> None:
+        """Cierra la conexión"""
+        self._db.close()
+
+    def __enter__(self) -> "IssuanceHistory":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+class _Transaction:
+    """Transacción con BEGIN IMMEDIATE: toma el bloqueo de escritura al empezar"""
+
+    def __init__(self, db: sqlite3.Connection):
+        self._db = db
+
+    def __enter__(self) -> None:
+        self._db.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        self._db.execute("COMMIT" if exc_type is None else "ROLLBACK")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Función principal de la línea de comandos"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m issuance_history",
+                                     description="Historial de contraseñas emitidas")
+    commands = parser.add_subparsers(dest="comando", required=True)
+    key_command = commands.add_parser("clave", help="crear un archivo de clave nuevo")
+    key_command.add_argument("archivo")
+    for name, help_text in (("estadisticas", "mostrar el tamaño del historial"),
+                            ("podar", "eliminar huellas antiguas"),
+                            ("compactar", "vaciar el WAL y recuperar espacio")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("historial")
+        if name == "podar":
+            command.add_argument("--dias", type=float, required=True,
+                                 help="conservar solo las emitidas en los últimos N días")
+    args = parser.parse_args(argv)
+
+    if args.comando == "clave":
+        # O_EXCL: nunca se sobrescribe una clave existente
+        try:
+            fd = os.open(args.archivo, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            print(f"Error: ya existe {args.archivo}", file=sys.stderr)
+            return 1
+        with os.fdopen(fd, "w", encoding="ascii") as f:
+            f.write(os.urandom(KEY_SIZE).hex() + "\n")
+        print(f"Clave creada en {args.archivo}; guárdala fuera del historial")
+        return 0
+    if not os.path.exists(args.historial):
+        print(f"Error: no existe {args.historial}", file=sys.stderr)
+        return 1
+    with IssuanceHistory(args.historial, maintenance=True) as history:
+        if args.comando == "podar":
+            removed = history.prune(args.dias * 86400)
+            print(f"Huellas eliminadas: {removed}")
+        elif args.comando == "compactar":
+            history.compact()
+        stats = history.stats()
+    print(f"Huellas: {stats['count']:,}")
+    for label, key in (("Más antigua", "oldest"), ("Más reciente", "newest")):
+        if stats[key] is not None:
+            print(f"{label}: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stats[key]))}")
+    print(f"Tamaño en disco: {stats['file_bytes']:,} bytes")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
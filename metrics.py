@@ -0,0 +1,298 @@
+"""
+Módulo de métricas y perfilado del generador de contraseñas.
+Reúne contadores (llamadas, intentos, rechazos por motivo, fallos por motivo),
+histogramas de latencia de generación y evaluación, salidas configurables
+(instantánea en proceso y formato de texto de Prometheus) y la captura de
+una llamada con cProfile.
+
+Las métricas están desactivadas por defecto: PasswordGenerator.metrics vale
+None y el generador solo comprueba ese atributo.
+
+Autor: Nelson Espinosa
+Versión: 1.2.0
+"""
+
+import bisect
+import os
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Tuple, Union
+
+class LatencyHistogram:
+    """
+    Histograma de latencias con cubetas exponenciales.
+
+    Atributos:
+        bounds (Tuple[float, ...]): Límite superior de cada cubeta en segundos
+        counts (List[int]): Observaciones por cubeta (la última es +Inf)
+        total (float): Suma de todas las observaciones
+        count (int): Número de observaciones
+    """
+
+    DEFAULT_BOUNDS = tuple(0.0001 * 2 ** i for i in range(15))  # 0.1 ms .. ~1.6 s
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_BOUNDS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        """Registra una observación"""
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimación del cuantil q (límite superior de la cubeta que lo contiene)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Resumen serializable en JSON"""
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": {f"{bound:g}": count for bound, count in zip(self.bounds, self.counts)},
+            "inf": self.counts[-1],
+        }
+
+class GeneratorMetrics:
+    """
+    Métricas de un PasswordGenerator.
+
+    Contadores:
+        calls: llamadas a generate_password
+        attempts: contraseñas construidas (intentos consumidos de 'iterations')
+        rejections{reason}: candidatos descartados (repeticion, filtracion, debil,
+            emitida)
+        failures{reason}: llamadas sin contraseña (parametros, politica,
+            cancelada, agotada)
+
+    Histogramas (segundos): generation (llamada completa) y evaluation
+    (evaluación de fortaleza).
+
+    Atributos:
+        counters (Counter): Valor de cada contador
+        histograms (Dict[str, LatencyHistogram]): Histogramas por nombre
+        sinks (List): Salidas que reciben las métricas en publish()
+        last_profile (Optional[pstats.Stats]): Perfil de la última llamada capturada
+    """
+
+    # Generar o evaluar una contraseña lleva microsegundos: 1 µs .. ~1 s
+    BOUNDS = tuple(1e-6 * 2 ** i for i in range(21))
+
+    def __init__(self, sinks: Iterable[Any] = ()):
+        """
+        Inicializa contadores e histogramas vacíos.
+
+        Args:
+            sinks (Iterable): Salidas con un método publish(metrics)
+        """
+        self.counters: Counter = Counter()
+        self.histograms: Dict[str, LatencyHistogram] = {
+            "generation": LatencyHistogram(self.BOUNDS),
+            "evaluation": LatencyHistogram(self.BOUNDS),
+        }
+        self.sinks: List[Any] = list(sinks)
+        self.last_profile = None
+        self._profile_pending = False
+        self._profile_path: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, amount: int = 1, reason: Optional[str] = None) -> None:
+        """
+        Incrementa un contador.
+
+        Args:
+            name (str): Nombre del contador
+            amount (int): Incremento
+            reason (Optional[str]): Motivo, para contadores con etiqueta
+        """
+        key = name if reason is None else (name, reason)
+        with self._lock:
+            self.counters[key] += amount
+
+    def observe(self, name: str, seconds: float) -> None:
+        """
+        Registra una latencia en el histograma indicado.
+
+        Args:
+            name (str): Nombre del histograma
+            seconds (float): Duración en segundos
+        """
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram(self.BOUNDS)
+            histogram.observe(seconds)
+
+    def finish(self, seconds: float, attempts: int, failure: Optional[str] = None) -> None:
+        """
+        Registra el final de una llamada a generate_password.
+
+        Args:
+            seconds (float): Duración de la llamada
+            attempts (int): Intentos consumidos
+            failure (Optional[str]): Motivo del fallo; None si hubo contraseña
+        """
+        with self._lock:
+            self.counters["calls"] += 1
+            self.counters["attempts"] += attempts
+            if failure is not None:
+                self.counters[("failures", failure)] += 1
+            self.histograms["generation"].observe(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Obtiene una copia serializable en JSON de todas las métricas.
+
+        Returns:
+            Dict[str, Any]: Contadores (las etiquetas como "nombre{motivo}") e
+            histogramas
+        """
+        with self._lock:
+            counters = {key if isinstance(key, str) else f"{key[0]}{{{key[1]}}}": value
+                        for key, value in self.counters.items()}
+            histograms = {name: histogram.snapshot() for name, histogram in self.histograms.items()}
+        return {"counters": counters, "histograms": histograms}
+
+    def publish(self) -> None:
+        """Envía las métricas actuales a todas las salidas registradas"""
+        for sink in self.sinks:
+            sink.publish(self)
+
+    def capture_profile(self, path: Optional[str] = None) -> None:
+        """
+        Perfila con cProfile la próxima llamada a generate_password.
+
+        El resultado queda en last_profile y, si se indica, en un archivo
+        legible con pstats.
+
+        Args:
+            path (Optional[str]): Archivo donde volcar el perfil
+        """
+        self._profile_pending = True
+        self._profile_path = path
+
+    @property
+    def profile_pending(self) -> bool:
+        """Indica si la próxima llamada debe perfilarse"""
+        return self._profile_pending
+
+    def profile(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Ejecuta una llamada bajo cProfile y guarda el perfil.
+
+        Args:
+            func (Callable): Función a perfilar
+            *args, **kwargs: Argumentos de la llamada
+
+        Returns:
+            Any: Resultado de la llamada
+        """
+        import cProfile
+        import pstats
+
+        self._profile_pending = False
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func, *args, **kwargs)
+        finally:
+            self.last_profile = pstats.Stats(profiler)
+            if self._profile_path:
+                self.last_profile.dump_stats(self._profile_path)
+
+class SnapshotSink:
+    """
+    Salida en proceso: guarda la última instantánea publicada.
+
+    Atributos:
+        last (Optional[Dict[str, Any]]): Última instantánea
+    """
+
+    def __init__(self):
+        self.last: Optional[Dict[str, Any]] = None
+
+    def publish(self, metrics: GeneratorMetrics) -> None:
+        """Guarda una instantánea de las métricas"""
+        self.last = metrics.snapshot()
+
+class PrometheusTextSink:
+    """
+    Salida en formato de texto de Prometheus, a un archivo o a un flujo.
+
+    Con un archivo, cada publicación lo reemplaza de forma atómica para que
+    un recolector (p. ej. el textfile collector de node_exporter) nunca lea
+    un volcado a medias.
+    """
+
+    def __init__(self, target: Union[str, TextIO], prefix: str = "password_generator"):
+        """
+        Args:
+            target (Union[str, TextIO]): Ruta de archivo o flujo de texto
+            prefix (str): Prefijo de los nombres de métrica
+        """
+        self.target = target
+        self.prefix = prefix
+
+    def publish(self, metrics: GeneratorMetrics) -> None:
+        """Escribe las métricas en formato de texto de Prometheus"""
+        text = prometheus_text(metrics, self.prefix)
+        if isinstance(self.target, str):
+            temp = self.target + ".tmp"
+            with open(temp, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(temp, self.target)
+        else:
+            self.target.write(text)
+            self.target.flush()
+
+def prometheus_text(metrics: GeneratorMetrics, prefix: str = "password_generator") -> str:
+    """
+    Genera el volcado de las métricas en formato de texto de Prometheus.
+
+    Args:
+        metrics (GeneratorMetrics): Métricas a volcar
+        prefix (str): Prefijo de los nombres de métrica
+
+    Returns:
+        str: Texto listo para exponer
+    """
+    with metrics._lock:
+        counters = sorted(metrics.counters.items(),
+                          key=lambda item: item[0] if isinstance(item[0], tuple) else (item[0], ""))
+        histograms = [(name, histogram.bounds, list(histogram.counts), histogram.total,
+                       histogram.count) for name, histogram in metrics.histograms.items()]
+
+    lines = []
+    declared = set()
+    for key, value in counters:
+        name, reason = (key, None) if isinstance(key, str) else key
+        metric = f"{prefix}_{name}_total"
+        if metric not in declared:
+            declared.add(metric)
+            lines.append(f"# TYPE {metric} counter")
+        labels = f'{{reason="{reason}"}}' if reason is not None else ""
+        lines.append(f"{metric}{labels} {value}")
+
+    for name, bounds, counts, total, count in histograms:
+        metric = f"{prefix}_{name}_seconds"
+        lines.append(f"# TYPE {metric} histogram")
+        cumulative = 0
+        for bound, bucket in zip(bounds, counts):
+            cumulative += bucket
+            lines.append(f'{metric}_bucket{{le="{bound:g}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{le="+Inf"}} {count}')
+        lines.append(f"{metric}_sum {total!r}")
+        lines.append(f"{metric}_count {count}")
+    return "\n".join(lines) + "\n"
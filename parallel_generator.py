@@ -0,0 +1,131 @@
+"""
+Módulo de generación paralela de contraseñas.
+Reparte lotes muy grandes entre varios procesos con ProcessPoolExecutor,
+cada uno con su propia reserva de entropía, y devuelve los resultados
+como un flujo con memoria acotada.
+
+Autor: Nelson Espinosa
+Versión: 1.2.0
+"""
+
+import logging
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Iterator, Optional, Set, Tuple
+
+from entropy_pool import EntropyPool
+from password_generator import PasswordGenerator, PasswordStrength
+
+logger = logging.getLogger(__name__)
+
+_worker_generator: Optional[PasswordGenerator] = None
+
+def _init_worker() -> None:
+    """Crea en cada proceso un generador con su propia reserva de entropía"""
+    global _worker_generator
+    _worker_generator = PasswordGenerator(EntropyPool())
+
+def _generate_chunk(count: int, length: int, flags: Tuple[bool, bool, bool, bool]) -> Tuple[Optional[PasswordStrength], str]:
+    """
+    Genera un bloque de contraseñas en un proceso trabajador.
+
+    Como todas tienen la misma longitud y fortaleza, se devuelven concatenadas
+    en una sola cadena para abaratar la serialización entre procesos.
+
+    Returns:
+        Tuple[Optional[PasswordStrength], str]: Fortaleza común y contraseñas
+        concatenadas; (None, "") si no se pudo generar
+    """
+    generator = _worker_generator or PasswordGenerator()
+    results = list(generator.generate_batch(count, length, *flags))
+    if not results:
+        return None, ""
+    return results[0][1], "".join(password for password, _ in results)
+
+def generate_parallel(n: int, length: int, use_lower: bool = True,
+                      use_upper: bool = True, use_digits: bool = True,
+                      use_special: bool = True, workers: Optional[int] = None,
+                      chunk_size: int = 10000, ordered: bool = True,
+                      max_pending: Optional[int] = None) -> Iterator[Tuple[str, PasswordStrength]]:
+    """
+    Genera n contraseñas repartiendo el trabajo entre varios procesos.
+
+    Solo se mantienen max_pending bloques en vuelo a la vez: no se envía un
+    bloque nuevo hasta que el consumidor ha recibido otro, por lo que la
+    memoria no crece con n.
+
+    Args:
+        n (int): Número de contraseñas a generar
+        length (int): Longitud de cada contraseña (8-129)
+        use_lower (bool): Incluir minúsculas
+        use_upper (bool): Incluir mayúsculas
+        use_digits (bool): Incluir números
+        use_special (bool): Incluir caracteres especiales
+        workers (Optional[int]): Número de procesos; por defecto os.cpu_count()
+        chunk_size (int): Contraseñas por bloque enviado a un trabajador
+        ordered (bool): Entregar los bloques en el orden de envío; si es False
+            se entregan en cuanto terminan
+        max_pending (Optional[int]): Bloques en vuelo; por defecto 2 por proceso
+
+    Returns:
+        Iterator[Tuple[str, PasswordStrength]]: Contraseñas y su fortaleza
+    """
+    if n < 0 or not 8 <= length <= 129 or chunk_size <= 0:
+        logger.error("Parámetros inválidos: cantidad=%s, longitud=%s, bloque=%s", n, length, chunk_size)
+        return iter(())
+    flags = (use_lower, use_upper, use_digits, use_special)
+    if not any(flags):
+        logger.error("No se seleccionaron tipos de caracteres")
+        return iter(())
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 2
+    return _iter_parallel(n, length, flags, workers, chunk_size, ordered, max_pending)
+
+def _iter_parallel(n: int, length: int, flags: Tuple[bool, bool, bool, bool],
+                   workers: int, chunk_size: int, ordered: bool,
+                   max_pending: int) -> Iterator[Tuple[str, PasswordStrength]]:
+    """Envía los bloques al pool y entrega sus resultados con contrapresión"""
+    remaining = n
+    delivered = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        pending: "deque[Future]" = deque()
+        running: Set[Future] = set()
+
+        def submit() -> None:
+            nonlocal remaining
+            count = min(chunk_size, remaining)
+            remaining -= count
+            future = executor.submit(_generate_chunk, count, length, flags)
+            pending.append(future)
+            running.add(future)
+
+        while remaining and len(pending) < max_pending:
+            submit()
+
+        try:
+            while pending:
+                if ordered:
+                    future = pending.popleft()
+                else:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    future = done.pop()
+                    pending.remove(future)
+                running.discard(future)
+
+                strength, joined = future.result()
+                if strength is None:
+                    logger.error("Un trabajador no pudo generar su bloque: se entregaron %d de %d",
+                                 delivered, n)
+                    return
+                if remaining:
+                    submit()
+                for start in range(0, len(joined), length):
+                    yield joined[start:start + length], strength
+                delivered += len(joined) // length
+            if delivered < n:
+                logger.error("Lote incompleto: se entregaron %d de %d", delivered, n)
+        finally:
+            for future in running:
+                future.cancel()
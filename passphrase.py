@@ -0,0 +1,312 @@
+"""
+Módulo de generación de frases de contraseña al estilo Diceware.
+Elige palabras de forma uniforme con el generador criptográfico a partir de
+una lista de palabras preprocesada en un índice binario de desplazamientos.
+El índice se abre con mmap: no se analiza ningún archivo al arrancar, cada
+palabra se obtiene en O(1) y los procesos que abren la misma lista
+comparten sus páginas en memoria.
+
+Uso:
+    python -m passphrase construir eff_large_wordlist.txt palabras.pwl
+    python -m passphrase generar palabras.pwl [--palabras 6] [--separador -]
+
+Autor: Nelson Espinosa
+Versión: 1.2.0
+"""
+
+import math
+import mmap
+import os
+import secrets
+import string
+import sys
+from array import array
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Union
+
+from strength_evaluator import PasswordStrength
+
+WORDLIST_MAGIC = b"NEIRPWL1"
+_HEADER_SIZE = len(WORDLIST_MAGIC) + 4
+MIN_WORDS = 3
+MAX_WORDS = 20
+DEFAULT_WORDS = 6
+DEFAULT_SEPARATOR = "-"
+SEPARATORS = string.punctuation
+
+class Passphrase(NamedTuple):
+    """Frase generada con su entropía y el nivel de fortaleza correspondiente"""
+    text: str
+    entropy_bits: float
+    strength: PasswordStrength
+
+class Wordlist:
+    """
+    Lista de palabras indexada sobre un búfer (bytes o mmap).
+
+    Formato: WORDLIST_MAGIC, número de palabras (uint32), count+1
+    desplazamientos uint32 little-endian relativos al inicio de los datos y
+    las palabras en UTF-8 concatenadas. La palabra i ocupa
+    [offsets[i], offsets[i+1]), así que leerla no recorre la lista.
+
+    Atributos:
+        count (int): Número de palabras
+        path (Optional[str]): Archivo del que se abrió, o None si está en memoria
+    """
+
+    _cache: Dict[str, "Wordlist"] = {}
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap], path: Optional[str] = None):
+        """
+        Abre una lista sobre un búfer ya cargado.
+
+        Args:
+            buffer (Union[bytes, mmap.mmap]): Contenido completo del índice
+            path (Optional[str]): Ruta de origen, si la hay
+
+        Raises:
+            ValueError: Si el búfer no es una lista de palabras válida
+        """
+        if buffer[:len(WORDLIST_MAGIC)] != WORDLIST_MAGIC:
+            raise ValueError("El archivo no es una lista de palabras válida")
+        self._buffer = buffer
+        self.path = path
+        self.count = int.from_bytes(buffer[len(WORDLIST_MAGIC):_HEADER_SIZE], "little")
+        self._data_start = _HEADER_SIZE + (self.count + 1) * 4
+        if self.count == 0 or len(buffer) < self._data_start:
+            raise ValueError("La lista de palabras está vacía o truncada")
+        offsets = memoryview(buffer)[_HEADER_SIZE:self._data_start].cast("I")
+        if sys.byteorder == "big":
+            swapped = array("I", offsets)
+            swapped.byteswap()
+            offsets = memoryview(swapped)
+        self._offsets = offsets
+
+    @classmethod
+    def open(cls, path: str) -> "Wordlist":
+        """
+        Abre una lista en disco con mmap, una sola vez por proceso.
+
+        Args:
+            path (str): Ruta del índice generado con build_wordlist
+
+        Returns:
+            Wordlist: Lista compartida
+        """
+        path = os.path.abspath(path)
+        wordlist = cls._cache.get(path)
+        if wordlist is None:
+            with open(path, "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            wordlist = cls._cache[path] = cls(buffer, path)
+        return wordlist
+
+    @classmethod
+    def from_words(cls, words: Iterable[str]) -> "Wordlist":
+        """
+        Construye una lista en memoria.
+
+        Args:
+            words (Iterable[str]): Palabras; se normalizan como en build_wordlist
+
+        Returns:
+            Wordlist: Lista en memoria
+        """
+        return cls(_encode_wordlist(words))
+
+    def __reduce__(self):
+        # Al enviarse a otro proceso, una lista en disco se vuelve a abrir por
+        # su ruta en lugar de copiar su contenido
+        if self.path is not None:
+            return (Wordlist.open, (self.path,))
+        return (Wordlist, (bytes(self._buffer),))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> str:
+        """Palabra en la posición index, en O(1)"""
+        if not 0 <= index < self.count:
+            raise IndexError("índice de palabra fuera de rango")
+        start = self._data_start + self._offsets[index]
+        end = self._data_start + self._offsets[index + 1]
+        return self._buffer[start:end].decode("utf-8")
+
+def _normalize(line: str) -> Optional[str]:
+    """
+    Extrae la palabra de una línea de texto plano o de una lista Diceware
+    ("11111<tab>palabra"). Solo se aceptan palabras que empiezan por una
+    letra con mayúscula, para que la capitalización siempre cambie la frase.
+    """
+    fields = line.split()
+    if not fields:
+        return None
+    word = fields[-1].lower()
+    if not (word[0].isalpha() and word[0].upper() != word[0]):
+        return None
+    return word
+
+def _encode_wordlist(words: Iterable[str]) -> bytes:
+    """Serializa las palabras en el formato de Wordlist"""
+    seen = set()
+    encoded: List[bytes] = []
+    for line in words:
+        word = _normalize(line)
+        if word is not None and word not in seen:
+            seen.add(word)
+            encoded.append(word.encode("utf-8"))
+
+    offsets = array("I", [0]) * (len(encoded) + 1)
+    position = 0
+    for i, word in enumerate(encoded):
+        position += len(word)
+        offsets[i + 1] = position
+    if sys.byteorder == "big":
+        offsets.byteswap()
+    return (WORDLIST_MAGIC + len(encoded).to_bytes(4, "little") + offsets.tobytes()
+            + b"".join(encoded))
+
+def build_wordlist(wordlist_path: str, index_path: str) -> int:
+    """
+    Convierte una lista de palabras de texto (una por línea, o en formato
+    Diceware con el número de dados delante) en un índice para Wordlist.open.
+    Las palabras repetidas se descartan para que la elección sea uniforme.
+
+    Args:
+        wordlist_path (str): Archivo de texto de entrada
+        index_path (str): Archivo de índice de salida
+
+    Returns:
+        int: Número de palabras indexadas
+    """
+    with open(wordlist_path, "r", encoding="utf-8", errors="ignore") as f:
+        data = _encode_wordlist(f)
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, index_path)
+    return int.from_bytes(data[len(WORDLIST_MAGIC):_HEADER_SIZE], "little")
+
+def passphrase_entropy(wordlist_size: int, words: int, use_upper: bool = True,
+                       use_digits: bool = True, random_separator: bool = False) -> float:
+    """
+    Calcula la entropía de una frase generada con generate_passphrase.
+
+    Cada palabra aporta log2(wordlist_size) bits; elegir la palabra en
+    mayúscula aporta log2(words), el dígito y la palabra a la que se añade
+    log2(10 * words) y un separador aleatorio log2(len(SEPARATORS)).
+
+    Args:
+        wordlist_size (int): Número de palabras de la lista
+        words (int): Palabras de la frase
+        use_upper (bool): Una palabra al azar empieza por mayúscula
+        use_digits (bool): Se añade un dígito al azar a una palabra al azar
+        random_separator (bool): El separador se elige al azar
+
+    Returns:
+        float: Entropía en bits
+    """
+    bits = words * math.log2(wordlist_size)
+    if use_upper:
+        bits += math.log2(words)
+    if use_digits:
+        bits += math.log2(10 * words)
+    if random_separator:
+        bits += math.log2(len(SEPARATORS))
+    return bits
+
+def generate_passphrase(wordlist: Wordlist, words: int = DEFAULT_WORDS,
+                        separator: Optional[str] = None, use_lower: bool = True,
+                        use_upper: bool = True, use_digits: bool = True,
+                        use_special: bool = True,
+                        randbelow: Callable[[int], int] = secrets.randbelow) -> Passphrase:
+    """
+    Genera una frase de contraseña.
+
+    Los indicadores de clase se aplican así:
+    - use_lower: palabras en minúscula; sin él, todas en mayúscula
+    - use_upper: una palabra al azar empieza por mayúscula
+    - use_digits: se añade un dígito al azar al final de una palabra al azar
+    - use_special: sin separador explícito, se elige uno al azar de SEPARATORS
+
+    Args:
+        wordlist (Wordlist): Lista de palabras
+        words (int): Número de palabras (MIN_WORDS-MAX_WORDS)
+        separator (Optional[str]): Separador fijo; None usa uno aleatorio con
+            use_special o DEFAULT_SEPARATOR sin él
+        use_lower (bool): Palabras en minúscula
+        use_upper (bool): Capitalizar una palabra
+        use_digits (bool): Añadir un dígito
+        use_special (bool): Separador aleatorio
+        randbelow (Callable[[int], int]): Fuente de enteros uniformes en [0, n)
+
+    Returns:
+        Passphrase: Frase, entropía en bits y nivel de fortaleza
+
+    Raises:
+        ValueError: Si el número de palabras no es válido
+    """
+    from pattern_estimator import strength_for_bits
+
+    if not MIN_WORDS <= words <= MAX_WORDS:
+        raise ValueError(f"El número de palabras debe estar entre {MIN_WORDS} y {MAX_WORDS}")
+    size = len(wordlist)
+    chosen = [wordlist[randbelow(size)] for _ in range(words)]
+    if not use_lower:
+        chosen = [word.upper() for word in chosen]
+    if use_upper and use_lower:
+        i = randbelow(words)
+        chosen[i] = chosen[i][0].upper() + chosen[i][1:]
+    if use_digits:
+        i = randbelow(words)
+        chosen[i] += string.digits[randbelow(10)]
+    random_separator = separator is None and use_special
+    if random_separator:
+        separator = SEPARATORS[randbelow(len(SEPARATORS))]
+    elif separator is None:
+        separator = DEFAULT_SEPARATOR
+
+    bits = passphrase_entropy(size, words, use_upper and use_lower, use_digits,
+                              random_separator)
+    return Passphrase(separator.join(chosen), bits, strength_for_bits(bits))
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Función principal de la línea de comandos"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m passphrase",
+                                     description="Frases de contraseña al estilo Diceware")
+    commands = parser.add_subparsers(dest="comando", required=True)
+    build = commands.add_parser("construir", help="convertir una lista de palabras en índice")
+    build.add_argument("lista")
+    build.add_argument("indice")
+    generate = commands.add_parser("generar", help="generar frases de contraseña")
+    generate.add_argument("indice", help="índice generado con 'construir'")
+    generate.add_argument("-n", "--cantidad", type=int, default=1)
+    generate.add_argument("--palabras", type=int, default=DEFAULT_WORDS)
+    generate.add_argument("--separador", help="separador fijo (por defecto: aleatorio)")
+    generate.add_argument("--sin-minusculas", action="store_true", help="palabras en mayúscula")
+    generate.add_argument("--sin-mayusculas", action="store_true", help="no capitalizar")
+    generate.add_argument("--sin-numeros", action="store_true", help="no añadir dígito")
+    generate.add_argument("--sin-especiales", action="store_true",
+                          help=f"separador fijo '{DEFAULT_SEPARATOR}'")
+    args = parser.parse_args(argv)
+
+    if args.comando == "construir":
+        count = build_wordlist(args.lista, args.indice)
+        print(f"Lista creada con {count} palabras: {args.indice}")
+        return 0
+
+    wordlist = Wordlist.open(args.indice)
+    try:
+        for _ in range(args.cantidad):
+            result = generate_passphrase(wordlist, args.palabras, args.separador,
+                                         not args.sin_minusculas, not args.sin_mayusculas,
+                                         not args.sin_numeros, not args.sin_especiales)
+            print(f"{result.text}\t{result.entropy_bits:.1f} bits\t{result.strength.value}")
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+Interfaz de línea de comandos para el generador de contraseñas.
+Genera contraseñas sin interfaz gráfica y las escribe de forma incremental
+en la salida estándar o en un archivo. No importa tkinter, pyperclip ni
+manager_theme, por lo que funciona en servidores sin pantalla.
+
+Uso:
+    python -m password_cli -n 1000 -l 16 --formato jsonl -o salida.jsonl
+    python -m password_cli -n 100000 --formato bitwarden --compresion gzip -o vault.json.gz
+
+Autor: Nelson Espinosa
+Versión: 1.2.0
+"""
+
+import argparse
+import itertools
+import logging
+import os
+import sys
+from typing import List, Optional
+
+from export_sinks import COMPRESSIONS, FSYNC_POLICIES, SINKS, open_sink
+from password_generator import PasswordGenerator, setup_logging
+
+FORMATS = tuple(SINKS)
+
+def build_parser() -> argparse.ArgumentParser:
+    """Construye el analizador de argumentos de la línea de comandos"""
+    parser = argparse.ArgumentParser(
+        prog="python -m password_cli",
+        description="Generador de contraseñas NEIR sin interfaz gráfica"
+    )
+    parser.add_argument("-n", "--cantidad", type=int, default=1,
+                        help="número de contraseñas a generar (por defecto: 1)")
+    parser.add_argument("-l", "--longitud", type=int, default=16,
+                        help="longitud de cada contraseña, 8-129 (por defecto: 16)")
+    parser.add_argument("--sin-minusculas", action="store_true", help="excluir a-z")
+    parser.add_argument("--sin-mayusculas", action="store_true", help="excluir A-Z")
+    parser.add_argument("--sin-numeros", action="store_true", help="excluir 0-9")
+    parser.add_argument("--sin-especiales", action="store_true", help="excluir caracteres especiales")
+    parser.add_argument("-f", "--formato", choices=FORMATS, default="plain",
+                        help="formato de salida (por defecto: plain)")
+    parser.add_argument("-o", "--salida", help="archivo de salida (por defecto: stdout)")
+    parser.add_argument("-z", "--compresion", choices=COMPRESSIONS,
+                        help="comprimir la salida al vuelo")
+    parser.add_argument("--nivel", type=int, choices=range(10), metavar="0-9",
+                        help="nivel de compresión (por defecto: 6)")
+    parser.add_argument("--fsync", choices=FSYNC_POLICIES, default="close",
+                        help="cuándo forzar la escritura a disco del archivo de salida "
+                             "(por defecto: close)")
+    parser.add_argument("-p", "--procesos", type=int, default=0,
+                        help="generar con N procesos en paralelo (0: un solo proceso)")
+    parser.add_argument("-u", "--unicas", nargs="?", const="tabla", choices=("tabla", "bloom"),
+                        help="garantizar que no se repita ninguna contraseña, con una tabla "
+                             "de huellas (por defecto) o un filtro de Bloom")
+    parser.add_argument("--historial", metavar="ARCHIVO",
+                        help="base de datos SQLite de contraseñas ya emitidas; no se "
+                             "repite ninguna entre ejecuciones")
+    parser.add_argument("--clave-historial", metavar="ARCHIVO",
+                        help="archivo con la clave del historial (o variable NEIR_HISTORY_KEY); "
+                             "sin clave externa se guarda en la base de datos y no "
+                             "protege las huellas")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Función principal de la línea de comandos"""
+    args = build_parser().parse_args(argv)
+    setup_logging(logging.WARNING)
+    flags = (not args.sin_minusculas, not args.sin_mayusculas,
+             not args.sin_numeros, not args.sin_especiales)
+
+    history = None
+    if args.historial:
+        from issuance_history import IssuanceHistory
+        try:
+            history = IssuanceHistory(args.historial, key_file=args.clave_historial)
+        except (ValueError, OSError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+    deduplicator = None
+    if args.unicas:
+        import dedup
+        deduplicator = (dedup.BloomDeduplicator(args.cantidad) if args.unicas == "bloom"
+                        else dedup.FingerprintTable(args.cantidad))
+
+    if args.procesos > 0:
+        from parallel_generator import generate_parallel
+        records = generate_parallel(args.cantidad, args.longitud, *flags, workers=args.procesos)
+        # Las reposiciones se generan aquí, sin historial: las filtran las etapas
+        generator = PasswordGenerator()
+        refill = lambda k: generator.generate_batch(k, args.longitud, *flags)
+        if deduplicator is not None:
+            records = dedup.unique_records(records, deduplicator, refill)
+        if history is not None:
+            records = history.filter_records(records, refill)
+    else:
+        records = PasswordGenerator(history=history).generate_batch(
+            args.cantidad, args.longitud, *flags, unique=deduplicator)
+
+    first = next(records, None)
+    if first is None:
+        if args.cantidad > 0:
+            print("Error: no se pudo generar con los parámetros indicados", file=sys.stderr)
+            return 1
+        return 0
+
+    records = itertools.chain((first,), records)
+    # fsync solo tiene sentido para un archivo; stdout puede ser una tubería
+    target, fsync = (args.salida, args.fsync) if args.salida else (sys.stdout.buffer, "never")
+    try:
+        with open_sink(target, args.formato, args.compresion, args.nivel, fsync) as sink:
+            sink.write(records)
+    except BrokenPipeError:
+        # El lector cerró la tubería (p. ej. "| head"): se descarta el resto
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    if sink.count != args.cantidad:
+        print(f"Error: solo se generaron {sink.count} de {args.cantidad} contraseñas",
+              file=sys.stderr)
+        return 1
+    if deduplicator is not None:
+        stats = deduplicator.stats()
+        print(f"Unicidad: {stats['collisions']} regeneradas de {stats['seen']} "
+              f"({stats['collision_rate']:.2e}), {stats['memory_bytes']:,} bytes "
+              f"({stats['bytes_per_entry']:.1f} por contraseña)", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,20 +10,116 @@ Versión: 1.2.0
 import secrets
 import string
 import logging
-from enum import Enum
-from typing import Tuple, Optional
+import functools
+import re
+import itertools
+import hashlib
+import time
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Dict, Iterator, Tuple, Optional, Union
 
-class PasswordStrength(Enum):
-    """Enumeración para los niveles de fortaleza de contraseña"""
-    WEAK = "Débil"
-    MEDIUM = "Media"
-    STRONG = "Fuerte"
-    VERY_STRONG = "Muy Fuerte"
+from entropy_pool import EntropyPool, default_pool
+from password_policy import CompiledPolicy, PasswordPolicy, compile_policy
+from strength_evaluator import PasswordStrength, StrengthEvaluator, rate
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+if TYPE_CHECKING:
+    from breach_checker import BreachChecker
+    from dedup import Deduplicator
+    from issuance_history import IssuanceHistory
+    from metrics import GeneratorMetrics
+    from passphrase import Passphrase, Wordlist
+    from password_template import CompiledTemplate
+    from site_derivation import DerivationParams, MasterKey
+
+logger = logging.getLogger(__name__)
+
+# Candidatos seguidos sin ninguna contraseña aceptada tras los que un lote
+# se da por imposible (p. ej. mínimos por clase incompatibles con max_repeat)
+MAX_REJECTED_CANDIDATES = 1 << 20
+
+def setup_logging(level: int = logging.INFO, log_file: Optional[str] = None,
+                  queued: bool = True, sample_every: int = 1,
+                  max_per_second: Optional[float] = None) -> None:
+    """
+    Configura el sistema de logging con formato detallado.
+    Incluye timestamp, nivel, archivo y número de línea.
+    
+    El módulo no configura logging al importarse ni al crear un generador;
+    solo los puntos de entrada (GUI, línea de comandos) llaman a esta función.
+    Por defecto el formateo y la escritura ocurren en un hilo de fondo
+    (queued_logging), y el mensaje de éxito por contraseña puede muestrearse
+    o limitarse en frecuencia.
+    
+    Args:
+        level (int): Nivel mínimo de los mensajes
+        log_file (Optional[str]): Archivo adicional de log
+        queued (bool): Usar QueueHandler/QueueListener
+        sample_every (int): Registrar uno de cada N mensajes de éxito
+        max_per_second (Optional[float]): Máximo de mensajes de éxito por segundo
+    """
+    global _success_filter
+    import queued_logging
+    queued_logging.configure(level, log_file, queued)
+    _success_filter = queued_logging.volume_filter(sample_every, max_per_second)
+
+_success_filter = None
+
+def _log_success() -> None:
+    """
+    Registra el mensaje de éxito de generate_password.
+    
+    El muestreo o límite de frecuencia se consulta antes de llamar al logger,
+    así que los mensajes descartados no llegan a crear un registro.
+    """
+    if _success_filter is None:
+        logger.info("Contraseña generada exitosamente", stacklevel=2)
+        return
+    omitted = _success_filter.allow(_log_success)
+    if omitted > 0:
+        logger.info("Contraseña generada exitosamente (%d similares omitidos)", omitted,
+                    stacklevel=2)
+    elif omitted == 0:
+        logger.info("Contraseña generada exitosamente", stacklevel=2)
+
+@functools.lru_cache(maxsize=256)
+def _completion_counts(sizes: Tuple[int, ...], minimums: Tuple[int, ...],
+                       length: int) -> Tuple[Tuple[Tuple[int, ...], ...], Tuple[Tuple[int, ...], ...]]:
+    """
+    Calcula la tabla de conteos usada por la generación constructiva.
+    
+    Un estado codifica, en base mixta, cuántos caracteres faltan de cada clase
+    para alcanzar su mínimo; el estado 0 indica que ya se cumplen todos y el
+    estado más alto corresponde a una contraseña vacía. counts[r][estado] es el
+    número de cadenas de longitud r sobre el alfabeto completo que cubren lo que
+    falta en ese estado, y steps[i][estado] es el estado tras añadir un carácter
+    de la clase i.
+    
+    Args:
+        sizes (Tuple[int, ...]): Tamaño de cada clase de caracteres seleccionada
+        minimums (Tuple[int, ...]): Mínimo de caracteres de cada clase
+        length (int): Longitud máxima de la tabla
+        
+    Returns:
+        Tuple: Tabla counts indexada por [r][estado] y tabla steps por [clase][estado]
+    """
+    strides = []
+    radix = 1
+    for minimum in minimums:
+        strides.append(radix)
+        radix *= minimum + 1
+    states = range(radix)
+    steps = tuple(
+        tuple(state - stride if state // stride % (minimum + 1) else state for state in states)
+        for stride, minimum in zip(strides, minimums)
+    )
+    
+    table = [tuple(1 if state == 0 else 0 for state in states)]
+    for _ in range(length):
+        prev = table[-1]
+        table.append(tuple(
+            sum(size * prev[step[state]] for size, step in zip(sizes, steps))
+            for state in states
+        ))
+    return tuple(table), steps
 
 class PasswordGenerator:
     """
@@ -40,30 +136,43 @@ class PasswordGenerator:
         uppercase (str): Caracteres en mayúscula disponibles
         digits (str): Dígitos disponibles
         special (str): Caracteres especiales disponibles
+        strength_evaluator (StrengthEvaluator): Evaluador de fortaleza
+        entropy_pool (Optional[EntropyPool]): Reserva de entropía usada en lugar
+            del módulo secrets; None usa secrets en generate_password y la
+            reserva compartida del proceso en generate_batch
+        breach_checker (Optional[BreachChecker]): Corpus de contraseñas filtradas;
+            las contraseñas presentes en él se descartan y se vuelven a generar
+        history (Optional[IssuanceHistory]): Historial persistente de emisión;
+            las contraseñas ya emitidas se descartan y las entregadas se registran
+        metrics (Optional[GeneratorMetrics]): Métricas de generate_password y de
+            la evaluación de fortaleza; None (por defecto) las desactiva
+        master_key (Optional[MasterKey]): Clave maestra de la sesión de
+            derivación por sitio; None mientras no se llame a unlock
     """
     
-    def __init__(self):
+    def __init__(self, entropy_pool: Optional[EntropyPool] = None,
+                 breach_checker: Optional["BreachChecker"] = None,
+                 history: Optional["IssuanceHistory"] = None):
         """
-        Inicializa el generador con los conjuntos de caracteres predefinidos
-        y configura el sistema de logging.
+        Inicializa el generador con los conjuntos de caracteres predefinidos.
+        
+        Args:
+            entropy_pool (Optional[EntropyPool]): Reserva de entropía opcional
+            breach_checker (Optional[BreachChecker]): Verificador de filtraciones opcional
+            history (Optional[IssuanceHistory]): Historial de emisión opcional
         """
+        self.entropy_pool = entropy_pool
+        self.breach_checker = breach_checker
+        self.history = history
         self.lowercase = string.ascii_lowercase  # a-z
         self.uppercase = string.ascii_uppercase  # A-Z
         self.digits = string.digits             # 0-9
         self.special = string.punctuation       # !@#$%^&*()_+-=[]{}|;:,.<>?
-        
-        self._setup_logging()
-    
-    def _setup_logging(self) -> None:
-        """
-        Configura el sistema de logging con formato detallado.
-        Incluye timestamp, nivel, archivo y número de línea.
-        """
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
+        self.strength_evaluator = StrengthEvaluator(
+            self.lowercase, self.uppercase, self.digits, self.special)
+        self._flag_policies: Dict[Tuple[bool, bool, bool, bool], CompiledPolicy] = {}
+        self.metrics: Optional["GeneratorMetrics"] = None
+        self.master_key: Optional["MasterKey"] = None
     
     def validate_params(self, length: int, iterations: int) -> bool:
         """
@@ -83,17 +192,28 @@ class PasswordGenerator:
             
     def generate_password(self, length: int, iterations: int, use_lower: bool = True,
                          use_upper: bool = True, use_digits: bool = True,
-                         use_special: bool = True) -> tuple[str, PasswordStrength]:
+                         use_special: bool = True,
+                         should_stop: Optional[Callable[[], bool]] = None,
+                         progress: Optional[Callable[[int], None]] = None,
+                         policy: Optional[PasswordPolicy] = None) -> tuple[str, PasswordStrength]:
         """
         Genera una contraseña segura con los parámetros especificados.
         
         Args:
             length (int): Longitud deseada de la contraseña
-            iterations (int): Número máximo de intentos de generación
+            iterations (int): Número máximo de intentos; la generación constructiva
+                solo repite un intento si la contraseña supera las repeticiones
+                permitidas por la política o está en breach_checker
             use_lower (bool): Incluir minúsculas
             use_upper (bool): Incluir mayúsculas
             use_digits (bool): Incluir números
             use_special (bool): Incluir caracteres especiales
+            should_stop (Optional[Callable[[], bool]]): Se consulta antes de cada
+                intento; si devuelve True la generación se cancela
+            progress (Optional[Callable[[int], None]]): Recibe el número de
+                intento en curso
+            policy (Optional[PasswordPolicy]): Política completa; si se indica,
+                sustituye a los indicadores use_*
             
         Returns:
             tuple[str, PasswordStrength]: Contraseña generada y su nivel de fortaleza
@@ -101,45 +221,717 @@ class PasswordGenerator:
         Raises:
             ValueError: Si los parámetros no son válidos
         """
+        metrics = self.metrics
+        if metrics is not None:
+            if metrics.profile_pending:
+                return metrics.profile(self.generate_password, length, iterations, use_lower,
+                                       use_upper, use_digits, use_special, should_stop,
+                                       progress, policy)
+            start = time.perf_counter()
+            
+        password, strength, attempts, failure = "", PasswordStrength.WEAK, 0, None
         if not self.validate_params(length, iterations):
-            logging.error(f"Parámetros inválidos: longitud={length}, iteraciones={iterations}")
-            return "", PasswordStrength.WEAK
+            logger.error("Parámetros inválidos: longitud=%s, iteraciones=%s", length, iterations)
+            failure = "parametros"
+        else:
+            compiled = self._compile_policy(policy, use_lower, use_upper, use_digits,
+                                            use_special, length)
+            if compiled is None:
+                failure = "politica"
+            else:
+                password, strength, attempts, failure = self._run_attempts(
+                    compiled, length, iterations, should_stop, progress, metrics)
+                
+        if metrics is not None:
+            metrics.finish(time.perf_counter() - start, attempts, failure)
+        return password, strength
+    
+    def _run_attempts(self, compiled: CompiledPolicy, length: int, iterations: int,
+                      should_stop: Optional[Callable[[], bool]],
+                      progress: Optional[Callable[[int], None]],
+                      metrics: Optional["GeneratorMetrics"]) -> Tuple[str, PasswordStrength, int, Optional[str]]:
+        """
+        Bucle de intentos de generate_password.
+        
+        Returns:
+            Tuple: Contraseña, fortaleza, intentos consumidos y motivo del fallo
+            (None si se generó una contraseña)
+        """
+        randbelow = self.entropy_pool.randbelow if self.entropy_pool else secrets.randbelow
+        attempts = 0
+        for attempt in range(1, iterations + 1):
+            if should_stop is not None and should_stop():
+                logger.info("Generación cancelada")
+                return "", PasswordStrength.WEAK, attempts, "cancelada"
+            if progress is not None:
+                progress(attempt)
+            attempts = attempt
+            password = self._construct_password(compiled, length, randbelow)
+            if not compiled.accepts(password):
+                if metrics is not None:
+                    metrics.inc("rejections", reason="repeticion")
+                continue
+            if self.breach_checker is not None and self.breach_checker.is_breached(password):
+                logger.warning("Contraseña descartada: aparece en el corpus de filtraciones")
+                if metrics is not None:
+                    metrics.inc("rejections", reason="filtracion")
+                continue
+            if metrics is None:
+                strength = compiled.evaluator.evaluate(password)
+            else:
+                evaluated = time.perf_counter()
+                strength = compiled.evaluator.evaluate(password)
+                metrics.observe("evaluation", time.perf_counter() - evaluated)
+            if strength != PasswordStrength.WEAK:
+                if self.history is not None and not self.history.reserve((password,))[0]:
+                    logger.warning("Contraseña descartada: ya se emitió anteriormente")
+                    if metrics is not None:
+                        metrics.inc("rejections", reason="emitida")
+                    continue
+                _log_success()
+                return password, strength, attempts, None
+            if metrics is not None:
+                metrics.inc("rejections", reason="debil")
+            if len(compiled.classes) < 2:
+                break  # con una sola clase nunca supera el nivel débil
+        
+        logger.warning("No se logró generar una contraseña válida")
+        return "", PasswordStrength.WEAK, attempts, "agotada"
+    
+    def generate_batch(self, n: int, length: int, use_lower: bool = True,
+                       use_upper: bool = True, use_digits: bool = True,
+                       use_special: bool = True,
+                       policy: Optional[PasswordPolicy] = None,
+                       unique: Optional["Deduplicator"] = None) -> Iterator[Tuple[str, PasswordStrength]]:
+        """
+        Genera un lote de contraseñas con los mismos parámetros.
+        
+        Valida los parámetros y compila la política una sola vez por lote, lee la
+        entropía de la reserva en bloques grandes y registra un único mensaje de
+        log por lote.
+        
+        benchmarks/bench_generation.py compara su rendimiento con el del
+        método original y el de generate_password llamados en un bucle. La
+        mejora es menor con longitudes cortas: con longitud 8 se descarta más
+        de la mitad de los candidatos por no contener las cuatro clases.
+        
+        Args:
+            n (int): Número de contraseñas a generar
+            length (int): Longitud de cada contraseña (8-129)
+            use_lower (bool): Incluir minúsculas
+            use_upper (bool): Incluir mayúsculas
+            use_digits (bool): Incluir números
+            use_special (bool): Incluir caracteres especiales
+            policy (Optional[PasswordPolicy]): Política completa; si se indica,
+                sustituye a los indicadores use_*
+            unique (Optional[Deduplicator]): Filtro de unicidad (dedup); las
+                contraseñas repetidas se descartan y se regeneran. Puede
+                compartirse entre varios lotes de la misma ejecución
+            
+        Returns:
+            Iterator[Tuple[str, PasswordStrength]]: Contraseñas y su fortaleza;
+            vacío si los parámetros no son válidos
+        """
+        if n < 0 or not 8 <= length <= 129:
+            logger.error("Parámetros inválidos: cantidad=%s, longitud=%s", n, length)
+            return iter(())
             
-        chars = ""
-        if use_lower:
-            chars += self.lowercase
-        if use_upper:
-            chars += self.uppercase
-        if use_digits:
-            chars += self.digits
-        if use_special:
-            chars += self.special
-            
-        if not chars:
-            logging.error("No se seleccionaron tipos de caracteres")
+        compiled = self._compile_policy(policy, use_lower, use_upper, use_digits, use_special, length)
+        if compiled is None:
+            return iter(())
+            
+        # Con mínimos de al menos un carácter por clase, las contraseñas
+        # construidas contienen exactamente las clases seleccionadas y su
+        # fortaleza solo depende de la longitud; con mínimos 0 se evalúa cada una.
+        pool = self.entropy_pool or default_pool()
+        first = self._construct_password(compiled, length, pool.randbelow)
+        strength = compiled.evaluator.evaluate(first)
+        if strength == PasswordStrength.WEAK and len(compiled.classes) < 2:
+            logger.warning("No se logró generar una contraseña válida")
+            return iter(())
+            
+        logger.info("Generando lote de %d contraseñas", n)
+        batch = self._iter_batch(n, compiled, length, strength, first, pool)
+        if unique is None and self.history is None:
+            return batch
+        
+        def refill(k: int) -> Iterator[Tuple[str, PasswordStrength]]:
+            first = self._construct_password(compiled, length, pool.randbelow)
+            return self._iter_batch(k, compiled, length, strength, first, pool)
+        
+        if unique is not None:
+            from dedup import unique_records
+            batch = unique_records(batch, unique, refill)
+        if self.history is not None:
+            # Se reserva por tandas: una transacción por cada BATCH_SIZE contraseñas
+            batch = self.history.filter_records(batch, refill)
+        return batch
+    
+    def _iter_batch(self, n: int, compiled: CompiledPolicy, length: int,
+                    strength: PasswordStrength, first: str,
+                    pool: EntropyPool) -> Iterator[Tuple[str, PasswordStrength]]:
+        """
+        Produce las contraseñas de un lote ya validado.
+        
+        Los bytes aleatorios se convierten en caracteres con bytes.translate:
+        los valores >= 256 - 256 % N se descartan, así que cada carácter es
+        uniforme sobre el alfabeto. Los candidatos que no cumplen la política se
+        descartan, lo que mantiene la distribución uniforme sobre las
+        contraseñas válidas; la conversión y la comprobación de clases con
+        mínimo uno ocurren en C. También se descartan las que aparecen en
+        breach_checker. Si MAX_REJECTED_CANDIDATES candidatos seguidos no
+        cumplen la política, se registra un error y el lote termina.
+        """
+        if n <= 0:
+            return
+        breached = self.breach_checker.is_breached if self.breach_checker is not None else None
+        accepts = compiled.accepts if compiled.max_repeat else None
+        evaluate = None if all(compiled.minimums) else compiled.evaluator.evaluate
+        produced = 0
+        if (accepts is None or accepts(first)) and (breached is None or not breached(first)) \
+                and strength != PasswordStrength.WEAK:
+            yield first, strength
+            produced = 1
+        
+        alphabet = compiled.alphabet.encode("ascii")
+        size = len(alphabet)
+        limit = 256 - 256 % size
+        table = bytes(alphabet[i % size] for i in range(limit)) + bytes(256 - limit)
+        rejected = bytes(range(limit, 256))
+        # Las clases con mínimo uno se comprueban con una expresión regular; las
+        # de mínimo mayor, contando marcas de clase.
+        required = tuple("".join(map(re.escape, sorted(chars)))
+                         for chars, minimum in zip(compiled.class_sets, compiled.minimums)
+                         if minimum == 1)
+        counted = tuple((index, minimum) for index, minimum in enumerate(compiled.minimums, 1)
+                        if minimum > 1)
+        marks = compiled.class_marks
+        # Cada coincidencia consume exactamente una ventana de length caracteres:
+        # el grupo captura la ventana si contiene todas las clases y queda vacío
+        # si no, así que la aceptación de cada ventana no depende de las vecinas.
+        windows = re.compile("(?:%s(.{%d})|.{%d})" % (
+            "".join("(?=[^%s]{0,%d}[%s])" % (chars, length - 1, chars) for chars in required),
+            length, length), re.DOTALL)
+        
+        # Sin comprobaciones por contraseña, el bloque se filtra entero en C,
+        # sin bucle en Python por candidato
+        simple = not counted and accepts is None and breached is None and evaluate is None
+        pending = ""
+        rejected_run = 0
+        while produced < n:
+            if rejected_run >= MAX_REJECTED_CANDIDATES:
+                logger.error("Lote interrumpido: %d candidatos seguidos no cumplen la política; "
+                             "se generaron %d de %d", rejected_run, produced, n)
+                return
+            stream = pending + pool.read(pool.buffer_size).translate(table, rejected).decode("ascii")
+            end = len(stream) - len(stream) % length
+            pending = stream[end:]
+            candidates = filter(None, windows.findall(stream, 0, end))
+            before = produced
+            rejected_run += end // length
+            if simple:
+                accepted = list(itertools.islice(candidates, n - produced))
+                produced += len(accepted)
+                if accepted:
+                    rejected_run = 0
+                yield from zip(accepted, itertools.repeat(strength))
+                continue
+            for password in candidates:
+                if counted:
+                    classified = password.encode("ascii").translate(marks)
+                    if any(classified.count(index) < minimum for index, minimum in counted):
+                        continue
+                if accepts is not None and not accepts(password):
+                    continue
+                if breached is not None and breached(password):
+                    continue
+                if evaluate is not None:
+                    strength = evaluate(password)
+                    if strength == PasswordStrength.WEAK:
+                        continue
+                yield password, strength
+                produced += 1
+                if produced == n:
+                    return
+            if produced > before:
+                rejected_run = 0
+    
+    def generate_into(self, buffer: Union[bytearray, memoryview], length: int,
+                      use_lower: bool = True, use_upper: bool = True,
+                      use_digits: bool = True, use_special: bool = True,
+                      policy: Optional[PasswordPolicy] = None,
+                      offset: int = 0) -> PasswordStrength:
+        """
+        Escribe una contraseña ASCII directamente en un búfer mutable.
+        
+        No se crea ningún str con la contraseña: los bytes aleatorios, la
+        conversión al alfabeto, la comprobación de la política y la evaluación
+        de fortaleza trabajan sobre bytearray y memoryview, y los búferes
+        intermedios se borran al terminar. El llamador debe borrar el suyo
+        (secure_buffer.wipe o SecretBuffer.wipe) cuando ya no lo necesite.
+        
+        Args:
+            buffer (Union[bytearray, memoryview]): Destino escribible
+            length (int): Longitud de la contraseña (8-129)
+            use_lower (bool): Incluir minúsculas
+            use_upper (bool): Incluir mayúsculas
+            use_digits (bool): Incluir números
+            use_special (bool): Incluir caracteres especiales
+            policy (Optional[PasswordPolicy]): Política completa; si se indica,
+                sustituye a los indicadores use_*
+            offset (int): Posición del búfer donde empieza la contraseña
+            
+        Returns:
+            PasswordStrength: Fortaleza de la contraseña escrita
+            
+        Raises:
+            ValueError: Si los parámetros no son válidos o el búfer es pequeño
+        """
+        view = memoryview(buffer).cast("B")
+        if offset < 0 or len(view) - offset < length:
+            raise ValueError(f"El búfer no tiene {length} bytes libres desde {offset}")
+        compiled = self._compile_for_buffers(policy, use_lower, use_upper, use_digits,
+                                             use_special, length)
+        windows = self._iter_windows(1, compiled, length)
+        try:
+            for window, strength in windows:
+                view[offset:offset + length] = window
+                return strength
+        finally:
+            windows.close()
+        raise ValueError("No se logró generar una contraseña válida")
+    
+    def write_batch(self, output: Union[BinaryIO, Callable[[Any], Any]], n: int, length: int,
+                    use_lower: bool = True, use_upper: bool = True,
+                    use_digits: bool = True, use_special: bool = True,
+                    policy: Optional[PasswordPolicy] = None,
+                    separator: bytes = b"\n", chunk_bytes: int = 64 * 1024) -> int:
+        """
+        Genera n contraseñas y las escribe en un archivo o socket sin crear str.
+        
+        Las contraseñas se copian, seguidas de separator, en un bytearray de la
+        reserva de secure_buffer, que se entrega a output como memoryview cada
+        vez que se llena y se borra al terminar. Para que no queden copias en
+        búferes ajenos, abre los archivos sin búfer (open(..., "wb",
+        buffering=0)) o pasa socket.sendall. Las escrituras parciales de
+        write() se completan con secure_buffer.write_all.
+        
+        Args:
+            output (Union[BinaryIO, Callable]): Objeto con write() o función
+                que escribe cada bloque completo (p. ej. socket.sendall)
+            n (int): Número de contraseñas
+            length (int): Longitud de cada contraseña (8-129)
+            use_lower (bool): Incluir minúsculas
+            use_upper (bool): Incluir mayúsculas
+            use_digits (bool): Incluir números
+            use_special (bool): Incluir caracteres especiales
+            policy (Optional[PasswordPolicy]): Política completa; si se indica,
+                sustituye a los indicadores use_*
+            separator (bytes): Bytes escritos tras cada contraseña
+            chunk_bytes (int): Tamaño aproximado de cada escritura
+            
+        Returns:
+            int: Número de contraseñas escritas
+            
+        Raises:
+            ValueError: Si los parámetros no son válidos
+            BlockingIOError: Si output es un archivo no bloqueante que no
+                acepta la escritura
+        """
+        from secure_buffer import default_buffer_pool, write_all
+        
+        if n < 0:
+            raise ValueError(f"Cantidad inválida: {n}")
+        compiled = self._compile_for_buffers(policy, use_lower, use_upper, use_digits,
+                                             use_special, length)
+        write = output if callable(output) else functools.partial(write_all, output)
+        record = length + len(separator)
+        buffers = default_buffer_pool()
+        block = buffers.acquire(max(1, chunk_bytes // record) * record)
+        view = memoryview(block)
+        pos = written = 0
+        windows = self._iter_windows(n, compiled, length)
+        try:
+            for window, _ in windows:
+                view[pos:pos + length] = window
+                view[pos + length:pos + record] = separator
+                pos += record
+                written += 1
+                if pos == len(block):
+                    write(view)
+                    pos = 0
+            if pos:
+                write(view[:pos])
+        finally:
+            windows.close()
+            view.release()
+            buffers.release(block)
+        logger.info("Lote de %d contraseñas escrito sin copias en str", written)
+        return written
+    
+    def _compile_for_buffers(self, policy: Optional[PasswordPolicy], use_lower: bool,
+                             use_upper: bool, use_digits: bool, use_special: bool,
+                             length: int) -> CompiledPolicy:
+        """
+        Compila la política de generate_into y write_batch.
+        
+        Raises:
+            ValueError: Si los parámetros no admiten contraseñas más que débiles
+        """
+        if not 8 <= length <= 129:
+            raise ValueError(f"Longitud inválida: {length}")
+        compiled = self._compile_policy(policy, use_lower, use_upper, use_digits,
+                                        use_special, length)
+        if compiled is None:
+            raise ValueError("La política no admite contraseñas de esta longitud")
+        if rate(length, len(compiled.classes)) == PasswordStrength.WEAK:
+            raise ValueError("Con estas clases y longitud todas las contraseñas son débiles")
+        return compiled
+    
+    def _iter_windows(self, n: int, compiled: CompiledPolicy, length: int,
+                      chunk_bytes: int = 4096) -> Iterator[Tuple[memoryview, PasswordStrength]]:
+        """
+        Produce n contraseñas como vistas sobre un bytearray interno.
+        
+        Mismo muestreo por rechazo que _iter_batch, pero sobre bytes: los bytes
+        aleatorios se leen con EntropyPool.readinto, se traducen al alfabeto con
+        bytearray.translate y las clases se comprueban con find/count sobre las
+        marcas de clase. Cada vista solo es válida hasta la siguiente iteración:
+        el llamador debe copiarla antes. Los bytearray internos se borran al
+        agotar cada bloque y al cerrar el generador.
+        """
+        pool = self.entropy_pool or default_pool()
+        breach_checker = self.breach_checker
+        accepts = compiled.accepts_bytes if compiled.max_repeat else None
+        evaluate = compiled.evaluator.evaluate_bytes
+        constant = all(compiled.minimums)
+        # Clases con mínimo uno: basta con find; las de mínimo mayor se cuentan
+        required = tuple(index for index, minimum in enumerate(compiled.minimums, 1)
+                         if minimum == 1)
+        counted = tuple((index, minimum) for index, minimum in enumerate(compiled.minimums, 1)
+                        if minimum > 1)
+        marks = compiled.class_marks
+        alphabet = compiled.alphabet.encode("ascii")
+        size = len(alphabet)
+        limit = 256 - 256 % size
+        table = bytes(alphabet[i % size] for i in range(limit)) + bytes(256 - limit)
+        rejected = bytes(range(limit, 256))
+        
+        raw = bytearray(chunk_bytes)
+        translated = bytearray()
+        strength = None
+        produced = 0
+        try:
+            while produced < n:
+                pool.readinto(raw)
+                translated = raw.translate(table, rejected)
+                marked = translated.translate(marks)
+                find = marked.find
+                view = memoryview(translated)
+                for start in range(0, len(translated) - length + 1, length):
+                    end = start + length
+                    for index in required:
+                        if find(index, start, end) < 0:
+                            break
+                    else:
+                        if counted and any(marked.count(index, start, end) < minimum
+                                           for index, minimum in counted):
+                            continue
+                        if accepts is not None and not accepts(translated, start, end):
+                            continue
+                        window = view[start:end]
+                        if breach_checker is not None and \
+                                breach_checker.contains_hash(hashlib.sha1(window).digest()):
+                            continue
+                        if strength is None or not constant:
+                            strength = evaluate(window)
+                            if strength == PasswordStrength.WEAK:
+                                continue
+                        yield window, strength
+                        produced += 1
+                        if produced == n:
+                            return
+                # Los bytes sobrantes del bloque se descartan: son aleatorios e
+                # independientes, así que no sesgan el resto
+                translated[:] = bytes(len(translated))
+        finally:
+            raw[:] = bytes(len(raw))
+            translated[:] = bytes(len(translated))
+    
+    def generate_passphrase(self, wordlist: Union["Wordlist", str], words: int = 6,
+                            separator: Optional[str] = None, use_lower: bool = True,
+                            use_upper: bool = True, use_digits: bool = True,
+                            use_special: bool = True) -> "Passphrase":
+        """
+        Genera una frase de contraseña al estilo Diceware.
+        
+        Usa la misma fuente de aleatoriedad que generate_password. Los
+        indicadores de clase deciden la capitalización, el dígito y el
+        separador (ver passphrase.generate_passphrase).
+        
+        Args:
+            wordlist (Union[Wordlist, str]): Lista de palabras o ruta de su índice
+            words (int): Número de palabras
+            separator (Optional[str]): Separador fijo; None lo decide use_special
+            use_lower (bool): Palabras en minúscula
+            use_upper (bool): Capitalizar una palabra
+            use_digits (bool): Añadir un dígito
+            use_special (bool): Separador aleatorio
+            
+        Returns:
+            Passphrase: Frase, entropía en bits y nivel de fortaleza
+            
+        Raises:
+            ValueError: Si el número de palabras o la lista no son válidos
+        """
+        import passphrase
+        
+        if isinstance(wordlist, str):
+            wordlist = passphrase.Wordlist.open(wordlist)
+        randbelow = self.entropy_pool.randbelow if self.entropy_pool else secrets.randbelow
+        result = passphrase.generate_passphrase(wordlist, words, separator, use_lower,
+                                                use_upper, use_digits, use_special, randbelow)
+        logger.info("Frase de contraseña generada: %d palabras, %.1f bits",
+                    words, result.entropy_bits)
+        return result
+    
+    def compile_template(self, template: str) -> "CompiledTemplate":
+        """
+        Compila una plantilla con los alfabetos del generador.
+        
+        El resultado queda en la caché de password_template.compile_template,
+        así que compilar de nuevo la misma plantilla no repite el trabajo.
+        
+        Args:
+            template (str): Plantilla, p. ej. "Cvcc-9999-Ss"
+            
+        Returns:
+            CompiledTemplate: Plantilla compilada, con su entropía exacta en
+            entropy_bits y el nivel correspondiente en strength
+            
+        Raises:
+            ValueError: Si la plantilla no es válida
+        """
+        from password_template import compile_template
+        return compile_template(template, self.lowercase, self.uppercase,
+                                self.digits, self.special)
+    
+    def generate_from_template(self, template: str) -> tuple[str, PasswordStrength]:
+        """
+        Genera una contraseña con el formato fijo de una plantilla.
+        
+        La fortaleza se deriva de la entropía exacta de la plantilla, no de
+        la contraseña concreta.
+        
+        Args:
+            template (str): Plantilla, p. ej. "Cvcc-9999-Ss"
+            
+        Returns:
+            tuple[str, PasswordStrength]: Contraseña generada y su nivel de
+            fortaleza; ("", WEAK) si la plantilla no es válida o no produce
+            entre 8 y 129 caracteres
+        """
+        try:
+            compiled = self.compile_template(template)
+        except ValueError as e:
+            logger.error("Plantilla inválida: %s", e)
+            return "", PasswordStrength.WEAK
+        if not 8 <= compiled.length <= 129:
+            # Mismo límite que generate_password
+            logger.error("Parámetros inválidos: longitud=%s", compiled.length)
             return "", PasswordStrength.WEAK
+        randbelow = self.entropy_pool.randbelow if self.entropy_pool else secrets.randbelow
+        return compiled.generate(randbelow), compiled.strength
+    
+    def construct_password(self, length: int, randbelow: Callable[[int], int],
+                           use_lower: bool = True, use_upper: bool = True,
+                           use_digits: bool = True, use_special: bool = True,
+                           policy: Optional[PasswordPolicy] = None) -> tuple[str, PasswordStrength]:
+        """
+        Construye una contraseña a partir de una fuente de enteros dada.
+        
+        Consume una sola llamada a randbelow y no descarta candidatos, así que
+        con una fuente determinista (p. ej. la de site_derivation) la misma
+        fuente produce siempre la misma contraseña.
+        
+        Args:
+            length (int): Longitud de la contraseña (8-129)
+            randbelow (Callable[[int], int]): Fuente de enteros uniformes en [0, n)
+            use_lower (bool): Incluir minúsculas
+            use_upper (bool): Incluir mayúsculas
+            use_digits (bool): Incluir números
+            use_special (bool): Incluir caracteres especiales
+            policy (Optional[PasswordPolicy]): Política completa; si se indica,
+                sustituye a los indicadores use_*
             
-        for _ in range(iterations):
-            password = ''.join(secrets.choice(chars) for _ in range(length))
-            
-            valid = True
-            if use_lower and not any(c in self.lowercase for c in password):
-                valid = False
-            if use_upper and not any(c in self.uppercase for c in password):
-                valid = False
-            if use_digits and not any(c in self.digits for c in password):
-                valid = False
-            if use_special and not any(c in self.special for c in password):
-                valid = False
-                
-            if valid:
-                strength = self._evaluate_password_strength(password)
-                if strength != PasswordStrength.WEAK:
-                    logging.info("Contraseña generada exitosamente")
-                    return password, strength
+        Returns:
+            tuple[str, PasswordStrength]: Contraseña construida y su fortaleza
+            
+        Raises:
+            ValueError: Si la longitud o la política no son válidas
+        """
+        if not 8 <= length <= 129:
+            raise ValueError(f"Longitud inválida: {length}")
+        compiled = self._compile_policy(policy, use_lower, use_upper, use_digits,
+                                        use_special, length)
+        if compiled is None:
+            raise ValueError("No se seleccionaron tipos de caracteres válidos")
+        password = self._construct_password(compiled, length, randbelow)
+        return password, compiled.evaluator.evaluate(password)
+    
+    def unlock(self, secret: str, params: Optional["DerivationParams"] = None,
+               user: str = "") -> None:
+        """
+        Estira el secreto maestro y guarda la clave para la sesión.
+        
+        Sustituye (y borra) la clave anterior, si la había.
+        
+        Args:
+            secret (str): Secreto maestro
+            params (Optional[DerivationParams]): Factor de trabajo; por defecto
+                los valores de DerivationParams
+            user (str): Identificador del usuario
+            
+        Raises:
+            ValueError: Si el secreto o los parámetros no son válidos
+        """
+        from site_derivation import DerivationParams, MasterKey
+        key = MasterKey.stretch(secret, params or DerivationParams(), user)
+        self.lock()
+        self.master_key = key
+    
+    def lock(self) -> None:
+        """Borra la clave maestra de la sesión"""
+        if self.master_key is not None:
+            self.master_key.wipe()
+            self.master_key = None
+    
+    def derive_site_password(self, site: str, length: int = 16, use_lower: bool = True,
+                             use_upper: bool = True, use_digits: bool = True,
+                             use_special: bool = True,
+                             counter: int = 1) -> tuple[str, PasswordStrength]:
+        """
+        Deriva de forma reproducible la contraseña de un sitio.
         
-        logging.warning("No se logró generar una contraseña válida")
-        return "", PasswordStrength.WEAK
+        Requiere una sesión abierta con unlock; la misma combinación de secreto,
+        usuario, sitio, parámetros y contador produce siempre la misma contraseña.
+        
+        Args:
+            site (str): Nombre del sitio
+            length (int): Longitud de la contraseña (8-129)
+            use_lower (bool): Incluir minúsculas
+            use_upper (bool): Incluir mayúsculas
+            use_digits (bool): Incluir números
+            use_special (bool): Incluir caracteres especiales
+            counter (int): Versión de la contraseña; se incrementa para rotarla
+            
+        Returns:
+            tuple[str, PasswordStrength]: Contraseña derivada y su fortaleza
+            
+        Raises:
+            ValueError: Si no hay sesión abierta o los parámetros no son válidos
+        """
+        from site_derivation import derive_password
+        if self.master_key is None:
+            raise ValueError("No hay una clave maestra: llama primero a unlock")
+        return derive_password(self.master_key, site, length,
+                               (use_lower, use_upper, use_digits, use_special), counter, self)
+    
+    def _compile_policy(self, policy: Optional[PasswordPolicy], use_lower: bool,
+                        use_upper: bool, use_digits: bool, use_special: bool,
+                        length: int) -> Optional[CompiledPolicy]:
+        """
+        Obtiene la política compilada para una petición.
+        
+        Sin política explícita se usa la equivalente a los indicadores use_*
+        con los alfabetos del generador, memorizada por combinación de
+        indicadores. Las políticas compiladas se guardan en la caché de
+        compile_policy, así que las llamadas repetidas no vuelven a construir
+        alfabetos ni tablas.
+        
+        Returns:
+            Optional[CompiledPolicy]: Política compilada, o None si no admite
+            contraseñas de esta longitud (el motivo queda en el log)
+        """
+        if policy is None:
+            flags = (use_lower, use_upper, use_digits, use_special)
+            compiled = self._flag_policies.get(flags)
+            if compiled is None:
+                compiled = self._compile(PasswordPolicy(
+                    *flags, lowercase=self.lowercase, uppercase=self.uppercase,
+                    digits=self.digits, special=self.special))
+                if compiled is None:
+                    return None
+                self._flag_policies[flags] = compiled
+        else:
+            compiled = self._compile(policy)
+            if compiled is None:
+                return None
+        if compiled.min_length > length:
+            logger.error("Los mínimos por clase suman %d, más que la longitud %d",
+                         compiled.min_length, length)
+            return None
+        return compiled
+    
+    def _compile(self, policy: PasswordPolicy) -> Optional[CompiledPolicy]:
+        """Compila una política con la caché compartida; None si no es válida"""
+        try:
+            return compile_policy(policy)
+        except ValueError as e:
+            logger.error("%s", e)
+            return None
+    
+    def _construct_password(self, compiled: CompiledPolicy, length: int,
+                            randbelow: Callable[[int], int]) -> str:
+        """
+        Construye una contraseña que cumple los mínimos por clase de la política.
+        
+        Se extrae un único entero aleatorio en [0, N), donde N es el número total
+        de contraseñas que cumplen los mínimos, y se decodifica posición por
+        posición con la tabla de _completion_counts. Cada contraseña válida
+        corresponde a exactamente un entero, por lo que la salida es uniforme
+        sobre todas ellas, igual que un bucle de rechazo, pero sin descartar
+        candidatos. Requiere clases disjuntas, cosa que garantiza CompiledPolicy.
+        
+        Args:
+            compiled (CompiledPolicy): Política compilada
+            length (int): Longitud de la contraseña
+            randbelow (Callable[[int], int]): Fuente de enteros uniformes en [0, n)
+            
+        Returns:
+            str: Contraseña generada
+        """
+        classes = compiled.classes
+        sizes = tuple(len(chars) for chars in classes)
+        counts, steps = _completion_counts(sizes, compiled.minimums, length)
+        alphabet = compiled.alphabet
+        alphabet_size = len(alphabet)
+        
+        state = len(counts[0]) - 1
+        value = randbelow(counts[length][state])
+        result = []
+        
+        for remaining in range(length, 0, -1):
+            if not state:
+                # Todos los mínimos están cubiertos: el resto es uniforme en base N
+                for _ in range(remaining):
+                    value, index = divmod(value, alphabet_size)
+                    result.append(alphabet[index])
+                break
+                
+            row = counts[remaining - 1]
+            for i, chars in enumerate(classes):
+                rest = steps[i][state]
+                completions = row[rest]
+                weight = sizes[i] * completions
+                if value < weight:
+                    index, value = divmod(value, completions)
+                    result.append(chars[index])
+                    state = rest
+                    break
+                value -= weight
+                
+        return "".join(result)
         
     def _evaluate_password_strength(self, password: str) -> PasswordStrength:
         """
@@ -150,41 +942,19 @@ class PasswordGenerator:
         - Variedad de caracteres
         - Complejidad de la combinación
         
+        Delegado en StrengthEvaluator, que clasifica los caracteres en una sola
+        pasada con una tabla precalculada.
+        
         Args:
             password (str): Contraseña a evaluar
             
         Returns:
             PasswordStrength: Nivel de fortaleza de la contraseña
         """
-        score = 0
-        length = len(password)
-        
-        has_lower = any(c in self.lowercase for c in password)
-        has_upper = any(c in self.uppercase for c in password)
-        has_digit = any(c in self.digits for c in password)
-        has_special = any(c in self.special for c in password)
-        
-        char_types = sum([has_lower, has_upper, has_digit, has_special])
-        score += char_types
-        
-        if length >= 16:
-            score += 2
-        elif length >= 12:
-            score += 1
-            
-        if length <= 8:
-            return PasswordStrength.WEAK if char_types < 2 else PasswordStrength.MEDIUM
-        elif length <= 12:
-            if char_types < 2:
-                return PasswordStrength.WEAK
-            elif char_types < 3:
-                return PasswordStrength.MEDIUM
-            return PasswordStrength.STRONG
-        else:
-            if char_types < 2:
-                return PasswordStrength.WEAK
-            elif char_types < 3:
-                return PasswordStrength.MEDIUM
-            elif char_types < 4:
-                return PasswordStrength.STRONG
-            return PasswordStrength.VERY_STRONG
+        metrics = self.metrics
+        if metrics is None:
+            return self.strength_evaluator.evaluate(password)
+        start = time.perf_counter()
+        strength = self.strength_evaluator.evaluate(password)
+        metrics.observe("evaluation", time.perf_counter() - start)
+        return strength
@@ -6,12 +6,31 @@ Autor: Nelson Espinosa
 Versión: 1.2.0
 """
 
-import tkinter as tk
-from tkinter import ttk, messagebox
-import pyperclip
-from password_generator import PasswordGenerator, PasswordStrength
-import logging
-from manager_theme import ThemeManager
+import queue
+import threading
+
+from password_generator import PasswordGenerator, PasswordStrength, setup_logging
+from password_pool import PasswordPool
+from strength_evaluator import IncrementalStrength
+
+STRENGTH_COLORS = {
+    PasswordStrength.WEAK: "#ff0000",
+    PasswordStrength.MEDIUM: "#ffa500",
+    PasswordStrength.STRONG: "#00ff00",
+    PasswordStrength.VERY_STRONG: "#00ffff"
+}
+
+# tkinter se importa al construir la ventana (_load_gui_modules) para que
+# importar este módulo no cargue dependencias gráficas.
+tk = ttk = messagebox = None
+
+def _load_gui_modules() -> None:
+    """Importa tkinter la primera vez que se necesita"""
+    global tk, ttk, messagebox
+    if tk is None:
+        import tkinter
+        from tkinter import ttk as tkinter_ttk, messagebox as tkinter_messagebox
+        tk, ttk, messagebox = tkinter, tkinter_ttk, tkinter_messagebox
 
 class PasswordGeneratorGUI:
     """
@@ -23,25 +42,37 @@ class PasswordGeneratorGUI:
     - Validación en tiempo real
     - Copiado al portapapeles
     - Manejo de errores visual
+    - Reserva de contraseñas pregeneradas para respuesta inmediata
+    - Generación en un hilo de trabajo con progreso y cancelación
+    - Medidor de fortaleza en vivo para contraseñas escritas por el usuario
     
     Atributos:
         window (tk.Tk): Ventana principal de la aplicación
         theme_manager (ThemeManager): Gestor de temas visuales
         generator (PasswordGenerator): Generador de contraseñas
+        password_pool (PasswordPool): Reserva de contraseñas pregeneradas
     """
     
+    # Intervalo de sondeo de resultados del hilo de trabajo (~1 cuadro a 60 Hz)
+    POLL_INTERVAL_MS = 16
+    # Espera tras la última tecla antes de refrescar el medidor en vivo
+    LIVE_METER_DELAY_MS = 120
+    
     def __init__(self):
         """
         Inicializa la ventana principal y configura todos los componentes.
         Establece el tema inicial y crea la estructura base de la GUI.
         """
+        _load_gui_modules()
+        from manager_theme import ThemeManager
+        
         self.theme_manager = ThemeManager()
         self.generator = PasswordGenerator()
         
         # Configuración de la ventana principal
         self.window = tk.Tk()
         self.window.title("Generador de Contraseñas NEIR")
-        self.window.geometry("699x480")
+        self.window.geometry("699x600")
         
         # Variables de control
         self.use_lower = tk.BooleanVar(value=True)
@@ -50,11 +81,29 @@ class PasswordGeneratorGUI:
         self.use_special = tk.BooleanVar(value=True)
         self.current_theme = tk.StringVar(value=self.theme_manager.get_default_theme())
         
+        # Estado de la generación en segundo plano
+        self._results = queue.Queue()
+        self._worker = None
+        self._cancel_event = None
+        self._pending_request = None
+        self._attempt = 0
+        
+        # Medidor en vivo: contadores incrementales y refresco diferido
+        self.live_strength = IncrementalStrength(self.generator.strength_evaluator)
+        self._live_meter_job = None
+        
         initial_theme = self.theme_manager.get_theme(self.current_theme.get())
         self.window.configure(bg=initial_theme["bg"])
         
         self.setup_styles()
         self.create_widgets()
+        
+        # Reserva en segundo plano: se rellena al cambiar la configuración
+        self.password_pool = PasswordPool(self.generator)
+        for var in (self.use_lower, self.use_upper, self.use_digits, self.use_special):
+            var.trace_add("write", self.update_pool_settings)
+        self.length.bind("<KeyRelease>", self.update_pool_settings)
+        self.update_pool_settings()
 
     def setup_styles(self):
         """Configuración de estilos usando el tema actual"""
@@ -111,6 +160,21 @@ class PasswordGeneratorGUI:
         )
         self.generate_btn.pack(pady=8)
         
+        progress_frame = ttk.Frame(self.main_frame, style='Futuristic.TFrame')
+        progress_frame.pack(pady=2)
+        
+        self.progress_bar = ttk.Progressbar(progress_frame, mode='indeterminate', length=200)
+        self.progress_bar.pack(side=tk.LEFT, padx=5)
+        
+        self.cancel_btn = ttk.Button(
+            progress_frame,
+            text="CANCELAR",
+            command=self.cancel_generation,
+            style='Futuristic.TButton',
+            state='disabled'
+        )
+        self.cancel_btn.pack(side=tk.LEFT, padx=5)
+        
         self.password_var = tk.StringVar()
         self.password_entry = ttk.Entry(
             self.main_frame,
@@ -137,6 +201,8 @@ class PasswordGeneratorGUI:
         )
         self.copy_btn.pack(pady=5)
         
+        self.create_live_meter()
+        
     def create_character_options(self):
         options_frame = ttk.Frame(self.main_frame, style='Futuristic.TFrame')
         options_frame.pack(pady=2)
@@ -154,6 +220,57 @@ class PasswordGeneratorGUI:
                        text="Especiales",
                        variable=self.use_special).pack(side=tk.LEFT, padx=5)
         
+    def create_live_meter(self):
+        """Crea el campo para evaluar en vivo una contraseña propia"""
+        ttk.Label(self.main_frame,
+                 text="Evalúa tu contraseña:",
+                 style='Futuristic.TLabel').pack(pady=5)
+        
+        # validatecommand recibe cada inserción o borrado (%d acción, %i
+        # posición, %S texto afectado) y actualiza los contadores sin
+        # recorrer de nuevo el texto completo.
+        validate = (self.window.register(self.on_live_edit), '%d', '%i', '%S')
+        self.live_entry = ttk.Entry(
+            self.main_frame,
+            justify='center',
+            show='•',
+            validate='key',
+            validatecommand=validate
+        )
+        self.live_entry.pack(pady=5, fill='x', padx=8)
+        
+        self.live_strength_var = tk.StringVar()
+        self.live_strength_label = ttk.Label(
+            self.main_frame,
+            textvariable=self.live_strength_var,
+            style='Futuristic.TLabel'
+        )
+        self.live_strength_label.pack(pady=2)
+        
+    def on_live_edit(self, action, index, text):
+        """Registra una edición del campo en vivo y programa el refresco"""
+        index = int(index)
+        if action == '1':
+            self.live_strength.insert(index, text)
+        elif action == '0':
+            self.live_strength.delete(index, index + len(text))
+        
+        if self._live_meter_job is not None:
+            self.window.after_cancel(self._live_meter_job)
+        self._live_meter_job = self.window.after(self.LIVE_METER_DELAY_MS,
+                                                 self.refresh_live_meter)
+        return True
+        
+    def refresh_live_meter(self):
+        """Muestra el nivel de la contraseña escrita en el campo en vivo"""
+        self._live_meter_job = None
+        if not self.live_strength.text:
+            self.live_strength_var.set("")
+            return
+        strength = self.live_strength.strength()
+        self.live_strength_var.set(f"Fortaleza: {strength.value}")
+        self.live_strength_label.configure(foreground=STRENGTH_COLORS[strength])
+        
     def create_input_fields(self):
         ttk.Label(self.main_frame, 
                  text="Iteraciones (1000-50000):", 
@@ -169,6 +286,20 @@ class PasswordGeneratorGUI:
         self.length.pack(pady=5)
         self.length.insert(0, "16")
         
+    def selected_flags(self):
+        """Devuelve los tipos de caracteres marcados"""
+        return (self.use_lower.get(), self.use_upper.get(),
+                self.use_digits.get(), self.use_special.get())
+        
+    def update_pool_settings(self, *args):
+        """Reconfigura la reserva cuando cambian la longitud o los tipos"""
+        try:
+            length = int(self.length.get())
+        except ValueError:
+            return
+        if 8 <= length <= 129 and any(self.selected_flags()):
+            self.password_pool.configure(length, self.selected_flags())
+        
     def generate_password(self):
         """
         Maneja el proceso de generación de contraseña.
@@ -283,39 +414,14 @@ class PasswordGeneratorGUI:
                 )
                 return
 
-            password, strength = self.generator.generate_password(
-                length, iterations,
-                self.use_lower.get(),
-                self.use_upper.get(),
-                self.use_digits.get(),
-                self.use_special.get()
-            )
-            
-            if password:
-                self.password_var.set(password)
-                self.strength_var.set(f"Fortaleza: {strength.value}")
-                color = {
-                    PasswordStrength.WEAK: "#ff0000",
-                    PasswordStrength.MEDIUM: "#ffa500",
-                    PasswordStrength.STRONG: "#00ff00",
-                    PasswordStrength.VERY_STRONG: "#00ffff"
-                }[strength]
-                self.strength_label.configure(foreground=color)
+            # Las contraseñas de la reserva ya están listas; solo si está
+            # vacía se genera en el hilo de trabajo.
+            flags = self.selected_flags()
+            entry = self.password_pool.take(length, flags)
+            if entry is None:
+                self.start_generation(length, iterations, flags)
             else:
-                messagebox.showerror(
-                    "Error - Parámetros Inválidos",
-                    "⚠️ PROBLEMAS DETECTADOS:\n\n"
-                    "📏 LONGITUD:\n"
-                    f"• Valor actual: {length}\n"
-                    "• Rango permitido: 8-129 caracteres\n\n"
-                    "🔄 ITERACIONES:\n"
-                    f"• Valor actual: {iterations}\n"
-                    "• Rango permitido: 1000-50000\n\n"
-                    "🔒 PARA SOLUCIONAR:\n"
-                    "1. Ajusta la longitud entre 8 y 129 caracteres\n"
-                    "2. Ajusta las iteraciones entre 1000 y 50000\n"
-                    "3. Asegúrate de tener al menos dos tipos de caracteres seleccionados"
-                )
+                self.show_result(entry[0], entry[1], length, iterations)
             
         except ValueError:
             messagebox.showerror(
@@ -334,6 +440,104 @@ class PasswordGeneratorGUI:
                 "• Espacios"
             )
             
+    def show_result(self, password, strength, length, iterations):
+        """Muestra una contraseña generada o el error correspondiente"""
+        if password:
+            self.password_var.set(password)
+            self.strength_var.set(f"Fortaleza: {strength.value}")
+            self.strength_label.configure(foreground=STRENGTH_COLORS[strength])
+        else:
+            messagebox.showerror(
+                "Error - Parámetros Inválidos",
+                "⚠️ PROBLEMAS DETECTADOS:\n\n"
+                "📏 LONGITUD:\n"
+                f"• Valor actual: {length}\n"
+                "• Rango permitido: 8-129 caracteres\n\n"
+                "🔄 ITERACIONES:\n"
+                f"• Valor actual: {iterations}\n"
+                "• Rango permitido: 1000-50000\n\n"
+                "🔒 PARA SOLUCIONAR:\n"
+                "1. Ajusta la longitud entre 8 y 129 caracteres\n"
+                "2. Ajusta las iteraciones entre 1000 y 50000\n"
+                "3. Asegúrate de tener al menos dos tipos de caracteres seleccionados"
+            )
+
+    def start_generation(self, length, iterations, flags):
+        """
+        Lanza la generación en un hilo de trabajo.
+        
+        Si ya hay una generación en curso, la petición sustituye a la pendiente
+        en lugar de encolarse: los clics repetidos se fusionan en uno.
+        """
+        request = (length, iterations, flags)
+        if self._worker is not None:
+            self._pending_request = request
+            return
+        
+        self._cancel_event = threading.Event()
+        self._attempt = 0
+        self._worker = threading.Thread(
+            target=self._run_generation,
+            args=(request, self._cancel_event),
+            daemon=True
+        )
+        self._worker.start()
+        
+        self.cancel_btn.configure(state='normal')
+        self.progress_bar.start(10)
+        self.window.after(self.POLL_INTERVAL_MS, self._poll_generation)
+        
+    def _run_generation(self, request, cancel_event):
+        """Cuerpo del hilo de trabajo: nunca toca widgets de Tk"""
+        length, iterations, flags = request
+        
+        def report(attempt):
+            self._attempt = attempt
+            
+        error = None
+        try:
+            password, strength = self.generator.generate_password(
+                length, iterations, *flags,
+                should_stop=cancel_event.is_set,
+                progress=report
+            )
+        except Exception as e:
+            password, strength, error = "", PasswordStrength.WEAK, e
+        self._results.put((request, cancel_event, password, strength, error))
+            
+    def _poll_generation(self):
+        """Recoge el resultado del hilo de trabajo sin bloquear el bucle de Tk"""
+        try:
+            request, cancel_event, password, strength, error = self._results.get_nowait()
+        except queue.Empty:
+            self.strength_var.set(f"Generando... intento {self._attempt}")
+            self.window.after(self.POLL_INTERVAL_MS, self._poll_generation)
+            return
+        
+        self._worker = None
+        self.progress_bar.stop()
+        self.cancel_btn.configure(state='disabled')
+        
+        if cancel_event.is_set():
+            self._pending_request = None
+            self.strength_var.set("Generación cancelada")
+        elif error is not None:
+            self.strength_var.set("")
+            messagebox.showerror("Error", f"No se pudo generar la contraseña:\n{error}")
+        else:
+            length, iterations, _ = request
+            self.show_result(password, strength, length, iterations)
+        
+        if self._pending_request is not None:
+            pending, self._pending_request = self._pending_request, None
+            self.start_generation(*pending)
+            
+    def cancel_generation(self):
+        """Cancela la generación en curso y descarta los clics pendientes"""
+        self._pending_request = None
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+            
     def copy_to_clipboard(self):
         """
         Copia la contraseña generada al portapapeles.
@@ -341,6 +545,7 @@ class PasswordGeneratorGUI:
         """
         password = self.password_var.get()
         if password:
+            import pyperclip
             pyperclip.copy(password)
             messagebox.showinfo(
             "Éxito",
@@ -354,7 +559,10 @@ class PasswordGeneratorGUI:
             
     def run(self):
         """Inicia la aplicación"""
-        self.window.mainloop()
+        try:
+            self.window.mainloop()
+        finally:
+            self.password_pool.close()
 
     def change_theme(self, *args):
         """Cambia el tema de la aplicación"""
@@ -368,5 +576,6 @@ class PasswordGeneratorGUI:
             strength_text = self.strength_var.get()
 
 if __name__ == "__main__":
+    setup_logging()
     app = PasswordGeneratorGUI()  # Crea la instancia de la aplicación
     app.run()  # Inicia la aplicación
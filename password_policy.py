@@ -0,0 +1,201 @@
+"""
+Módulo de políticas de contraseñas.
+Define PasswordPolicy (mínimos por clase, caracteres excluidos o ambiguos,
+alfabetos personalizados y repeticiones máximas) y la compila una sola vez en
+alfabetos y tablas precalculadas que comparten el generador y el evaluador.
+
+Autor: Nelson Espinosa
+Versión: 1.2.0
+"""
+
+import functools
+import re
+import string
+from typing import NamedTuple, Optional, Tuple, Union
+
+from strength_evaluator import StrengthEvaluator
+
+# Caracteres que se confunden fácilmente al leer o transcribir
+AMBIGUOUS_CHARS = "0O1lI|"
+
+class PasswordPolicy(NamedTuple):
+    """
+    Reglas que debe cumplir una contraseña generada.
+
+    Es inmutable y hashable, por lo que sirve como clave de la caché de
+    compile_policy.
+
+    Atributos:
+        use_lower, use_upper, use_digits, use_special (bool): Clases incluidas
+        min_lower, min_upper, min_digits, min_special (int): Mínimo de
+            caracteres de cada clase incluida (0 la hace opcional)
+        exclude (str): Caracteres que nunca deben aparecer
+        exclude_ambiguous (bool): Excluir también AMBIGUOUS_CHARS
+        lowercase, uppercase, digits, special (str): Alfabeto de cada clase
+        max_repeat (int): Máximo de caracteres idénticos consecutivos; 0 sin límite
+    """
+    use_lower: bool = True
+    use_upper: bool = True
+    use_digits: bool = True
+    use_special: bool = True
+    min_lower: int = 1
+    min_upper: int = 1
+    min_digits: int = 1
+    min_special: int = 1
+    exclude: str = ""
+    exclude_ambiguous: bool = False
+    lowercase: str = string.ascii_lowercase
+    uppercase: str = string.ascii_uppercase
+    digits: str = string.digits
+    special: str = string.punctuation
+    max_repeat: int = 0
+
+class CompiledPolicy:
+    """
+    Política compilada: alfabetos filtrados y tablas listas para usar.
+
+    Las clases resultantes son disjuntas (un carácter que aparece en varias se
+    queda en la primera), condición que necesita la generación constructiva.
+
+    Atributos:
+        policy (PasswordPolicy): Política de origen
+        classes (Tuple[str, ...]): Alfabeto de cada clase incluida, en orden fijo
+        minimums (Tuple[int, ...]): Mínimo de cada clase incluida
+        alphabet (str): Unión de las clases incluidas
+        min_length (int): Longitud mínima que admite la suma de mínimos
+        max_repeat (int): Máximo de caracteres idénticos consecutivos; 0 sin límite
+        evaluator (StrengthEvaluator): Evaluador con los alfabetos de la política
+        class_sets (Tuple[frozenset, ...]): Conjunto de caracteres de cada clase
+        class_marks (bytes): Tabla para bytes.translate que asigna a cada
+            carácter ASCII el índice de su clase más uno (0 si no pertenece)
+    """
+
+    def __init__(self, policy: PasswordPolicy):
+        """
+        Compila la política.
+
+        Args:
+            policy (PasswordPolicy): Política a compilar
+
+        Raises:
+            ValueError: Si la política no admite ninguna contraseña
+        """
+        self.policy = policy
+        excluded = set(policy.exclude)
+        if policy.exclude_ambiguous:
+            excluded.update(AMBIGUOUS_CHARS)
+
+        seen = set()
+        filtered = []
+        for chars in (policy.lowercase, policy.uppercase, policy.digits, policy.special):
+            kept = "".join(dict.fromkeys(c for c in chars if c not in excluded and c not in seen))
+            if not kept.isascii() or not kept.isprintable():
+                raise ValueError("Los alfabetos solo admiten caracteres ASCII imprimibles")
+            seen.update(kept)
+            filtered.append(kept)
+
+        selected = (
+            (policy.use_lower, filtered[0], policy.min_lower, "minúsculas"),
+            (policy.use_upper, filtered[1], policy.min_upper, "mayúsculas"),
+            (policy.use_digits, filtered[2], policy.min_digits, "números"),
+            (policy.use_special, filtered[3], policy.min_special, "especiales"),
+        )
+        classes, minimums = [], []
+        for use, chars, minimum, name in selected:
+            if not use:
+                continue
+            if not chars:
+                raise ValueError(f"La clase {name} queda vacía tras las exclusiones")
+            if minimum < 0:
+                raise ValueError(f"Mínimo negativo para {name}")
+            classes.append(chars)
+            minimums.append(minimum)
+        if not classes:
+            raise ValueError("No se seleccionaron tipos de caracteres")
+        if policy.max_repeat < 0:
+            raise ValueError("max_repeat no puede ser negativo")
+
+        self.classes: Tuple[str, ...] = tuple(classes)
+        self.minimums: Tuple[int, ...] = tuple(minimums)
+        self.alphabet = "".join(classes)
+        self.min_length = sum(minimums)
+        self.max_repeat = policy.max_repeat
+        self.evaluator = StrengthEvaluator(*filtered)
+        self.class_sets = tuple(frozenset(chars) for chars in classes)
+        self._alphabet_set = frozenset(self.alphabet)
+
+        marks = bytearray(256)
+        for index, chars in enumerate(classes, 1):
+            for char in chars:
+                marks[ord(char)] = index
+        self.class_marks = bytes(marks)
+        self._repeat = (re.compile(r"(.)\1{%d}" % policy.max_repeat, re.DOTALL)
+                        if policy.max_repeat else None)
+        self._repeat_bytes = (re.compile(rb"(.)\1{%d}" % policy.max_repeat, re.DOTALL)
+                              if policy.max_repeat else None)
+
+    def accepts(self, password: str) -> bool:
+        """
+        Comprueba las reglas que la generación constructiva no garantiza.
+
+        Los mínimos por clase y las exclusiones se cumplen por construcción;
+        solo queda el límite de repeticiones consecutivas.
+
+        Args:
+            password (str): Contraseña generada con esta política
+
+        Returns:
+            bool: True si la contraseña cumple la política
+        """
+        return self._repeat is None or self._repeat.search(password) is None
+
+    def accepts_bytes(self, buffer: Union[bytes, bytearray, memoryview],
+                      start: int = 0, end: Optional[int] = None) -> bool:
+        """
+        Igual que accepts, sobre buffer[start:end] en ASCII sin copiarlo.
+
+        Args:
+            buffer (Union[bytes, bytearray, memoryview]): Búfer con la contraseña
+            start (int): Inicio de la contraseña
+            end (Optional[int]): Fin de la contraseña; None hasta el final
+
+        Returns:
+            bool: True si la contraseña cumple la política
+        """
+        if self._repeat_bytes is None:
+            return True
+        return self._repeat_bytes.search(buffer, start, len(buffer) if end is None else end) is None
+
+    def satisfies(self, password: str) -> bool:
+        """
+        Comprueba todas las reglas sobre una contraseña cualquiera.
+
+        Args:
+            password (str): Contraseña a comprobar
+
+        Returns:
+            bool: True si la contraseña cumple la política
+        """
+        if not self._alphabet_set.issuperset(password):
+            return False
+        marks = password.encode("ascii").translate(self.class_marks)
+        for index, minimum in enumerate(self.minimums, 1):
+            if marks.count(index) < minimum:
+                return False
+        return self.accepts(password)
+
+@functools.lru_cache(maxsize=128)
+def compile_policy(policy: PasswordPolicy) -> CompiledPolicy:
+    """
+    Compila una política, reutilizando el resultado para políticas iguales.
+
+    Args:
+        policy (PasswordPolicy): Política a compilar
+
+    Returns:
+        CompiledPolicy: Política compilada
+
+    Raises:
+        ValueError: Si la política no admite ninguna contraseña
+    """
+    return CompiledPolicy(policy)
@@ -0,0 +1,149 @@
+"""
+Módulo de reserva de contraseñas pregeneradas.
+Mantiene en segundo plano una cola acotada de contraseñas para la
+configuración actual (longitud y tipos de caracteres), de modo que la GUI
+pueda entregar una al instante cuando el usuario pulsa "GENERAR CONTRASEÑA".
+
+Autor: Nelson Espinosa
+Versión: 1.2.0
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from password_generator import PasswordGenerator, PasswordStrength
+
+logger = logging.getLogger(__name__)
+
+Settings = Tuple[int, Tuple[bool, bool, bool, bool]]
+
+class PasswordPool:
+    """
+    Cola acotada de contraseñas generadas por un hilo en segundo plano.
+
+    Implementa:
+    - Rellenado en segundo plano con generate_batch para la configuración actual
+    - Descarte inmediato de las entradas al cambiar la configuración
+    - Entrega única: cada contraseña sale de la cola al tomarla
+    - Contadores de aciertos y fallos para saber si la reserva da abasto
+
+    Atributos:
+        generator (PasswordGenerator): Generador usado para rellenar la cola
+        capacity (int): Número máximo de contraseñas en espera
+        hits (int): Peticiones atendidas desde la cola
+        misses (int): Peticiones que encontraron la cola vacía o desactualizada
+    """
+
+    def __init__(self, generator: PasswordGenerator, capacity: int = 8):
+        """
+        Inicializa la reserva y arranca el hilo de rellenado.
+
+        Args:
+            generator (PasswordGenerator): Generador de contraseñas
+            capacity (int): Tamaño máximo de la cola
+        """
+        self.generator = generator
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._queue: Deque[Tuple[str, PasswordStrength]] = deque()
+        self._settings: Optional[Settings] = None
+        self._version = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._fill_loop, name="reserva-contraseñas",
+                                        daemon=True)
+        self._thread.start()
+
+    def configure(self, length: int, flags: Tuple[bool, bool, bool, bool]) -> None:
+        """
+        Fija la configuración para la que se pregeneran contraseñas.
+
+        Si cambia, las entradas en cola se descartan y se empieza a rellenar
+        con la nueva configuración.
+
+        Args:
+            length (int): Longitud de las contraseñas
+            flags (Tuple[bool, bool, bool, bool]): Minúsculas, mayúsculas,
+                números y especiales
+        """
+        settings = (length, tuple(flags))
+        with self._condition:
+            if settings == self._settings:
+                return
+            self._settings = settings
+            self._version += 1
+            self._queue.clear()
+            self._condition.notify_all()
+
+    def take(self, length: int, flags: Tuple[bool, bool, bool, bool]) -> Optional[Tuple[str, PasswordStrength]]:
+        """
+        Entrega la siguiente contraseña pregenerada para la configuración dada.
+
+        Args:
+            length (int): Longitud de la contraseña
+            flags (Tuple[bool, bool, bool, bool]): Tipos de caracteres
+
+        Returns:
+            Optional[Tuple[str, PasswordStrength]]: Contraseña y fortaleza, o
+            None si no había ninguna lista (el llamador debe generarla)
+        """
+        settings = (length, tuple(flags))
+        with self._condition:
+            if settings == self._settings and self._queue:
+                self.hits += 1
+                entry = self._queue.popleft()
+                self._condition.notify_all()
+                return entry
+            self.misses += 1
+        self.configure(length, flags)
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Obtiene los contadores de la reserva.
+
+        Returns:
+            Dict[str, int]: hits, misses y entradas disponibles
+        """
+        with self._condition:
+            return {"hits": self.hits, "misses": self.misses, "available": len(self._queue)}
+
+    def close(self) -> None:
+        """Detiene el hilo de rellenado y descarta las entradas"""
+        with self._condition:
+            self._closed = True
+            self._queue.clear()
+            self._condition.notify_all()
+        self._thread.join(timeout=1)
+
+    def _fill_loop(self) -> None:
+        """Rellena la cola mientras haya hueco y una configuración activa"""
+        while True:
+            with self._condition:
+                while not self._closed and (self._settings is None
+                                            or len(self._queue) >= self.capacity):
+                    self._condition.wait()
+                if self._closed:
+                    return
+                settings, version = self._settings, self._version
+                missing = self.capacity - len(self._queue)
+
+            length, flags = settings
+            try:
+                batch = list(self.generator.generate_batch(missing, length, *flags))
+            except Exception:
+                logger.exception("Error al rellenar la reserva de contraseñas")
+                batch = []
+
+            with self._condition:
+                if version != self._version:
+                    continue  # la configuración cambió mientras se generaba
+                if not batch:
+                    # Configuración imposible: esperar a que cambie
+                    while not self._closed and version == self._version:
+                        self._condition.wait()
+                    continue
+                self._queue.extend(batch[:self.capacity - len(self._queue)])
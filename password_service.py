@@ -0,0 +1,316 @@
+"""
+Servicio HTTP/JSON local para el generador de contraseñas.
+Implementa un servidor asyncio mínimo (HTTP/1.1 con keep-alive) que agrupa
+las peticiones concurrentes con los mismos parámetros en microlotes, los
+genera fuera del bucle de eventos con generate_batch y registra
+histogramas de latencia por endpoint. Solo escucha en direcciones locales.
+
+Endpoints:
+    POST /generar   {"longitud": 16, "cantidad": 1, "minusculas": true, ...}
+    POST /evaluar   {"password": "..."}
+    GET  /metricas  histogramas de latencia por endpoint
+    GET  /salud     comprobación de estado
+
+Uso:
+    python -m password_service [--puerto 8765]
+
+Autor: Nelson Espinosa
+Versión: 1.2.0
+"""
+
+import asyncio
+import ipaddress
+import json
+import logging
+import sys
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from metrics import LatencyHistogram
+from password_generator import PasswordGenerator, PasswordStrength, setup_logging
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_SIZE = 64 * 1024
+MAX_COUNT = 1000
+_FLAG_NAMES = ("minusculas", "mayusculas", "numeros", "especiales")
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+class MicroBatcher:
+    """
+    Agrupa peticiones de generación con los mismos parámetros.
+
+    La primera petición de una clave abre una ventana de batch_window
+    segundos; las que llegan mientras tanto se suman al mismo lote, que se
+    genera con una sola llamada a generate_batch en el executor. Si el lote
+    alcanza max_batch contraseñas se procesa sin esperar a que cierre la
+    ventana.
+
+    Atributos:
+        batch_window (float): Duración de la ventana de agrupación en segundos
+        max_batch (int): Contraseñas máximas por lote
+        batches (int): Lotes procesados
+        requests (int): Peticiones atendidas
+    """
+
+    def __init__(self, generator: PasswordGenerator, executor: Executor,
+                 batch_window: float = 0.002, max_batch: int = 4096):
+        self.generator = generator
+        self.executor = executor
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.requests = 0
+        self._pending: Dict[Tuple, List[Tuple[int, asyncio.Future]]] = {}
+        self._sizes: Dict[Tuple, int] = {}
+        self._timers: Dict[Tuple, asyncio.TimerHandle] = {}
+
+    async def generate(self, count: int, length: int,
+                       flags: Tuple[bool, bool, bool, bool]) -> List[Tuple[str, PasswordStrength]]:
+        """
+        Solicita count contraseñas; se resuelve cuando su lote termina.
+
+        Returns:
+            List[Tuple[str, PasswordStrength]]: Contraseñas generadas; vacía si
+            los parámetros no son válidos
+        """
+        loop = asyncio.get_running_loop()
+        key = (length, flags)
+        future = loop.create_future()
+        waiting = self._pending.get(key)
+        if waiting is None:
+            waiting = self._pending[key] = []
+            self._sizes[key] = 0
+            self._timers[key] = loop.call_later(self.batch_window, self._flush, key)
+        waiting.append((count, future))
+        self._sizes[key] += count
+        self.requests += 1
+        if self._sizes[key] >= self.max_batch:
+            self._flush(key)
+        return await future
+
+    def _flush(self, key: Tuple) -> None:
+        """Envía al executor el lote acumulado de una clave"""
+        waiting = self._pending.pop(key, None)
+        if not waiting:
+            return
+        self._timers.pop(key).cancel()
+        total = self._sizes.pop(key)
+        length, flags = key
+        self.batches += 1
+        loop = asyncio.get_running_loop()
+        task = loop.run_in_executor(
+            self.executor, lambda: list(self.generator.generate_batch(total, length, *flags)))
+        task.add_done_callback(lambda done: self._distribute(done, waiting))
+
+    @staticmethod
+    def _distribute(done: asyncio.Future, waiting: List[Tuple[int, asyncio.Future]]) -> None:
+        """Reparte las contraseñas del lote entre las peticiones que lo formaron"""
+        error = done.exception()
+        results = [] if error else done.result()
+        start = 0
+        for count, future in waiting:
+            if future.done():
+                continue
+            if error:
+                future.set_exception(error)
+            else:
+                future.set_result(results[start:start + count])
+            start += count
+
+class PasswordService:
+    """
+    Servidor HTTP/JSON local del generador.
+
+    Atributos:
+        host (str): Dirección local de escucha
+        port (int): Puerto de escucha (0 elige uno libre)
+        histograms (Dict[str, LatencyHistogram]): Latencias por endpoint
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765,
+                 generator: Optional[PasswordGenerator] = None,
+                 batch_window: float = 0.002, workers: int = 2):
+        """
+        Inicializa el servicio.
+
+        Raises:
+            ValueError: Si host no es una dirección de loopback
+        """
+        if host != "localhost" and not ipaddress.ip_address(host).is_loopback:
+            raise ValueError("El servicio solo puede escuchar en direcciones locales")
+        self.host = host
+        self.port = port
+        self.generator = generator or PasswordGenerator()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="generador")
+        self.batcher = MicroBatcher(self.generator, self.executor, batch_window)
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._routes = {
+            ("POST", "/generar"): self._handle_generate,
+            ("POST", "/evaluar"): self._handle_evaluate,
+            ("GET", "/metricas"): self._handle_metrics,
+            ("GET", "/salud"): self._handle_health,
+        }
+
+    async def start(self) -> None:
+        """Empieza a aceptar conexiones"""
+        self._server = await asyncio.start_server(self._serve_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("Servicio escuchando en http://%s:%d", self.host, self.port)
+
+    async def stop(self) -> None:
+        """Cierra el servidor y el executor"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.executor.shutdown(wait=False)
+
+    async def serve_forever(self) -> None:
+        """Inicia el servidor y atiende peticiones hasta que se cancela"""
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _serve_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        """Atiende peticiones sucesivas de una conexión (keep-alive)"""
+        try:
+            while True:
+                # readline() lanza ValueError si una línea supera el límite del stream
+                try:
+                    request_line = await reader.readline()
+                    if not request_line:
+                        break
+                    try:
+                        method, path, version = request_line.decode("latin-1").split()
+                    except ValueError:
+                        await self._respond(writer, 400, {"error": "Petición mal formada"}, False)
+                        break
+
+                    headers: Dict[str, str] = {}
+                    while True:
+                        line = await reader.readline()
+                        if line in (b"\r\n", b"\n", b""):
+                            break
+                        name, _, value = line.decode("latin-1").partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                except (ValueError, asyncio.LimitOverrunError):
+                    await self._respond(writer, 400, {"error": "Línea de cabecera demasiado larga"}, False)
+                    break
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                try:
+                    length = int(headers.get("content-length", "0") or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Content-Length inválido"}, False)
+                    break
+                if length > MAX_BODY_SIZE:
+                    await self._respond(writer, 413, {"error": "Cuerpo demasiado grande"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                start = time.perf_counter()
+                status, payload = await self._dispatch(method, path.split("?", 1)[0], body)
+                await self._respond(writer, status, payload, keep_alive)
+                endpoint = path.split("?", 1)[0] if status != 404 else "desconocido"
+                self.histograms.setdefault(endpoint, LatencyHistogram()).observe(time.perf_counter() - start)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        """Ejecuta el manejador de la ruta y traduce errores a códigos HTTP"""
+        handler = self._routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self._routes):
+                return 405, {"error": "Método no permitido"}
+            return 404, {"error": "Ruta no encontrada"}
+        try:
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                raise ValueError("Se esperaba un objeto JSON")
+            return await handler(data)
+        except (ValueError, TypeError) as e:
+            return 400, {"error": str(e)}
+        except Exception:
+            logger.exception("Error al atender %s %s", method, path)
+            return 500, {"error": "Error interno"}
+
+    async def _handle_generate(self, data: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        count = int(data.get("cantidad", 1))
+        length = int(data.get("longitud", 16))
+        if not 1 <= count <= MAX_COUNT:
+            raise ValueError(f"cantidad debe estar entre 1 y {MAX_COUNT}")
+        flags = tuple(data.get(name, True) for name in _FLAG_NAMES)
+        for name, flag in zip(_FLAG_NAMES, flags):
+            # bool("false") sería True: solo se aceptan booleanos JSON
+            if not isinstance(flag, bool):
+                raise ValueError(f"{name} debe ser true o false")
+        results = await self.batcher.generate(count, length, flags)
+        if not results:
+            raise ValueError("No se pudo generar con los parámetros indicados")
+        return 200, {"passwords": [{"password": password, "strength": strength.name}
+                                   for password, strength in results]}
+
+    async def _handle_evaluate(self, data: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        password = data.get("password")
+        if not isinstance(password, str):
+            raise ValueError("password debe ser una cadena")
+        strength = self.generator._evaluate_password_strength(password)
+        return 200, {"strength": strength.name, "valor": strength.value}
+
+    async def _handle_metrics(self, data: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        payload = {
+            "endpoints": {name: histogram.snapshot() for name, histogram in self.histograms.items()},
+            "microlotes": {"lotes": self.batcher.batches, "peticiones": self.batcher.requests},
+        }
+        if self.generator.metrics is not None:
+            payload["generador"] = self.generator.metrics.snapshot()
+        return 200, payload
+
+    async def _handle_health(self, data: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        return 200, {"estado": "ok"}
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any],
+                       keep_alive: bool) -> None:
+        """Escribe una respuesta JSON"""
+        body = json.dumps(payload).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Función principal del servicio"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m password_service",
+                                     description="Servicio HTTP local del generador NEIR")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--ventana-ms", type=float, default=2.0,
+                        help="ventana de agrupación de microlotes en milisegundos")
+    args = parser.parse_args(argv)
+
+    setup_logging(logging.WARNING)
+    service = PasswordService(args.host, args.puerto, batch_window=args.ventana_ms / 1000)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
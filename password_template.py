@@ -0,0 +1,194 @@
+"""
+Módulo de generación de contraseñas a partir de plantillas.
+Cada posición de la plantilla nombra una clase de caracteres o un literal;
+la plantilla se compila una sola vez en una tabla de alfabetos y una cadena
+de formato, y cada contraseña se obtiene de un único entero aleatorio
+descompuesto en base mixta. La entropía es exacta: log2 del número de
+contraseñas distintas que admite la plantilla.
+
+Sintaxis:
+    l  minúscula            u  mayúscula          L  letra
+    v  vocal minúscula      V  vocal mayúscula
+    c  consonante minúscula C  consonante mayúscula
+    9  dígito (también d)   s  carácter especial
+    a  alfanumérico         S  cualquier carácter de las cuatro clases
+    \\x el carácter x literal; cualquier otro carácter es literal
+
+Ejemplo: "Cvcc-9999-Ss" -> "Bado-4821-#k"
+
+Autor: Nelson Espinosa
+Versión: 1.2.0
+"""
+
+import functools
+import itertools
+import math
+import secrets
+import string
+from typing import Callable, Iterator, List, Tuple
+
+from pattern_estimator import strength_for_bits
+from strength_evaluator import PasswordStrength
+
+VOWELS = "aeiou"
+MAX_TEMPLATE_LENGTH = 129
+GROUP_LIMIT = 4096
+
+def _group_table(alphabets: List[str]) -> Tuple[str, ...]:
+    """Todas las subcadenas de un grupo de posiciones, en orden de base mixta"""
+    if len(alphabets) == 1:
+        return tuple(alphabets[0])
+    return tuple("".join(chars) for chars in itertools.product(*alphabets))
+
+class CompiledTemplate:
+    """
+    Plantilla compilada.
+
+    Atributos:
+        template (str): Plantilla de origen
+        slots (Tuple[str, ...]): Alfabeto de cada posición aleatoria, en orden
+        length (int): Longitud de las contraseñas generadas
+        combinations (int): Número de contraseñas distintas posibles
+        entropy_bits (float): log2(combinations)
+        strength (PasswordStrength): Nivel correspondiente a entropy_bits
+    """
+
+    def __init__(self, template: str, lowercase: str, uppercase: str,
+                 digits: str, special: str):
+        """
+        Compila la plantilla con los alfabetos indicados.
+
+        Raises:
+            ValueError: Si la plantilla está vacía, es demasiado larga, termina
+                en '\\' o usa una clase sin caracteres
+        """
+        vowels = "".join(c for c in lowercase if c in VOWELS)
+        consonants = "".join(c for c in lowercase if c not in VOWELS)
+        classes = {
+            "l": lowercase, "u": uppercase, "L": lowercase + uppercase,
+            "v": vowels, "V": vowels.upper(),
+            "c": consonants, "C": consonants.upper(),
+            "9": digits, "d": digits, "s": special,
+            "a": lowercase + uppercase + digits,
+            "S": lowercase + uppercase + digits + special,
+        }
+
+        slots: List[str] = []
+        parts: List[str] = []
+        runs: List[List[str]] = []  # posiciones aleatorias consecutivas
+        length = 0
+        chars = iter(template)
+        for char in chars:
+            alphabet = None
+            if char == "\\":
+                char = next(chars, None)
+                if char is None:
+                    raise ValueError("La plantilla termina en '\\' sin carácter literal")
+            elif char in classes:
+                alphabet = "".join(dict.fromkeys(classes[char]))
+                if not alphabet:
+                    raise ValueError(f"La clase '{char}' de la plantilla no tiene caracteres")
+                if len(alphabet) == 1:
+                    char, alphabet = alphabet, None
+            length += 1
+            if alphabet is None:
+                parts.append(char.replace("%", "%%"))
+                continue
+            slots.append(alphabet)
+            if parts and parts[-1] == "%s":
+                runs[-1].append(alphabet)
+            else:
+                parts.append("%s")
+                runs.append([alphabet])
+        if not 1 <= length <= MAX_TEMPLATE_LENGTH:
+            raise ValueError(f"La plantilla debe producir entre 1 y {MAX_TEMPLATE_LENGTH} caracteres")
+
+        # Cada tramo de posiciones consecutivas se parte en grupos de hasta
+        # GROUP_LIMIT combinaciones, y cada grupo en una tabla con todas sus
+        # subcadenas: un solo divmod y una indexación por grupo.
+        format_parts: List[str] = []
+        groups: List[Tuple[str, ...]] = []
+        run_index = 0
+        for part in parts:
+            if part != "%s":
+                format_parts.append(part)
+                continue
+            group: List[str] = []
+            for alphabet in runs[run_index]:
+                if group and math.prod(map(len, group)) * len(alphabet) > GROUP_LIMIT:
+                    groups.append(_group_table(group))
+                    format_parts.append("%s")
+                    group = []
+                group.append(alphabet)
+            groups.append(_group_table(group))
+            format_parts.append("%s")
+            run_index += 1
+
+        self.template = template
+        self.slots: Tuple[str, ...] = tuple(slots)
+        self.length = length
+        self.combinations = math.prod(len(alphabet) for alphabet in slots)
+        self.entropy_bits = math.log2(self.combinations)
+        self.strength: PasswordStrength = strength_for_bits(self.entropy_bits)
+        self._format = "".join(format_parts)
+        # Recorrido de la base mixta: (tabla, tamaño) desde el último grupo
+        self._table = tuple((table, len(table)) for table in reversed(groups))
+
+    def generate(self, randbelow: Callable[[int], int] = secrets.randbelow) -> str:
+        """
+        Genera una contraseña.
+
+        Se extrae un único entero uniforme en [0, combinations) y cada grupo de
+        posiciones toma su subcadena de un dígito de ese entero en base mixta,
+        así que la distribución es exactamente uniforme con una sola lectura
+        de entropía.
+
+        Args:
+            randbelow (Callable[[int], int]): Fuente de enteros uniformes en [0, n)
+
+        Returns:
+            str: Contraseña generada
+        """
+        value = randbelow(self.combinations)
+        picked = []
+        append = picked.append
+        for table, size in self._table:
+            value, index = divmod(value, size)
+            append(table[index])
+        picked.reverse()
+        return self._format % tuple(picked)
+
+    def generate_many(self, n: int,
+                      randbelow: Callable[[int], int] = secrets.randbelow) -> Iterator[str]:
+        """
+        Genera n contraseñas con la misma plantilla.
+
+        Args:
+            n (int): Número de contraseñas
+            randbelow (Callable[[int], int]): Fuente de enteros uniformes en [0, n)
+
+        Returns:
+            Iterator[str]: Contraseñas generadas
+        """
+        generate = self.generate
+        for _ in range(n):
+            yield generate(randbelow)
+
+@functools.lru_cache(maxsize=128)
+def compile_template(template: str, lowercase: str = string.ascii_lowercase,
+                     uppercase: str = string.ascii_uppercase, digits: str = string.digits,
+                     special: str = string.punctuation) -> CompiledTemplate:
+    """
+    Compila una plantilla, reutilizando el resultado para plantillas iguales.
+
+    Args:
+        template (str): Plantilla (ver la sintaxis del módulo)
+        lowercase, uppercase, digits, special (str): Alfabeto de cada clase
+
+    Returns:
+        CompiledTemplate: Plantilla compilada
+
+    Raises:
+        ValueError: Si la plantilla no es válida
+    """
+    return CompiledTemplate(template, lowercase, uppercase, digits, special)
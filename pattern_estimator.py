@@ -0,0 +1,557 @@
+"""
+Módulo de estimación de fortaleza por entropía y patrones.
+Estima el número de intentos necesarios para adivinar una contraseña
+detectando palabras de diccionario, recorridos de teclado, repeticiones y
+secuencias, y traduce el resultado al enum PasswordStrength.
+
+Los diccionarios se convierten una sola vez en un índice binario ordenado
+que se abre con mmap: no se analiza ningún archivo al arrancar y varios
+procesos que abren el mismo índice comparten sus páginas en memoria.
+
+Uso:
+    python -m pattern_estimator construir lista.txt indice.idx
+    python -m pattern_estimator evaluar "Password1234!" [--indice indice.idx]
+
+Autor: Nelson Espinosa
+Versión: 1.2.0
+"""
+
+import math
+import mmap
+import os
+import re
+import string
+import sys
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from strength_evaluator import PasswordStrength
+
+INDEX_MAGIC = b"NEIRWIX1"
+MIN_WORD_LENGTH = 3
+_HEADER_SIZE = len(INDEX_MAGIC) + 4
+
+def _bucket_codes() -> bytes:
+    """
+    Código de cubeta de cada byte ASCII. Es no decreciente con el valor del
+    byte, así que el orden de las cubetas respeta el orden lexicográfico.
+    """
+    codes = bytearray(128)
+    for value in range(128):
+        char = chr(value)
+        if char < "0":
+            codes[value] = 0
+        elif char <= "9":
+            codes[value] = 1 + value - ord("0")
+        elif char < "a":
+            codes[value] = 11
+        elif char <= "z":
+            codes[value] = 12 + value - ord("a")
+        else:
+            codes[value] = 38
+    return bytes(codes)
+
+_CODES = _bucket_codes()
+_CODES_TABLE = _CODES + bytes(128)
+_RADIX = 39
+_BUCKETS = _RADIX ** 3
+
+def _bucket_key(word: bytes) -> int:
+    """Cubeta de una palabra según sus tres primeros caracteres"""
+    return (_CODES[word[0]] * _RADIX + _CODES[word[1]]) * _RADIX + _CODES[word[2]]
+
+# Lista mínima incorporada, usada cuando no se indica un índice propio.
+# El orden es el rango: las primeras son las más frecuentes.
+COMMON_WORDS = (
+    "password", "123456", "qwerty", "admin", "welcome", "letmein", "monkey",
+    "dragon", "iloveyou", "football", "baseball", "master", "sunshine",
+    "princess", "shadow", "superman", "login", "secret", "passw0rd", "abc",
+    "contrasena", "clave", "secreto", "usuario", "hola", "amor", "teamo",
+    "bienvenido", "administrador", "sistema", "test", "user", "root",
+    "hello", "freedom", "whatever", "trustno", "starwars", "pokemon",
+)
+
+# Límites en bits de entropía para cada nivel de PasswordStrength
+STRENGTH_THRESHOLDS = (
+    (36.0, PasswordStrength.WEAK),
+    (60.0, PasswordStrength.MEDIUM),
+    (80.0, PasswordStrength.STRONG),
+)
+
+class Match(NamedTuple):
+    """Patrón detectado en la contraseña, en el rango [start, end)"""
+    pattern: str
+    start: int
+    end: int
+    guesses: float
+
+class Estimate(NamedTuple):
+    """Resultado de la estimación de una contraseña"""
+    guesses: float
+    entropy_bits: float
+    strength: PasswordStrength
+    matches: Tuple[Match, ...]
+
+class WordIndex:
+    """
+    Índice de palabras ordenado sobre un búfer (bytes o mmap).
+
+    Formato: INDEX_MAGIC, número de palabras (uint32), tabla de cubetas por
+    los tres primeros caracteres (_BUCKETS+1 uint32 con desplazamientos) y las
+    líneas "\\npalabra\\trango" ordenadas por palabra. Buscar una palabra es
+    un mmap.find dentro de su cubeta; como el orden es lexicográfico, la
+    primera línea con un prefijo dado es la palabra exacta si existe.
+
+    Atributos:
+        count (int): Número de palabras indexadas
+    """
+
+    _cache: Dict[str, "WordIndex"] = {}
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap]):
+        """
+        Abre un índice sobre un búfer ya cargado.
+
+        Args:
+            buffer (Union[bytes, mmap.mmap]): Contenido completo del índice
+
+        Raises:
+            ValueError: Si el búfer no es un índice válido
+        """
+        if buffer[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+            raise ValueError("El archivo no es un índice de palabras válido")
+        self._buffer = buffer
+        self.count = int.from_bytes(buffer[len(INDEX_MAGIC):_HEADER_SIZE], "little")
+        table_end = _HEADER_SIZE + (_BUCKETS + 1) * 4
+        buckets = memoryview(buffer)[_HEADER_SIZE:table_end].cast("I")
+        if sys.byteorder == "big":
+            swapped = array("I", buckets)
+            swapped.byteswap()
+            buckets = memoryview(swapped)
+        self._buckets = buckets
+
+    @classmethod
+    def open(cls, path: str) -> "WordIndex":
+        """
+        Abre un índice en disco con mmap, una sola vez por proceso.
+
+        Args:
+            path (str): Ruta del índice generado con build_word_index
+
+        Returns:
+            WordIndex: Índice compartido
+        """
+        path = os.path.abspath(path)
+        index = cls._cache.get(path)
+        if index is None:
+            with open(path, "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            index = cls._cache[path] = cls(buffer)
+        return index
+
+    @classmethod
+    def from_words(cls, words: Iterable[str]) -> "WordIndex":
+        """
+        Construye un índice en memoria a partir de palabras ordenadas por rango.
+
+        Args:
+            words (Iterable[str]): Palabras, de la más a la menos frecuente
+
+        Returns:
+            WordIndex: Índice en memoria
+        """
+        return cls(_encode_index(words))
+
+    def lookup(self, word: bytes) -> int:
+        """
+        Busca una palabra exacta.
+
+        Args:
+            word (bytes): Palabra en minúsculas ASCII
+
+        Returns:
+            int: Rango de la palabra (1 = más frecuente) o 0 si no existe
+        """
+        if len(word) < MIN_WORD_LENGTH:
+            return 0
+        return self._probe(word)[1]
+
+    def _probe(self, prefix: bytes, low: int = 0) -> Tuple[int, int]:
+        """
+        Busca un prefijo dentro de su cubeta.
+
+        Args:
+            prefix (bytes): Prefijo de al menos MIN_WORD_LENGTH bytes ASCII
+            low (int): Posición desde la que buscar (resultado de un prefijo
+                más corto), para no volver a recorrer la cubeta
+
+        Returns:
+            Tuple[int, int]: (-1, 0) si ninguna palabra empieza por el prefijo;
+            si no, la posición de la primera línea con ese prefijo y el rango de
+            la palabra si el prefijo es una palabra exacta (0 si no lo es)
+        """
+        if max(prefix[:3]) >= 128:
+            return -1, 0
+        key = _bucket_key(prefix)
+        start, end = self._buckets[key], self._buckets[key + 1]
+        buffer = self._buffer
+        pos = buffer.find(b"\n" + prefix, max(start - 1, low), end)
+        if pos < 0:
+            return -1, 0
+        after = pos + 1 + len(prefix)
+        if buffer[after:after + 1] != b"\t":
+            return pos, 0
+        return pos, int(buffer[after + 1:buffer.find(b"\n", after, end + 1)], 16)
+
+    def find_words(self, text: bytes, first_ends: Optional[List[int]] = None) -> List[Tuple[int, int, int]]:
+        """
+        Encuentra todas las palabras del índice contenidas en text.
+
+        Para cada inicio se prueban prefijos cada vez más largos y se corta en
+        cuanto ninguna palabra empieza por el prefijo; cada búsqueda continúa
+        desde la posición de la anterior dentro de la cubeta.
+
+        Args:
+            text (bytes): Contraseña normalizada (solo ASCII)
+            first_ends (Optional[List[int]]): Para cada inicio, el primer fin a
+                reportar; los prefijos más cortos solo se usan para podar
+
+        Returns:
+            List[Tuple[int, int, int]]: Tripletas (inicio, fin, rango)
+        """
+        found = []
+        length = len(text)
+        buffer = self._buffer
+        buckets = self._buckets
+        codes = text.translate(_CODES_TABLE)
+        for start in range(length - MIN_WORD_LENGTH + 1):
+            key = (codes[start] * _RADIX + codes[start + 1]) * _RADIX + codes[start + 2]
+            low, high = buckets[key], buckets[key + 1]
+            if low == high:
+                continue
+            low -= 1
+            report_from = first_ends[start] if first_ends else 0
+            for end in range(start + MIN_WORD_LENGTH, length + 1):
+                needle = b"\n" + text[start:end]
+                low = buffer.find(needle, low, high)
+                if low < 0:
+                    break
+                after = low + len(needle)
+                if end >= report_from and buffer[after:after + 1] == b"\t":
+                    found.append((start, end, int(buffer[after + 1:buffer.find(b"\n", after, high + 1)], 16)))
+        return found
+
+def _encode_index(words: Iterable[str]) -> bytes:
+    """Serializa las palabras en el formato de WordIndex"""
+    ranks: Dict[bytes, int] = {}
+    for word in words:
+        try:
+            encoded = word.strip().lower().encode("ascii")
+        except UnicodeEncodeError:
+            continue
+        if (len(encoded) >= MIN_WORD_LENGTH and encoded not in ranks
+                and b"\n" not in encoded and b"\t" not in encoded
+                and max(encoded) < 128):
+            ranks[encoded] = len(ranks) + 1
+
+    header_size = _HEADER_SIZE + (_BUCKETS + 1) * 4
+    buckets = array("I", [0]) * (_BUCKETS + 1)
+    lines = [b"\n"]
+    offset = header_size + 1
+    previous_key = -1
+    for word in sorted(ranks):
+        key = _bucket_key(word)
+        for k in range(previous_key + 1, key + 1):
+            buckets[k] = offset
+        previous_key = key
+        line = word + b"\t" + format(ranks[word], "x").encode("ascii") + b"\n"
+        lines.append(line)
+        offset += len(line)
+    for k in range(previous_key + 1, _BUCKETS + 1):
+        buckets[k] = offset
+
+    if sys.byteorder == "big":
+        buckets.byteswap()
+    return (INDEX_MAGIC + len(ranks).to_bytes(4, "little") + buckets.tobytes()
+            + b"".join(lines))
+
+def build_word_index(wordlist_path: str, index_path: str) -> int:
+    """
+    Convierte una lista de palabras (una por línea, de más a menos frecuente)
+    en un índice binario para WordIndex.open.
+
+    Args:
+        wordlist_path (str): Archivo de texto de entrada
+        index_path (str): Archivo de índice de salida
+
+    Returns:
+        int: Número de palabras indexadas
+    """
+    with open(wordlist_path, "r", encoding="utf-8", errors="ignore") as f:
+        data = _encode_index(f)
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, index_path)
+    return int.from_bytes(data[len(INDEX_MAGIC):_HEADER_SIZE], "little")
+
+def _keyboard_graph() -> Dict[str, frozenset]:
+    """Construye el grafo de adyacencia de un teclado QWERTY"""
+    rows = ("`1234567890-=", "qwertyuiop[]\\", "asdfghjkl;'", "zxcvbnm,./")
+    shifted = ("~!@#$%^&*()_+", "QWERTYUIOP{}|", "ASDFGHJKL:\"", "ZXCVBNM<>?")
+    positions: Dict[Tuple[int, int], Tuple[str, str]] = {}
+    for r, (plain, upper) in enumerate(zip(rows, shifted)):
+        for c, (a, b) in enumerate(zip(plain, upper)):
+            positions[(r, c)] = (a, b)
+    graph: Dict[str, set] = {}
+    for (r, c), keys in positions.items():
+        neighbours = set()
+        for dr, dc in ((0, -1), (0, 1), (-1, 0), (-1, 1), (1, 0), (1, -1)):
+            neighbours.update(positions.get((r + dr, c + dc), ()))
+        for key in keys:
+            graph[key] = neighbours
+    return {key: frozenset(neighbours) for key, neighbours in graph.items()}
+
+_KEYBOARD = _keyboard_graph()
+_KEYBOARD_DEGREE = sum(len(n) for n in _KEYBOARD.values()) / len(_KEYBOARD)
+_LEET = str.maketrans("4@3109$5!7+", "aaeiogssitt")
+_REPEAT_BLOCK = re.compile(r"(.{2,}?)\1+")
+_BRUTEFORCE_CLASSES = tuple((frozenset(alphabet), len(alphabet)) for alphabet in (
+    string.ascii_lowercase, string.ascii_uppercase, string.digits, string.punctuation))
+
+def _char_cardinality(char: str) -> int:
+    """Tamaño de la clase de un carácter"""
+    if char in string.ascii_lowercase or char in string.ascii_uppercase:
+        return 26
+    if char in string.digits:
+        return 10
+    if char in string.punctuation:
+        return 33
+    return 100
+
+def _case_variations(word: str) -> float:
+    """Factor de intentos por el uso de mayúsculas en una palabra"""
+    upper = sum(1 for c in word if c.isupper())
+    lower = sum(1 for c in word if c.islower())
+    if upper == 0:
+        return 1.0
+    if lower == 0 or (upper == 1 and word[:1].isupper()) or (upper == 1 and word[-1:].isupper()):
+        return 2.0
+    return float(sum(math.comb(upper + lower, i) for i in range(1, min(upper, lower) + 1)))
+
+class PatternEstimator:
+    """
+    Estimador de intentos y entropía con detección de patrones.
+
+    Implementa:
+    - Palabras de diccionario (con mayúsculas y sustituciones l33t)
+    - Recorridos de teclado QWERTY
+    - Repeticiones de caracteres y de bloques
+    - Secuencias ascendentes y descendentes
+    - Búsqueda de la descomposición con menos intentos (programación dinámica)
+
+    Atributos:
+        index (WordIndex): Índice de palabras usado para el diccionario
+    """
+
+    def __init__(self, index: Optional[WordIndex] = None):
+        """
+        Inicializa el estimador.
+
+        Args:
+            index (Optional[WordIndex]): Índice de palabras; por defecto la
+                lista incorporada COMMON_WORDS
+        """
+        self.index = index or _default_index()
+
+    def estimate(self, password: str) -> Estimate:
+        """
+        Estima los intentos necesarios para adivinar la contraseña.
+
+        Args:
+            password (str): Contraseña a evaluar
+
+        Returns:
+            Estimate: Intentos, bits de entropía, nivel y patrones detectados
+        """
+        length = len(password)
+        matches = (self._dictionary_matches(password) + self._keyboard_matches(password)
+                   + self._repeat_matches(password) + self._sequence_matches(password))
+
+        by_end: Dict[int, List[Match]] = {}
+        for match in matches:
+            by_end.setdefault(match.end, []).append(match)
+
+        # Fuerza bruta: cada carácter sin patrón cuesta el tamaño de la unión
+        # de las clases presentes en la contraseña
+        chars = set(password)
+        bruteforce = sum(size for alphabet, size in _BRUTEFORCE_CLASSES if not chars.isdisjoint(alphabet))
+        if any(_char_cardinality(char) == 100 for char in chars):
+            bruteforce += 100
+
+        best = [1.0] * (length + 1)
+        chosen: List[Optional[Match]] = [None] * (length + 1)
+        for end in range(1, length + 1):
+            best[end] = best[end - 1] * bruteforce
+            for match in by_end.get(end, ()):
+                guesses = best[match.start] * match.guesses
+                if guesses < best[end]:
+                    best[end] = guesses
+                    chosen[end] = match
+
+        used = []
+        end = length
+        while end > 0:
+            match = chosen[end]
+            if match is None:
+                end -= 1
+            else:
+                used.append(match)
+                end = match.start
+
+        guesses = best[length]
+        bits = math.log2(guesses) if guesses > 1 else 0.0
+        return Estimate(guesses, bits, strength_for_bits(bits), tuple(reversed(used)))
+
+    def _dictionary_matches(self, password: str) -> List[Match]:
+        """Detecta palabras del índice, también con sustituciones l33t"""
+        matches = []
+        lowered = password.lower()
+        unleeted = lowered.translate(_LEET)
+        if not lowered.isascii():
+            return matches
+
+        for start, end, rank in self.index.find_words(lowered.encode("ascii")):
+            guesses = rank * _case_variations(password[start:end])
+            matches.append(Match("diccionario", start, end, guesses))
+
+        if unleeted != lowered:
+            # Solo interesan las palabras que incluyen alguna sustitución: para
+            # cada inicio, el primer fin posible es después de la siguiente
+            substituted = [a != b for a, b in zip(lowered, unleeted)]
+            first_ends = [0] * len(lowered)
+            next_end = len(lowered) + 1
+            for i in range(len(lowered) - 1, -1, -1):
+                if substituted[i]:
+                    next_end = i + 1
+                first_ends[i] = next_end
+            for start, end, rank in self.index.find_words(unleeted.encode("ascii"), first_ends):
+                guesses = (rank * _case_variations(password[start:end])
+                           * 2 ** sum(substituted[start:end]))
+                matches.append(Match("diccionario", start, end, guesses))
+        return matches
+
+    def _keyboard_matches(self, password: str) -> List[Match]:
+        """Detecta recorridos de al menos 4 teclas adyacentes"""
+        matches = []
+        start = 0
+        length = len(password)
+        while start < length - 1:
+            end = start + 1
+            while end < length and password[end] in _KEYBOARD.get(password[end - 1], ()):
+                end += 1
+            if end - start >= 4:
+                shifted = any(c in '~!@#$%^&*()_+{}|:"<>?' or c.isupper() for c in password[start:end])
+                guesses = len(_KEYBOARD) / 2 * _KEYBOARD_DEGREE ** (end - start - 1)
+                matches.append(Match("teclado", start, end, guesses * (2 if shifted else 1)))
+            start = end
+        return matches
+
+    def _repeat_matches(self, password: str) -> List[Match]:
+        """Detecta caracteres repetidos y bloques repetidos"""
+        matches = []
+        start = 0
+        length = len(password)
+        while start < length:
+            end = start + 1
+            while end < length and password[end] == password[start]:
+                end += 1
+            if end - start >= 3:
+                matches.append(Match("repeticion", start, end,
+                                     _char_cardinality(password[start]) * (end - start)))
+            start = end
+        for found in _REPEAT_BLOCK.finditer(password):
+            block = found.group(1)
+            base = 1.0
+            for char in block:
+                base *= _char_cardinality(char)
+            count = (found.end() - found.start()) // len(block)
+            matches.append(Match("repeticion", found.start(), found.end(), base * count))
+        return matches
+
+    def _sequence_matches(self, password: str) -> List[Match]:
+        """Detecta secuencias de al menos 3 caracteres (abc, 4321)"""
+        matches = []
+        start = 0
+        length = len(password)
+        while start < length - 2:
+            delta = ord(password[start + 1]) - ord(password[start])
+            end = start + 1
+            if delta in (-1, 1):
+                while (end < length and ord(password[end]) - ord(password[end - 1]) == delta
+                       and password[end].isalnum()):
+                    end += 1
+            if end - start >= 3 and password[start].isalnum():
+                base = 10 if password[start].isdigit() else 26
+                matches.append(Match("secuencia", start, end,
+                                     base * (end - start) * (2 if delta < 0 else 1)))
+                start = end
+            else:
+                start += 1
+        return matches
+
+def strength_for_bits(bits: float) -> PasswordStrength:
+    """
+    Traduce bits de entropía al enum PasswordStrength.
+
+    Args:
+        bits (float): Entropía estimada
+
+    Returns:
+        PasswordStrength: Nivel correspondiente según STRENGTH_THRESHOLDS
+    """
+    for limit, strength in STRENGTH_THRESHOLDS:
+        if bits < limit:
+            return strength
+    return PasswordStrength.VERY_STRONG
+
+_builtin_index: Optional[WordIndex] = None
+
+def _default_index() -> WordIndex:
+    """Índice en memoria de COMMON_WORDS, creado en el primer uso"""
+    global _builtin_index
+    if _builtin_index is None:
+        _builtin_index = WordIndex.from_words(COMMON_WORDS)
+    return _builtin_index
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Función principal de la línea de comandos"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m pattern_estimator",
+                                     description="Estimación de fortaleza por patrones")
+    commands = parser.add_subparsers(dest="comando", required=True)
+    build = commands.add_parser("construir", help="convertir una lista de palabras en índice")
+    build.add_argument("lista")
+    build.add_argument("indice")
+    evaluate = commands.add_parser("evaluar", help="estimar la fortaleza de una contraseña")
+    evaluate.add_argument("password")
+    evaluate.add_argument("--indice", help="índice generado con 'construir'")
+    args = parser.parse_args(argv)
+
+    if args.comando == "construir":
+        count = build_word_index(args.lista, args.indice)
+        print(f"Índice creado con {count} palabras: {args.indice}")
+        return 0
+
+    index = WordIndex.open(args.indice) if args.indice else None
+    result = PatternEstimator(index).estimate(args.password)
+    print(f"Intentos estimados: {result.guesses:.3g}")
+    print(f"Entropía: {result.entropy_bits:.1f} bits")
+    print(f"Fortaleza: {result.strength.value}")
+    for match in result.matches:
+        print(f"  {match.pattern}: '{args.password[match.start:match.end]}' ({match.guesses:.3g} intentos)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+"""
+Módulo de logging en segundo plano.
+Envía los registros a una cola con QueueHandler y deja el formateo y la
+escritura a un QueueListener en su propio hilo, de modo que el hilo que
+genera contraseñas solo crea el registro y lo encola. Incluye filtros de
+muestreo y de límite de frecuencia para los mensajes informativos de alto
+volumen.
+
+Autor: Nelson Espinosa
+Versión: 1.2.0
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Tipos de argumento que no pueden cambiar entre el encolado y el formateo
+_IMMUTABLE_ARGS = frozenset((str, int, float, bool, bytes, type(None)))
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler que no formatea en el hilo que registra.
+
+    QueueHandler.prepare combina el mensaje con sus argumentos antes de
+    encolarlo; como la cola es del mismo proceso, aquí el registro se encola
+    tal cual y el mensaje se compone en el hilo del QueueListener. Solo se
+    compone al encolar si hay una excepción (el traceback se renderiza antes
+    de que el llamador la descarte) o algún argumento mutable, que podría
+    cambiar antes de que el QueueListener lo formatee.
+    """
+
+    _formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._formatter.formatException(record.exc_info)
+            record.exc_info = None
+            self._freeze(record)
+        elif record.args:
+            args = record.args.values() if isinstance(record.args, dict) else record.args
+            if any(type(arg) not in _IMMUTABLE_ARGS for arg in args):
+                self._freeze(record)
+        return record
+
+    @staticmethod
+    def _freeze(record: logging.LogRecord) -> None:
+        """Compone el mensaje con sus argumentos actuales"""
+        record.msg = record.getMessage()
+        record.args = None
+
+class _VolumeFilter(logging.Filter):
+    """
+    Base de los filtros de volumen.
+
+    allow(key) decide sin crear el registro, para que los llamadores de alto
+    volumen puedan consultarlo antes de llamar al logger; filter() lo aplica
+    a registros ya creados, agrupados por logger y mensaje. Solo afectan a
+    los registros de nivel 'level' o inferior; avisos y errores pasan siempre.
+    """
+
+    def __init__(self, level: int = logging.INFO):
+        super().__init__()
+        self.level = level
+        self._lock = threading.Lock()
+
+    def allow(self, key: object) -> int:
+        """
+        Decide si un mensaje se registra.
+
+        Returns:
+            int: -1 si se descarta; si no, cuántos mensajes iguales se
+            omitieron desde el último registrado
+        """
+        raise NotImplementedError
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.level:
+            return True
+        omitted = self.allow((record.name, record.msg))
+        if omitted < 0:
+            return False
+        if omitted and isinstance(record.msg, str) and not isinstance(record.args, dict):
+            if not record.args:
+                record.msg = record.msg.replace("%", "%%")
+            record.msg += " (%d mensajes similares omitidos)"
+            record.args = tuple(record.args or ()) + (omitted,)
+        return True
+
+class SamplingFilter(_VolumeFilter):
+    """Deja pasar uno de cada 'every' mensajes iguales"""
+
+    def __init__(self, every: int, level: int = logging.INFO):
+        super().__init__(level)
+        self.every = every
+        self._seen: Dict[object, int] = {}
+
+    def allow(self, key: object) -> int:
+        with self._lock:
+            seen = self._seen.get(key, 0)
+            self._seen[key] = seen + 1
+        if seen % self.every:
+            return -1
+        return self.every - 1 if seen else 0
+
+class RateLimitFilter(_VolumeFilter):
+    """Limita cada mensaje a 'rate' registros por segundo (cubeta de fichas)"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None, level: int = logging.INFO):
+        super().__init__(level)
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._buckets: Dict[object, List[float]] = {}
+
+    def allow(self, key: object) -> int:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(self.burst), now, 0]
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                bucket[2] += 1
+                return -1
+            bucket[0] = tokens - 1
+            omitted, bucket[2] = bucket[2], 0
+        return int(omitted)
+
+def volume_filter(sample_every: int = 1,
+                  max_per_second: Optional[float] = None) -> Optional[_VolumeFilter]:
+    """
+    Crea el filtro de volumen indicado por la configuración.
+
+    Args:
+        sample_every (int): Registrar uno de cada N mensajes
+        max_per_second (Optional[float]): Máximo de mensajes iguales por segundo
+
+    Returns:
+        Optional[_VolumeFilter]: Filtro, o None si no se pidió ninguno
+    """
+    if max_per_second is not None:
+        return RateLimitFilter(max_per_second)
+    if sample_every > 1:
+        return SamplingFilter(sample_every)
+    return None
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+def _direct_handlers_after_fork() -> None:
+    """
+    En el proceso hijo no existe el hilo del listener: se sustituye la cola
+    por los manejadores reales para no acumular registros sin consumir.
+    """
+    global _listener, _queue_handler
+    if _listener is None or _queue_handler is None:
+        return
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    for handler in _listener.handlers:
+        root.addHandler(handler)
+    _listener = _queue_handler = None
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_direct_handlers_after_fork)
+
+def configure(level: int = logging.INFO, log_file: Optional[str] = None,
+              queued: bool = True) -> Optional[QueueListener]:
+    """
+    Configura el logger raíz con el formato detallado del proyecto.
+
+    No hace nada si el logger raíz ya tiene manejadores (igual que
+    logging.basicConfig).
+
+    Args:
+        level (int): Nivel mínimo de los mensajes
+        log_file (Optional[str]): Archivo adicional de log
+        queued (bool): Formatear y escribir en un hilo de fondo
+
+    Returns:
+        Optional[QueueListener]: Listener en marcha, o None si no se usa cola
+    """
+    global _listener, _queue_handler
+    root = logging.getLogger()
+    if root.handlers:
+        return _listener
+
+    formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
+    handlers: List[logging.Handler] = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    root.setLevel(level)
+    if not queued:
+        for handler in handlers:
+            root.addHandler(handler)
+        return None
+
+    _queue_handler = DeferredQueueHandler(queue.SimpleQueue())
+    _listener = QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    root.addHandler(_queue_handler)
+    atexit.register(shutdown)
+    return _listener
+
+def shutdown() -> None:
+    """Vacía la cola y detiene el listener"""
+    global _listener, _queue_handler
+    if _listener is not None:
+        _listener.stop()
+        logging.getLogger().removeHandler(_queue_handler)
+        for handler in _listener.handlers:
+            handler.close()
+    _listener = _queue_handler = None
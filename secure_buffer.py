@@ -0,0 +1,152 @@
+"""
+Módulo de búferes mutables para contraseñas.
+Un str de Python es inmutable y permanece en memoria hasta que lo libera el
+recolector; SecretBuffer guarda la contraseña en un bytearray que se
+sobrescribe con ceros de forma explícita con wipe(). BufferPool reutiliza
+búferes ya reservados y los borra al devolverlos.
+
+Autor: Nelson Espinosa
+Versión: 1.2.0
+"""
+
+import threading
+from typing import BinaryIO, Dict, List, Optional, Union
+
+class SecretBuffer:
+    """
+    Búfer de bytes que se borra explícitamente.
+
+    Se usa como gestor de contexto para garantizar el borrado:
+
+        with SecretBuffer(16) as secret:
+            generator.generate_into(secret.view, 16)
+            enviar(secret.view)
+
+    Atributos:
+        data (bytearray): Contenido del búfer
+        view (memoryview): Vista sin copia sobre data
+    """
+
+    def __init__(self, size: int):
+        """
+        Args:
+            size (int): Tamaño en bytes
+
+        Raises:
+            ValueError: Si size es negativo
+        """
+        if size < 0:
+            raise ValueError("size no puede ser negativo")
+        self.data = bytearray(size)
+        self.view = memoryview(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def is_wiped(self) -> bool:
+        """Indica si todos los bytes valen cero"""
+        return not any(self.data)
+
+    def wipe(self) -> None:
+        """Sobrescribe todo el búfer con ceros"""
+        wipe(self.data)
+
+    def __enter__(self) -> "SecretBuffer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.wipe()
+
+    def __repr__(self) -> str:
+        return f"SecretBuffer({len(self.data)})"  # nunca muestra el contenido
+
+def wipe(buffer: Union[bytearray, memoryview]) -> None:
+    """
+    Sobrescribe un búfer escribible con ceros, sin cambiar su tamaño.
+
+    Args:
+        buffer (Union[bytearray, memoryview]): Búfer a borrar
+    """
+    view = memoryview(buffer).cast("B")
+    view[:] = bytes(len(view))
+
+def write_all(output: BinaryIO, data: Union[bytes, bytearray, memoryview]) -> None:
+    """
+    Escribe todos los bytes de data, repitiendo output.write tras escrituras
+    parciales (un archivo sin búfer puede aceptar solo una parte).
+
+    Args:
+        output (BinaryIO): Archivo binario, con o sin búfer
+        data (Union[bytes, bytearray, memoryview]): Bytes a escribir, sin copiarlos
+
+    Raises:
+        BlockingIOError: Si un archivo no bloqueante no acepta ningún byte
+        OSError: Si write() devuelve 0, para no repetir la escritura sin fin
+    """
+    view = memoryview(data).cast("B")
+    while view:
+        count = output.write(view)
+        if count is None:
+            raise BlockingIOError("El archivo no bloqueante no admitió la escritura")
+        if count == 0:
+            raise OSError("El archivo no admitió ningún byte (escritura de 0 bytes)")
+        view = view[count:]
+
+class BufferPool:
+    """
+    Reserva de búferes reutilizables por tamaño.
+
+    release() borra el búfer antes de guardarlo, así que un búfer de la
+    reserva nunca conserva una contraseña anterior.
+
+    Atributos:
+        max_per_size (int): Búferes guardados como máximo para cada tamaño
+    """
+
+    def __init__(self, max_per_size: int = 4):
+        self.max_per_size = max_per_size
+        self._free: Dict[int, List[bytearray]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, size: int) -> bytearray:
+        """
+        Obtiene un búfer borrado de size bytes.
+
+        Args:
+            size (int): Tamaño en bytes
+
+        Returns:
+            bytearray: Búfer reutilizado o nuevo
+        """
+        with self._lock:
+            free = self._free.get(size)
+            if free:
+                return free.pop()
+        return bytearray(size)
+
+    def release(self, buffer: bytearray) -> None:
+        """
+        Borra un búfer y lo devuelve a la reserva.
+
+        Args:
+            buffer (bytearray): Búfer obtenido con acquire
+        """
+        wipe(buffer)
+        with self._lock:
+            free = self._free.setdefault(len(buffer), [])
+            if len(free) < self.max_per_size:
+                free.append(buffer)
+
+_default_pool: Optional[BufferPool] = None
+
+def default_buffer_pool() -> BufferPool:
+    """
+    Obtiene la reserva de búferes compartida del proceso.
+
+    Returns:
+        BufferPool: Reserva por defecto
+    """
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = BufferPool()
+    return _default_pool
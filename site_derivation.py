@@ -0,0 +1,404 @@
+"""
+Módulo de derivación determinista de contraseñas por sitio.
+Estira un secreto maestro una sola vez con hashlib.scrypt o
+hashlib.pbkdf2_hmac y deriva de la clave resultante la contraseña de cada
+sitio con HMAC-SHA256, de modo que la misma combinación de secreto, usuario,
+sitio y parámetros produce siempre la misma contraseña.
+
+La clave estirada se guarda en memoria durante la sesión (MasterKey) y se
+borra con wipe(); cada sitio cuesta entonces un par de HMAC en lugar de un
+estiramiento completo. Las contraseñas se construyen con la misma
+generación constructiva uniforme de PasswordGenerator, alimentada por un
+flujo de bytes derivado del sitio.
+
+Uso:
+    python -m site_derivation calibrar [--objetivo 0.5] [--algoritmo scrypt]
+    python -m site_derivation derivar ejemplo.com correo.com [--archivo sitios.txt]
+
+Autor: Nelson Espinosa
+Versión: 1.2.0
+"""
+
+import hashlib
+import hmac
+import logging
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from password_generator import PasswordGenerator, PasswordStrength
+
+logger = logging.getLogger(__name__)
+
+ALGORITHMS = ("scrypt", "pbkdf2")
+KEY_SIZE = 32
+SALT_PREFIX = b"NEIR-derivacion-v1\x00"
+
+class DerivationParams(NamedTuple):
+    """
+    Factor de trabajo del estiramiento del secreto maestro.
+
+    Atributos:
+        algorithm (str): "scrypt" o "pbkdf2"
+        iterations (int): Iteraciones de PBKDF2-HMAC-SHA256
+        n (int): Coste de CPU y memoria de scrypt (potencia de 2)
+        r (int): Tamaño de bloque de scrypt
+        p (int): Paralelismo de scrypt
+    """
+    algorithm: str = "scrypt"
+    iterations: int = 600_000
+    n: int = 2 ** 15
+    r: int = 8
+    p: int = 1
+
+    def validate(self) -> None:
+        """
+        Comprueba que los parámetros sean utilizables.
+
+        Raises:
+            ValueError: Si el algoritmo o el factor de trabajo no son válidos
+        """
+        if self.algorithm not in ALGORITHMS:
+            raise ValueError(f"Algoritmo desconocido: {self.algorithm}")
+        if self.algorithm == "pbkdf2" and self.iterations < 1:
+            raise ValueError("Las iteraciones de PBKDF2 deben ser mayores que 0")
+        if self.algorithm == "scrypt" and (self.n < 2 or self.n & (self.n - 1)
+                                           or self.r < 1 or self.p < 1):
+            raise ValueError("scrypt requiere n potencia de 2 y r, p mayores que 0")
+
+    def stretch(self, secret: bytes, salt: bytes) -> bytes:
+        """Estira el secreto con el algoritmo y el factor de trabajo indicados"""
+        if self.algorithm == "pbkdf2":
+            return hashlib.pbkdf2_hmac("sha256", secret, salt, self.iterations, KEY_SIZE)
+        maxmem = 128 * self.r * (self.n + self.p + 2) + 1024 * 1024
+        return hashlib.scrypt(secret, salt=salt, n=self.n, r=self.r, p=self.p,
+                              maxmem=maxmem, dklen=KEY_SIZE)
+
+class _DerivedStream:
+    """Flujo determinista de bytes (HMAC-SHA256 en modo contador) con randbelow"""
+
+    def __init__(self, seed: bytes):
+        self._mac = hmac.new(seed, digestmod=hashlib.sha256)
+        self._block = 0
+        self._data = b""
+        self._pos = 0
+
+    def read(self, count: int) -> bytes:
+        """Devuelve los siguientes count bytes del flujo"""
+        while len(self._data) - self._pos < count:
+            mac = self._mac.copy()
+            mac.update(self._block.to_bytes(8, "big"))
+            self._block += 1
+            self._data = self._data[self._pos:] + mac.digest()
+            self._pos = 0
+        chunk = self._data[self._pos:self._pos + count]
+        self._pos += count
+        return chunk
+
+    def randbelow(self, n: int) -> int:
+        """Entero uniforme en [0, n) por rechazo, como EntropyPool.randbelow"""
+        bits = n.bit_length()
+        nbytes = (bits + 7) // 8
+        shift = nbytes * 8 - bits
+        while True:
+            value = int.from_bytes(self.read(nbytes), "big") >> shift
+            if value < n:
+                return value
+
+class MasterKey:
+    """
+    Clave maestra estirada, mantenida en memoria durante una sesión.
+
+    La clave se guarda en un bytearray que wipe() sobrescribe con ceros. Python
+    no permite borrar las copias inmutables que crean hashlib y hmac, así que
+    wipe() también suelta todas las referencias a ellas. Los objetos MasterKey
+    no se serializan, para que la clave no viaje por accidente a otro proceso.
+
+    Atributos:
+        params (DerivationParams): Parámetros con los que se estiró
+    """
+
+    def __init__(self, key: bytes, params: DerivationParams):
+        """
+        Args:
+            key (bytes): Clave estirada de KEY_SIZE bytes
+            params (DerivationParams): Parámetros con los que se obtuvo
+        """
+        self.params = params
+        self._key = bytearray(key)
+        self._mac: Optional["hmac.HMAC"] = hmac.new(key, digestmod=hashlib.sha256)
+
+    @classmethod
+    def stretch(cls, secret: str, params: DerivationParams = DerivationParams(),
+                user: str = "") -> "MasterKey":
+        """
+        Estira un secreto maestro.
+
+        Args:
+            secret (str): Secreto maestro
+            params (DerivationParams): Factor de trabajo
+            user (str): Identificador del usuario, usado como sal; con el mismo
+                secreto, usuarios distintos obtienen claves distintas
+
+        Returns:
+            MasterKey: Clave lista para derivar contraseñas
+
+        Raises:
+            ValueError: Si el secreto está vacío o los parámetros no son válidos
+        """
+        if not secret:
+            raise ValueError("El secreto maestro no puede estar vacío")
+        params.validate()
+        start = time.perf_counter()
+        key = params.stretch(secret.encode("utf-8"), SALT_PREFIX + user.encode("utf-8"))
+        logger.info("Clave maestra estirada con %s en %.0f ms", params.algorithm,
+                    (time.perf_counter() - start) * 1000)
+        return cls(key, params)
+
+    @property
+    def wiped(self) -> bool:
+        """Indica si la clave ya se borró"""
+        return self._mac is None
+
+    def seed(self, info: bytes) -> bytes:
+        """
+        Deriva la semilla de un contexto (sitio, contador, formato).
+
+        Raises:
+            ValueError: Si la clave ya se borró
+        """
+        if self._mac is None:
+            raise ValueError("La clave maestra ya se borró")
+        mac = self._mac.copy()
+        mac.update(info)
+        return mac.digest()
+
+    def key_bytes(self) -> bytes:
+        """Copia de la clave, para entregarla explícitamente a otro proceso"""
+        if self._mac is None:
+            raise ValueError("La clave maestra ya se borró")
+        return bytes(self._key)
+
+    def wipe(self) -> None:
+        """Sobrescribe la clave con ceros y suelta el estado HMAC"""
+        self._key[:] = bytes(len(self._key))
+        self._mac = None
+
+    def __enter__(self) -> "MasterKey":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.wipe()
+
+    def __reduce__(self):
+        raise TypeError("MasterKey no se serializa; usa key_bytes() de forma explícita")
+
+    def __repr__(self) -> str:
+        state = "borrada" if self.wiped else "activa"
+        return f"MasterKey({self.params.algorithm}, {state})"
+
+def _site_info(site: str, length: int, flags: Tuple[bool, bool, bool, bool],
+               counter: int) -> bytes:
+    """Contexto de derivación de un sitio: nombre normalizado y formato pedido"""
+    mask = sum(1 << i for i, use in enumerate(flags) if use)
+    return f"{site.strip().lower()}\x00{counter}\x00{length}\x00{mask}".encode("utf-8")
+
+def derive_password(master_key: MasterKey, site: str, length: int = 16,
+                    flags: Tuple[bool, bool, bool, bool] = (True, True, True, True),
+                    counter: int = 1,
+                    generator: Optional[PasswordGenerator] = None) -> Tuple[str, PasswordStrength]:
+    """
+    Deriva la contraseña de un sitio.
+
+    Args:
+        master_key (MasterKey): Clave maestra de la sesión
+        site (str): Nombre del sitio (se ignoran mayúsculas y espacios extremos)
+        length (int): Longitud de la contraseña (8-129)
+        flags (Tuple[bool, bool, bool, bool]): Minúsculas, mayúsculas, números
+            y especiales
+        counter (int): Versión de la contraseña; se incrementa para rotarla
+        generator (Optional[PasswordGenerator]): Generador cuyos alfabetos se
+            usan; cambiar los alfabetos cambia las contraseñas derivadas
+
+    Returns:
+        Tuple[str, PasswordStrength]: Contraseña y su fortaleza
+
+    Raises:
+        ValueError: Si los parámetros no son válidos o la clave ya se borró
+    """
+    generator = generator or _default_generator()
+    if not 8 <= length <= 129 or counter < 1:
+        raise ValueError(f"Parámetros inválidos: longitud={length}, contador={counter}")
+    stream = _DerivedStream(master_key.seed(_site_info(site, length, flags, counter)))
+    return generator.construct_password(length, stream.randbelow, *flags)
+
+_generator: Optional[PasswordGenerator] = None
+
+def _default_generator() -> PasswordGenerator:
+    """Generador con los alfabetos por defecto, creado en el primer uso"""
+    global _generator
+    if _generator is None:
+        _generator = PasswordGenerator()
+    return _generator
+
+_worker_key: Optional[MasterKey] = None
+
+def _init_worker(key: bytes, params: DerivationParams) -> None:
+    """Recibe la clave maestra en cada proceso trabajador"""
+    global _worker_key
+    _worker_key = MasterKey(key, params)
+
+def _derive_chunk(sites: List[str], length: int, flags: Tuple[bool, bool, bool, bool],
+                  counter: int) -> List[Tuple[str, PasswordStrength]]:
+    """Deriva un bloque de sitios en un proceso trabajador"""
+    return [derive_password(_worker_key, site, length, flags, counter) for site in sites]
+
+def derive_many(master_key: MasterKey, sites: Iterable[str], length: int = 16,
+                flags: Tuple[bool, bool, bool, bool] = (True, True, True, True),
+                counter: int = 1, workers: Optional[int] = None,
+                chunk_size: int = 64) -> List[Tuple[str, str, PasswordStrength]]:
+    """
+    Deriva las contraseñas de muchos sitios repartiéndolos entre procesos.
+
+    Cada proceso recibe una copia de la clave estirada al arrancar (nunca el
+    secreto maestro), que desaparece con el proceso al cerrarse el pool. Con
+    un solo proceso, o con menos sitios que un bloque, se deriva en el
+    proceso actual.
+
+    Args:
+        master_key (MasterKey): Clave maestra de la sesión
+        sites (Iterable[str]): Sitios a derivar
+        length (int): Longitud de las contraseñas (8-129)
+        flags (Tuple[bool, bool, bool, bool]): Clases de caracteres
+        counter (int): Versión de las contraseñas
+        workers (Optional[int]): Número de procesos; por defecto os.cpu_count()
+        chunk_size (int): Sitios por bloque enviado a un trabajador
+
+    Returns:
+        List[Tuple[str, str, PasswordStrength]]: Sitio, contraseña y fortaleza,
+        en el orden de entrada
+
+    Raises:
+        ValueError: Si los parámetros no son válidos o la clave ya se borró
+    """
+    sites = list(sites)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(sites) <= chunk_size:
+        derived = [derive_password(master_key, site, length, flags, counter) for site in sites]
+    else:
+        # Valida los parámetros antes de arrancar los procesos
+        derive_password(master_key, sites[0], length, flags, counter)
+        chunks = [sites[i:i + chunk_size] for i in range(0, len(sites), chunk_size)]
+        key = master_key.key_bytes()
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                 initializer=_init_worker,
+                                 initargs=(key, master_key.params)) as executor:
+            futures = [executor.submit(_derive_chunk, chunk, length, flags, counter)
+                       for chunk in chunks]
+            derived = [result for future in futures for result in future.result()]
+        del key
+    return [(site, password, strength) for site, (password, strength) in zip(sites, derived)]
+
+def calibrate(target_seconds: float, algorithm: str = "scrypt",
+              max_memory: int = 256 * 1024 * 1024) -> Tuple[DerivationParams, float]:
+    """
+    Elige el factor de trabajo que tarda al menos target_seconds en esta máquina.
+
+    PBKDF2 escala linealmente: se mide un número pequeño de iteraciones y se
+    extrapola. En scrypt se duplica n hasta alcanzar el objetivo o el límite
+    de memoria (128 * r * n bytes).
+
+    Args:
+        target_seconds (float): Latencia objetivo del estiramiento
+        algorithm (str): "scrypt" o "pbkdf2"
+        max_memory (int): Memoria máxima para scrypt en bytes
+
+    Returns:
+        Tuple[DerivationParams, float]: Parámetros elegidos y su duración medida
+
+    Raises:
+        ValueError: Si el objetivo o el algoritmo no son válidos
+    """
+    if target_seconds <= 0:
+        raise ValueError("La latencia objetivo debe ser mayor que 0")
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Algoritmo desconocido: {algorithm}")
+    secret, salt = b"calibracion", SALT_PREFIX
+
+    def timed(params: DerivationParams) -> float:
+        start = time.perf_counter()
+        params.stretch(secret, salt)
+        return time.perf_counter() - start
+
+    if algorithm == "pbkdf2":
+        probe = DerivationParams("pbkdf2", iterations=20_000)
+        per_iteration = min(timed(probe) for _ in range(3)) / probe.iterations
+        iterations = max(1000, math.ceil(target_seconds / per_iteration / 1000) * 1000)
+        params = DerivationParams("pbkdf2", iterations=iterations)
+        return params, timed(params)
+
+    params = DerivationParams("scrypt", n=2 ** 10)
+    elapsed = timed(params)
+    while elapsed < target_seconds and 128 * params.r * params.n * 2 <= max_memory:
+        params = params._replace(n=params.n * 2)
+        elapsed = timed(params)
+    return params, elapsed
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Función principal de la línea de comandos"""
+    import argparse
+    import getpass
+
+    parser = argparse.ArgumentParser(prog="python -m site_derivation",
+                                     description="Contraseñas deterministas por sitio")
+    commands = parser.add_subparsers(dest="comando", required=True)
+    calibration = commands.add_parser("calibrar", help="elegir el factor de trabajo")
+    calibration.add_argument("--objetivo", type=float, default=0.5,
+                             help="latencia objetivo en segundos (por defecto: 0.5)")
+    calibration.add_argument("--algoritmo", choices=ALGORITHMS, default="scrypt")
+    derivation = commands.add_parser("derivar", help="derivar contraseñas de sitios")
+    derivation.add_argument("sitios", nargs="*")
+    derivation.add_argument("--archivo", help="archivo con un sitio por línea")
+    derivation.add_argument("--usuario", default="")
+    derivation.add_argument("-l", "--longitud", type=int, default=16)
+    derivation.add_argument("--contador", type=int, default=1)
+    derivation.add_argument("--algoritmo", choices=ALGORITHMS, default="scrypt")
+    derivation.add_argument("--iteraciones", type=int, default=DerivationParams.iterations)
+    derivation.add_argument("--n", type=int, default=DerivationParams.n)
+    derivation.add_argument("-p", "--procesos", type=int, default=0,
+                            help="procesos para lotes grandes (0: os.cpu_count())")
+    args = parser.parse_args(argv)
+
+    if args.comando == "calibrar":
+        params, elapsed = calibrate(args.objetivo, args.algoritmo)
+        work = (f"--iteraciones {params.iterations}" if params.algorithm == "pbkdf2"
+                else f"--n {params.n}")
+        print(f"{params.algorithm}: {work} ({elapsed * 1000:.0f} ms)")
+        return 0
+
+    sites = list(args.sitios)
+    if args.archivo:
+        with open(args.archivo, encoding="utf-8") as f:
+            sites.extend(line.strip() for line in f if line.strip())
+    if not sites:
+        print("Error: no se indicó ningún sitio", file=sys.stderr)
+        return 1
+
+    params = DerivationParams(args.algoritmo, iterations=args.iteraciones, n=args.n)
+    try:
+        with MasterKey.stretch(getpass.getpass("Secreto maestro: "), params,
+                               args.usuario) as master_key:
+            for site, password, strength in derive_many(master_key, sites, args.longitud,
+                                                        counter=args.contador,
+                                                        workers=args.procesos or None):
+                print(f"{site}\t{password}\t{strength.value}")
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
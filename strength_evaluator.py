@@ -0,0 +1,287 @@
+"""
+Módulo de evaluación de fortaleza de contraseñas.
+Clasifica cada carácter en una sola pasada mediante una tabla de traducción
+precalculada y resuelve el nivel de fortaleza con una tabla de decisión.
+
+Autor: Nelson Espinosa
+Versión: 1.2.0
+"""
+
+import string
+from enum import Enum
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
+class PasswordStrength(Enum):
+    """Enumeración para los niveles de fortaleza de contraseña"""
+    WEAK = "Débil"
+    MEDIUM = "Media"
+    STRONG = "Fuerte"
+    VERY_STRONG = "Muy Fuerte"
+
+LOWER, UPPER, DIGIT, SPECIAL = 1, 2, 4, 8
+
+class _ClassTable(dict):
+    """Tabla para str.translate que elimina los caracteres sin clase"""
+
+    def __missing__(self, key: int) -> None:
+        return None
+
+# _RATINGS[tramo de longitud][tipos de caracteres], con los mismos umbrales que
+# el evaluador original: longitud <= 8, <= 12 y mayor que 12.
+_RATINGS: Tuple[Tuple[PasswordStrength, ...], ...] = (
+    (PasswordStrength.WEAK, PasswordStrength.WEAK, PasswordStrength.MEDIUM,
+     PasswordStrength.MEDIUM, PasswordStrength.MEDIUM),
+    (PasswordStrength.WEAK, PasswordStrength.WEAK, PasswordStrength.MEDIUM,
+     PasswordStrength.STRONG, PasswordStrength.STRONG),
+    (PasswordStrength.WEAK, PasswordStrength.WEAK, PasswordStrength.MEDIUM,
+     PasswordStrength.STRONG, PasswordStrength.VERY_STRONG),
+)
+
+# Posiciones de los bits activos en cada máscara de clases (0-15)
+_BITS_BY_MASK: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(i for i in range(4) if mask >> i & 1) for mask in range(16))
+
+class StrengthEvaluator:
+    """
+    Evaluador de fortaleza basado en tablas.
+
+    Implementa:
+    - Clasificación de caracteres en una sola pasada (bytes.translate para
+      contraseñas ASCII, str.translate para el resto)
+    - Resolución del nivel con una tabla de decisión sin ramas
+    - Evaluación en flujo de grandes volúmenes con evaluate_many
+
+    Produce exactamente los mismos resultados que la evaluación original por
+    tipos de caracteres y tramos de longitud.
+
+    Atributos:
+        lowercase (str): Caracteres en minúscula reconocidos
+        uppercase (str): Caracteres en mayúscula reconocidos
+        digits (str): Dígitos reconocidos
+        special (str): Caracteres especiales reconocidos
+    """
+
+    def __init__(self, lowercase: str = string.ascii_lowercase,
+                 uppercase: str = string.ascii_uppercase,
+                 digits: str = string.digits,
+                 special: str = string.punctuation):
+        """
+        Inicializa el evaluador y precalcula la tabla de clases.
+
+        Args:
+            lowercase (str): Caracteres en minúscula
+            uppercase (str): Caracteres en mayúscula
+            digits (str): Dígitos
+            special (str): Caracteres especiales
+        """
+        self.lowercase = lowercase
+        self.uppercase = uppercase
+        self.digits = digits
+        self.special = special
+
+        masks: Dict[int, int] = {}
+        for bit, chars in ((LOWER, lowercase), (UPPER, uppercase),
+                           (DIGIT, digits), (SPECIAL, special)):
+            for char in chars:
+                masks[ord(char)] = masks.get(ord(char), 0) | bit
+        self._class_table = _ClassTable((code, chr(mask)) for code, mask in masks.items())
+        ascii_table = bytearray(256)
+        for code, mask in masks.items():
+            if code < 128:
+                ascii_table[code] = mask
+        self._ascii_table = bytes(ascii_table)
+        self._types_by_mask = tuple(bin(mask).count("1") for mask in range(16))
+
+    def class_mask(self, password: str) -> int:
+        """
+        Calcula la máscara de clases presentes en la contraseña.
+
+        Args:
+            password (str): Contraseña a clasificar
+
+        Returns:
+            int: Combinación de LOWER, UPPER, DIGIT y SPECIAL
+        """
+        mask = 0
+        if password.isascii():
+            for bits in set(password.encode("ascii").translate(self._ascii_table)):
+                mask |= bits
+        else:
+            for marker in set(password.translate(self._class_table)):
+                mask |= ord(marker)
+        return mask
+
+    def evaluate(self, password: str) -> PasswordStrength:
+        """
+        Evalúa la fortaleza de una contraseña.
+
+        Args:
+            password (str): Contraseña a evaluar
+
+        Returns:
+            PasswordStrength: Nivel de fortaleza de la contraseña
+        """
+        return rate(len(password), self._types_by_mask[self.class_mask(password)])
+
+    def evaluate_bytes(self, password: Union[bytes, bytearray, memoryview]) -> PasswordStrength:
+        """
+        Evalúa una contraseña ASCII guardada en un búfer, sin convertirla en str
+        ni copiarla.
+
+        Args:
+            password (Union[bytes, bytearray, memoryview]): Bytes de la contraseña
+
+        Returns:
+            PasswordStrength: Nivel de fortaleza de la contraseña
+        """
+        ascii_table = self._ascii_table
+        mask = 0
+        view = memoryview(password).cast("B")
+        for byte in view:
+            mask |= ascii_table[byte]
+        return rate(len(view), self._types_by_mask[mask])
+
+    def evaluate_many(self, passwords: Iterable[str]) -> Iterator[PasswordStrength]:
+        """
+        Evalúa un flujo de contraseñas sin acumularlas en memoria.
+
+        Args:
+            passwords (Iterable[str]): Contraseñas a evaluar
+
+        Returns:
+            Iterator[PasswordStrength]: Nivel de cada contraseña, en orden
+        """
+        ascii_table = self._ascii_table
+        table = self._class_table
+        types_by_mask = self._types_by_mask
+        for password in passwords:
+            mask = 0
+            if password.isascii():
+                for bits in set(password.encode("ascii").translate(ascii_table)):
+                    mask |= bits
+            else:
+                for marker in set(password.translate(table)):
+                    mask |= ord(marker)
+            length = len(password)
+            yield _RATINGS[0 if length <= 8 else 1 if length <= 12 else 2][types_by_mask[mask]]
+
+class IncrementalStrength:
+    """
+    Evaluador incremental para contraseñas que se escriben carácter a carácter.
+
+    Mantiene el texto y el número de caracteres de cada clase, y los actualiza
+    solo con el fragmento insertado o borrado en cada edición, de modo que el
+    nivel se obtiene sin volver a recorrer la contraseña completa.
+
+    Atributos:
+        evaluator (StrengthEvaluator): Evaluador que define las clases
+        text (str): Contraseña actual
+    """
+
+    def __init__(self, evaluator: Optional[StrengthEvaluator] = None, text: str = ""):
+        """
+        Inicializa el evaluador incremental.
+
+        Args:
+            evaluator (Optional[StrengthEvaluator]): Evaluador con los conjuntos
+                de caracteres; None usa los conjuntos por defecto
+            text (str): Texto inicial
+        """
+        self.evaluator = evaluator or StrengthEvaluator()
+        self.text = ""
+        self._counts = [0, 0, 0, 0]
+        self.insert(0, text)
+
+    def _update(self, chars: str, sign: int) -> None:
+        """Suma o resta a los contadores las clases de los caracteres dados"""
+        counts = self._counts
+        table = self.evaluator._class_table
+        if len(chars) == 1:
+            # Caso habitual al teclear: una sola consulta a la tabla
+            marker = table.get(ord(chars))
+            if marker is not None:
+                for i in _BITS_BY_MASK[ord(marker)]:
+                    counts[i] += sign
+            return
+        markers = chars.translate(table)
+        for marker in set(markers):
+            n = markers.count(marker) * sign
+            for i in _BITS_BY_MASK[ord(marker)]:
+                counts[i] += n
+
+    def insert(self, index: int, chars: str) -> None:
+        """
+        Registra la inserción de caracteres.
+
+        Args:
+            index (int): Posición de inserción
+            chars (str): Caracteres insertados
+        """
+        if chars:
+            self.text = self.text[:index] + chars + self.text[index:]
+            self._update(chars, 1)
+
+    def delete(self, start: int, end: Optional[int] = None) -> None:
+        """
+        Registra el borrado del intervalo [start, end).
+
+        Args:
+            start (int): Primera posición borrada
+            end (Optional[int]): Posición final exclusiva; None borra un carácter
+        """
+        if end is None:
+            end = start + 1
+        removed = self.text[start:end]
+        if removed:
+            self.text = self.text[:start] + self.text[end:]
+            self._update(removed, -1)
+
+    def class_mask(self) -> int:
+        """
+        Obtiene la máscara de clases presentes en el texto actual.
+
+        Returns:
+            int: Combinación de LOWER, UPPER, DIGIT y SPECIAL
+        """
+        return sum(bit for bit, count in zip((LOWER, UPPER, DIGIT, SPECIAL), self._counts)
+                   if count)
+
+    def strength(self) -> PasswordStrength:
+        """
+        Obtiene el nivel de fortaleza del texto actual.
+
+        Returns:
+            PasswordStrength: Nivel de fortaleza, igual al de StrengthEvaluator.evaluate
+        """
+        lower, upper, digit, special = self._counts
+        return rate(len(self.text), (lower > 0) + (upper > 0) + (digit > 0) + (special > 0))
+
+def rate(length: int, char_types: int) -> PasswordStrength:
+    """
+    Resuelve el nivel de fortaleza a partir de la longitud y los tipos presentes.
+
+    Args:
+        length (int): Longitud de la contraseña
+        char_types (int): Número de tipos de caracteres presentes (0-4)
+
+    Returns:
+        PasswordStrength: Nivel de fortaleza
+    """
+    return _RATINGS[0 if length <= 8 else 1 if length <= 12 else 2][char_types]
+
+_default_evaluator: Optional[StrengthEvaluator] = None
+
+def evaluate_many(passwords: Iterable[str]) -> Iterator[PasswordStrength]:
+    """
+    Evalúa un flujo de contraseñas con los conjuntos de caracteres por defecto.
+
+    Args:
+        passwords (Iterable[str]): Contraseñas a evaluar
+
+    Returns:
+        Iterator[PasswordStrength]: Nivel de cada contraseña, en orden
+    """
+    global _default_evaluator
+    if _default_evaluator is None:
+        _default_evaluator = StrengthEvaluator()
+    return _default_evaluator.evaluate_many(passwords)
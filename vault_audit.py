@@ -0,0 +1,551 @@
+"""
+Módulo de auditoría de bóvedas exportadas.
+Lee en flujo una exportación CSV (KeePass, KeePassXC, Bitwarden, navegadores)
+o JSON (Bitwarden, JSONL de password_cli), reparte las entradas por bloques
+entre varios procesos y, para cada una, calcula la fortaleza con las mismas
+reglas que PasswordGenerator._evaluate_password_strength y una huella
+BLAKE2b con clave de 64 bits. El informe resume las entradas por nivel,
+lista las débiles y agrupa las que reutilizan contraseña.
+
+El índice de reutilización guarda solo las huellas (8 bytes por entrada) y
+la clave es aleatoria en cada auditoría, así que el informe no permite
+reconocer ninguna contraseña. Las contraseñas en claro solo existen mientras
+se lee y evalúa su bloque. Los archivos .gz y .xz se leen descomprimiendo al
+vuelo.
+
+Uso:
+    python -m vault_audit bitwarden_export.json
+    python -m vault_audit keepass.csv.gz -p 8 --listar 50
+
+Autor: Nelson Espinosa
+Versión: 1.2.0
+"""
+
+import csv
+import hashlib
+import heapq
+import io
+import itertools
+import json
+import logging
+import os
+import re
+import sys
+import time
+from array import array
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import IO, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from strength_evaluator import PasswordStrength, StrengthEvaluator
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 20_000
+BLOCK_CHARS = 1 << 20
+KEY_SIZE = 16
+# Columnas reconocidas, en orden de preferencia, comparadas sin mayúsculas
+PASSWORD_COLUMNS = ("password", "login_password", "contraseña")
+LABEL_COLUMNS = ("title", "name", "account", "url", "login_uri", "username", "login_username")
+LEVELS = tuple(PasswordStrength)
+
+Entry = Tuple[str, str]  # (contraseña, nombre de la entrada)
+
+class AuditProgress(NamedTuple):
+    """Progreso de una auditoría en curso"""
+    entries: int
+    elapsed: float
+
+    @property
+    def rate(self) -> float:
+        """Entradas evaluadas por segundo"""
+        return self.entries / self.elapsed if self.elapsed else 0.0
+
+class AuditReport(NamedTuple):
+    """
+    Resultado de una auditoría.
+
+    Atributos:
+        total (int): Entradas con contraseña
+        without_password (int): Entradas sin contraseña (notas, tarjetas...)
+        by_strength (Dict[PasswordStrength, int]): Entradas por nivel
+        weak (List[Tuple[int, str, PasswordStrength]]): Primeras entradas en o
+            por debajo del umbral: (número de entrada, nombre, nivel)
+        reused_passwords (int): Contraseñas distintas usadas en más de una entrada
+        reused_entries (int): Entradas que comparten contraseña con otra
+        reuse_groups (List[List[int]]): Números de entrada de los mayores grupos
+        elapsed (float): Duración en segundos
+    """
+    total: int
+    without_password: int
+    by_strength: Dict[PasswordStrength, int]
+    weak: List[Tuple[int, str, PasswordStrength]]
+    reused_passwords: int
+    reused_entries: int
+    reuse_groups: List[List[int]]
+    elapsed: float
+
+def _open_text(path: str) -> IO[str]:
+    """Abre un archivo de texto, descomprimiendo .gz y .xz al vuelo"""
+    if path.endswith(".gz"):
+        import gzip
+        return gzip.open(path, "rt", encoding="utf-8-sig", newline="")
+    if path.endswith(".xz"):
+        import lzma
+        return lzma.open(path, "rt", encoding="utf-8-sig", newline="")
+    return open(path, "r", encoding="utf-8-sig", newline="")
+
+def _find_column(header: Sequence[str], names: Sequence[str]) -> Optional[int]:
+    lowered = [column.strip().lower() for column in header]
+    for name in names:
+        if name in lowered:
+            return lowered.index(name)
+    return None
+
+def _csv_columns(header: Sequence[str]) -> Tuple[int, Optional[int]]:
+    """
+    Columnas de contraseña y de nombre de una cabecera CSV.
+
+    Raises:
+        ValueError: Si ninguna columna de la cabecera es de contraseña
+    """
+    password_column = _find_column(header, PASSWORD_COLUMNS)
+    if password_column is None:
+        raise ValueError(f"No hay columna de contraseña en la cabecera: {list(header)}")
+    return password_column, _find_column(header, LABEL_COLUMNS)
+
+def _csv_entries(rows: Iterable[List[str]],
+                 columns: Tuple[int, Optional[int]]) -> Iterator[Optional[Entry]]:
+    password_column, label_column = columns
+    for row in rows:
+        password = row[password_column] if password_column < len(row) else ""
+        if not password:
+            yield None
+            continue
+        label = row[label_column] if label_column is not None and label_column < len(row) else ""
+        yield password, label
+
+def read_csv(source: IO[str]) -> Iterator[Optional[Entry]]:
+    """
+    Lee las entradas de una exportación CSV con cabecera.
+
+    Returns:
+        Iterator[Optional[Entry]]: (contraseña, nombre) por fila; None para
+        las filas sin contraseña
+
+    Raises:
+        ValueError: Si ninguna columna de la cabecera es de contraseña
+    """
+    reader = csv.reader(source)
+    yield from _csv_entries(reader, _csv_columns(next(reader, None) or []))
+
+def _entry_from_item(item: object) -> Optional[Entry]:
+    """Entrada de un elemento de Bitwarden o de una línea JSONL"""
+    if not isinstance(item, dict):
+        return None
+    login = item.get("login")
+    password = login.get("password") if isinstance(login, dict) else item.get("password")
+    if not password or not isinstance(password, str):
+        return None
+    return password, str(item.get("name") or item.get("title") or "")
+
+def read_jsonl(source: Iterable[str]) -> Iterator[Optional[Entry]]:
+    """Lee las entradas de un JSONL con un objeto por línea (p. ej. de password_cli)"""
+    loads = json.loads
+    for line in source:
+        if line.strip():
+            yield _entry_from_item(loads(line))
+
+_ITEMS_START = re.compile(r'"items"\s*:\s*\[')
+
+def read_json(source: IO[str], read_size: int = 1 << 20) -> Iterator[Optional[Entry]]:
+    """
+    Lee las entradas de una exportación JSON de Bitwarden sin cargar el
+    documento: localiza la lista "items" y decodifica sus elementos uno a uno
+    con raw_decode a medida que llegan bloques del archivo.
+
+    Returns:
+        Iterator[Optional[Entry]]: (contraseña, nombre) por elemento; None
+        para los elementos sin contraseña
+
+    Raises:
+        ValueError: Si el documento no tiene lista "items" o está mal formado
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+
+    def fill() -> bool:
+        nonlocal buffer
+        data = source.read(read_size)
+        buffer += data
+        return bool(data)
+
+    while True:
+        match = _ITEMS_START.search(buffer)
+        if match:
+            pos = match.end()
+            break
+        if not fill():
+            raise ValueError('El JSON no contiene una lista "items"')
+    while True:
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer) or not fill():
+                break
+        if pos >= len(buffer):
+            raise ValueError("El JSON termina dentro de la lista de elementos")
+        if buffer[pos] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # Elemento incompleto: se pide otro bloque y se reintenta
+            if not fill():
+                raise ValueError(f"Elemento JSON mal formado cerca de la posición {pos}") from None
+            continue
+        yield _entry_from_item(item)
+        pos = end
+        if pos > read_size:
+            buffer = buffer[pos:]
+            pos = 0
+
+def _export_format(path: str) -> str:
+    """
+    Formato de una exportación según su extensión: csv, jsonl o json.
+
+    Raises:
+        ValueError: Si la extensión no es de un formato conocido
+    """
+    name = re.sub(r"\.(gz|xz)$", "", path.lower())
+    for fmt in ("csv", "jsonl", "json"):
+        if name.endswith("." + fmt):
+            return fmt
+    raise ValueError(f"Formato de exportación desconocido: {path}")
+
+def read_export(path: str) -> Iterator[Optional[Entry]]:
+    """
+    Lee una exportación según su extensión (.csv, .json, .jsonl, con .gz o
+    .xz opcional).
+
+    Returns:
+        Iterator[Optional[Entry]]: (contraseña, nombre) por entrada; None para
+        las entradas sin contraseña
+
+    Raises:
+        ValueError: Si la extensión no es de un formato conocido
+    """
+    reader = {"csv": read_csv, "jsonl": read_jsonl, "json": read_json}[_export_format(path)]
+    with _open_text(path) as source:
+        yield from reader(source)
+
+def _text_blocks(source: IO[str], block_chars: int, quoted: bool) -> Iterator[str]:
+    """
+    Corta el texto en bloques de unos block_chars caracteres que terminan en
+    un final de registro. En CSV (quoted) un salto de línea solo cierra un
+    registro si le precede un número par de comillas desde el inicio del
+    bloque, porque los campos entre comillas pueden contener saltos de línea.
+    """
+    tail = ""
+    while True:
+        data = source.read(block_chars)
+        if not data:
+            if tail:
+                yield tail
+            return
+        text = tail + data
+        end = text.rfind("\n")
+        if quoted:
+            while end >= 0 and text.count('"', 0, end) % 2:
+                end = text.rfind("\n", 0, end)
+        if end < 0:
+            tail = text
+            continue
+        yield text[:end + 1]
+        tail = text[end + 1:]
+
+_worker_evaluator: Optional[StrengthEvaluator] = None
+_worker_key = b""
+
+def _init_worker(key: bytes) -> None:
+    """Prepara en cada proceso el evaluador y la clave de las huellas"""
+    global _worker_evaluator, _worker_key
+    _worker_evaluator = StrengthEvaluator()
+    _worker_key = key
+
+ChunkResult = Tuple[List[int], bytes, List[Tuple[int, str, int]]]
+
+def _audit_chunk(kind: str, payload: object, columns: Optional[Tuple[int, Optional[int]]],
+                 threshold: int, max_listed: int) -> ChunkResult:
+    """
+    Evalúa un bloque en un proceso trabajador.
+
+    Un bloque es texto CSV o JSONL sin analizar (kind "csv" o "jsonl"), que se
+    analiza aquí para repartir también ese trabajo, o una lista de entradas
+    ya leídas (kind "entries").
+
+    Returns:
+        ChunkResult: Entradas por nivel (en el orden de LEVELS), huellas como
+        array("Q") serializado con un 0 por cada entrada sin contraseña, y
+        hasta max_listed entradas en o por debajo del umbral (posición en el
+        bloque, nombre, índice del nivel)
+    """
+    if kind == "csv":
+        entries: Iterable[Optional[Entry]] = _csv_entries(csv.reader(io.StringIO(payload)), columns)
+    elif kind == "jsonl":
+        # Solo "\n" separa registros, igual que en _text_blocks: splitlines
+        # también corta en U+2028, U+2029 y \x85, válidos dentro de cadenas JSON
+        entries = read_jsonl(payload.split("\n"))
+    else:
+        entries = payload
+    evaluate = (_worker_evaluator or StrengthEvaluator()).evaluate
+    hasher = hashlib.blake2b(digest_size=8, key=_worker_key)
+    level_index = {level: index for index, level in enumerate(LEVELS)}
+    counts = [0] * len(LEVELS)
+    fingerprints = array("Q")
+    append = fingerprints.append
+    weak: List[Tuple[int, str, int]] = []
+    for position, entry in enumerate(entries):
+        if entry is None:
+            append(0)
+            continue
+        password, label = entry
+        index = level_index[evaluate(password)]
+        counts[index] += 1
+        if index <= threshold and len(weak) < max_listed:
+            weak.append((position, label, index))
+        digest = hasher.copy()  # la clave ya está procesada en hasher
+        digest.update(password.encode("utf-8", "surrogatepass"))
+        append(int.from_bytes(digest.digest(), "little") or 1)  # 0 marca "sin contraseña"
+    return counts, fingerprints.tobytes(), weak
+
+def _find_reuse(fingerprints: array, max_groups: int) -> Tuple[int, int, List[List[int]]]:
+    """
+    Busca huellas repetidas contando las huellas con Counter (en C) y
+    localiza solo las entradas de los max_groups grupos más grandes con
+    array.index, sin recorrer las huellas en Python.
+
+    Returns:
+        Tuple[int, int, List[List[int]]]: Contraseñas reutilizadas, entradas
+        afectadas y los max_groups grupos más grandes (números de entrada)
+    """
+    counts = Counter(fingerprints)
+    counts.pop(0, None)
+    repeated = {fingerprint: count for fingerprint, count in counts.items() if count > 1}
+    del counts
+    groups = []
+    for fingerprint in heapq.nlargest(max_groups, repeated, key=repeated.__getitem__):
+        numbers = []
+        position = -1
+        for _ in range(repeated[fingerprint]):
+            position = fingerprints.index(fingerprint, position + 1)
+            numbers.append(position + 1)
+        groups.append(numbers)
+    groups.sort(key=lambda group: (-len(group), group[0]))
+    return len(repeated), sum(repeated.values()), groups
+
+def _run(chunks: Iterable[Tuple[str, object, Optional[Tuple[int, Optional[int]]]]],
+         workers: Optional[int], threshold: PasswordStrength, max_listed: int,
+         max_groups: int, progress: Optional[Callable[[AuditProgress], None]]) -> AuditReport:
+    """
+    Evalúa los bloques en un pool de procesos y compone el informe.
+
+    Los bloques se envían con contrapresión (dos por proceso en vuelo) y se
+    recogen en orden de envío, de modo que la posición de cada huella es el
+    número de su entrada.
+    """
+    started = time.perf_counter()
+    key = os.urandom(KEY_SIZE)
+    limit = LEVELS.index(threshold)
+    counts = [0] * len(LEVELS)
+    fingerprints = array("Q")
+    weak: List[Tuple[int, str, PasswordStrength]] = []
+
+    def collect(result: ChunkResult) -> None:
+        chunk_counts, chunk_fingerprints, chunk_weak = result
+        offset = len(fingerprints)
+        for index, count in enumerate(chunk_counts):
+            counts[index] += count
+        fingerprints.frombytes(chunk_fingerprints)
+        for position, label, index in chunk_weak[:max_listed - len(weak)]:
+            weak.append((offset + position + 1, label, LEVELS[index]))
+        if progress is not None:
+            progress(AuditProgress(len(fingerprints), time.perf_counter() - started))
+
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if workers <= 0:
+        _init_worker(key)
+        for kind, payload, columns in chunks:
+            collect(_audit_chunk(kind, payload, columns, limit, max_listed))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(key,)) as executor:
+            pending: "deque[Future]" = deque()
+            for kind, payload, columns in chunks:
+                pending.append(executor.submit(_audit_chunk, kind, payload, columns,
+                                               limit, max_listed))
+                while len(pending) >= workers * 2:
+                    collect(pending.popleft().result())
+            while pending:
+                collect(pending.popleft().result())
+
+    total = sum(counts)
+    reused_passwords, reused_entries, groups = _find_reuse(fingerprints, max_groups)
+    elapsed = time.perf_counter() - started
+    logger.info("Auditoría de %d entradas en %.2f s", len(fingerprints), elapsed)
+    return AuditReport(
+        total=total,
+        without_password=len(fingerprints) - total,
+        by_strength=dict(zip(LEVELS, counts)),
+        weak=weak,
+        reused_passwords=reused_passwords,
+        reused_entries=reused_entries,
+        reuse_groups=groups,
+        elapsed=elapsed,
+    )
+
+def audit(entries: Iterable[Optional[Entry]], workers: Optional[int] = None,
+          chunk_size: int = CHUNK_SIZE, threshold: PasswordStrength = PasswordStrength.WEAK,
+          max_listed: int = 100, max_groups: int = 20,
+          progress: Optional[Callable[[AuditProgress], None]] = None) -> AuditReport:
+    """
+    Audita un flujo de entradas ya leídas (p. ej. de read_export).
+
+    La memoria no crece con el número de entradas salvo por las huellas
+    (8 bytes por entrada). Los números de entrada cuentan desde 1 e incluyen
+    las entradas sin contraseña. Una coincidencia accidental de huellas de
+    64 bits entre 1M de entradas tiene una probabilidad del orden de 1e-8.
+
+    Args:
+        entries (Iterable[Optional[Entry]]): (contraseña, nombre) o None por entrada
+        workers (Optional[int]): Procesos; 0 evalúa en este proceso y None
+            usa os.cpu_count()
+        chunk_size (int): Entradas por bloque enviado a un trabajador
+        threshold (PasswordStrength): Nivel máximo que se lista como débil
+        max_listed (int): Entradas débiles listadas como máximo
+        max_groups (int): Grupos de reutilización listados como máximo
+        progress (Optional[Callable[[AuditProgress], None]]): Se llama tras
+            cada bloque evaluado
+
+    Returns:
+        AuditReport: Resumen de la auditoría
+    """
+    source = iter(entries)
+    chunks = iter(lambda: list(itertools.islice(source, chunk_size)), [])
+    return _run((("entries", chunk, None) for chunk in chunks), workers, threshold,
+                max_listed, max_groups, progress)
+
+def audit_export(path: str, workers: Optional[int] = None, block_chars: int = BLOCK_CHARS,
+                 threshold: PasswordStrength = PasswordStrength.WEAK, max_listed: int = 100,
+                 max_groups: int = 20,
+                 progress: Optional[Callable[[AuditProgress], None]] = None) -> AuditReport:
+    """
+    Audita un archivo exportado.
+
+    En CSV y JSONL este proceso solo corta el texto en bloques de registros
+    completos; el análisis, la evaluación y las huellas ocurren en los
+    trabajadores. El JSON de Bitwarden es un único documento y se decodifica
+    aquí elemento a elemento, así que escala peor con los procesos.
+
+    Args:
+        path (str): Exportación .csv, .jsonl o .json, con .gz o .xz opcional
+        workers (Optional[int]): Procesos; 0 evalúa en este proceso y None
+            usa os.cpu_count()
+        block_chars (int): Caracteres por bloque enviado a un trabajador
+        threshold (PasswordStrength): Nivel máximo que se lista como débil
+        max_listed (int): Entradas débiles listadas como máximo
+        max_groups (int): Grupos de reutilización listados como máximo
+        progress (Optional[Callable[[AuditProgress], None]]): Se llama tras
+            cada bloque evaluado
+
+    Returns:
+        AuditReport: Resumen de la auditoría
+
+    Raises:
+        ValueError: Si el formato no es conocido o el archivo está mal formado
+        OSError: Si no se puede leer el archivo
+    """
+    fmt = _export_format(path)
+    with _open_text(path) as source:
+        if fmt == "json":
+            return audit(read_json(source), workers, CHUNK_SIZE, threshold,
+                         max_listed, max_groups, progress)
+        columns = None
+        if fmt == "csv":
+            columns = _csv_columns(next(csv.reader([source.readline()]), []))
+        chunks = ((fmt, block, columns) for block in _text_blocks(source, block_chars,
+                                                                  quoted=fmt == "csv"))
+        return _run(chunks, workers, threshold, max_listed, max_groups, progress)
+
+def format_report(report: AuditReport) -> str:
+    """
+    Redacta el informe de una auditoría para la consola.
+
+    Args:
+        report (AuditReport): Resultado de audit
+
+    Returns:
+        str: Informe en varias líneas, sin contraseñas
+    """
+    total = report.total
+    lines = [f"Entradas con contraseña: {total:,} "
+             f"({report.without_password:,} sin contraseña), {report.elapsed:.2f} s "
+             f"({total / report.elapsed if report.elapsed else 0:,.0f} entradas/s)", ""]
+    lines.append(f"{'nivel':<12} {'entradas':>10} {'%':>7}")
+    for level, count in report.by_strength.items():
+        lines.append(f"{level.value:<12} {count:>10,} {100 * count / total if total else 0:>6.1f}%")
+    lines.append("")
+    lines.append(f"Reutilización: {report.reused_passwords:,} contraseñas en "
+                 f"{report.reused_entries:,} entradas")
+    for group in report.reuse_groups:
+        shown = ", ".join(map(str, group[:10])) + (", ..." if len(group) > 10 else "")
+        lines.append(f"  {len(group)} entradas: {shown}")
+    if report.weak:
+        lines.append("")
+        lines.append(f"Entradas débiles (primeras {len(report.weak)}):")
+        for number, label, level in report.weak:
+            lines.append(f"  #{number} {label or '(sin nombre)'}: {level.value}")
+    return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Función principal de la línea de comandos"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m vault_audit",
+                                     description="Auditoría de bóvedas exportadas")
+    parser.add_argument("exportacion", help="archivo .csv, .json o .jsonl (admite .gz y .xz)")
+    parser.add_argument("-p", "--procesos", type=int, default=None,
+                        help="procesos trabajadores (0: este proceso; por defecto: uno por CPU)")
+    parser.add_argument("--bloque", type=int, default=BLOCK_CHARS,
+                        help=f"caracteres por bloque enviado a cada proceso (por defecto: {BLOCK_CHARS})")
+    parser.add_argument("--umbral", choices=[level.name for level in LEVELS], default="WEAK",
+                        help="nivel máximo que se lista como débil (por defecto: WEAK)")
+    parser.add_argument("--listar", type=int, default=100,
+                        help="entradas débiles listadas como máximo (por defecto: 100)")
+    parser.add_argument("--grupos", type=int, default=20,
+                        help="grupos de reutilización listados como máximo (por defecto: 20)")
+    parser.add_argument("--silencioso", action="store_true", help="no mostrar el progreso")
+    args = parser.parse_args(argv)
+
+    last = [0.0]
+
+    def show_progress(state: AuditProgress) -> None:
+        if state.elapsed - last[0] >= 0.5:
+            last[0] = state.elapsed
+            print(f"\r{state.entries:,} entradas, {state.rate:,.0f}/s", end="",
+                  file=sys.stderr, flush=True)
+
+    try:
+        report = audit_export(args.exportacion, args.procesos, args.bloque,
+                              PasswordStrength[args.umbral], args.listar, args.grupos,
+                              progress=None if args.silencioso else show_progress)
+    except (OSError, ValueError, csv.Error) as e:
+        print(f"\nError: {e}", file=sys.stderr)
+        return 1
+    if not args.silencioso and last[0]:
+        print(file=sys.stderr)
+    print(format_report(report))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())